@@ -20,6 +20,8 @@ Usage:
     ```
 """
 
+from functools import lru_cache
+
 import pandas as pd
 
 
@@ -113,10 +115,13 @@ def safe_str(value, default: str = "") -> str:
     return str(value)
 
 
+@lru_cache(maxsize=4096)
 def get_image_url(type_id: int, size: int = 64, isship: bool = False) -> str:
     """
     Get the EVE image URL for a type.
 
+    Memoized so reruns reuse the same URL strings for the same items.
+
     Args:
         type_id: EVE type ID
         size: Image size in pixels
@@ -97,6 +97,52 @@ class FitItem:
             hulls=safe_int(row.get('hulls')),
         )
 
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> list["FitItem"]:
+        """
+        Create a FitItem for every row of a doctrines DataFrame.
+
+        Each column is extracted once and the columns are zipped, so no
+        per-row Series is built. Missing columns and null values get the
+        same defaults as from_dataframe_row().
+
+        Args:
+            df: DataFrame of rows from the doctrines table
+
+        Returns:
+            List of FitItem instances in row order
+        """
+        def column(name: str) -> list:
+            return df[name].tolist() if name in df.columns else [None] * len(df)
+
+        return [
+            cls(
+                fit_id=safe_int(fit_id),
+                type_id=safe_int(type_id),
+                type_name=safe_str(type_name),
+                fit_qty=safe_int(fit_qty, 1),
+                total_stock=safe_int(total_stock),
+                fits_on_mkt=safe_int(fits_on_mkt),
+                price=safe_float(price),
+                avg_vol=safe_float(avg_vol),
+                group_name=safe_str(group_name),
+                category_id=safe_int(category_id),
+                ship_id=safe_int(ship_id),
+                ship_name=safe_str(ship_name),
+                hulls=safe_int(hulls),
+            )
+            for (
+                fit_id, type_id, type_name, fit_qty, total_stock, fits_on_mkt,
+                price, avg_vol, group_name, category_id, ship_id, ship_name, hulls,
+            ) in zip(
+                column('fit_id'), column('type_id'), column('type_name'),
+                column('fit_qty'), column('total_stock'), column('fits_on_mkt'),
+                column('price'), column('avg_vol'), column('group_name'),
+                column('category_id'), column('ship_id'), column('ship_name'),
+                column('hulls'),
+            )
+        ]
+
     @property
     def is_ship_hull(self) -> bool:
         """True if this item is the ship hull (type_id matches ship_id)."""
@@ -13,8 +13,10 @@ Design Principles:
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from enum import Enum
 from typing import Optional
+import numpy as np
 import pandas as pd
 
 
@@ -312,33 +314,65 @@ class PricerResult:
     ship_name: Optional[str] = None
     failed_jita_type_ids: tuple[TypeID, ...] = ()
 
+    @cached_property
+    def _grand_totals(self) -> dict[str, float]:
+        """All per-item sums, reduced in one numpy pass.
+
+        Computed once per result; ``items`` is not expected to change after
+        the pricer builds the result.
+        """
+        values = np.array(
+            [
+                (
+                    i.quantity,
+                    i.jita_sell,
+                    i.jita_buy,
+                    i.local_sell,
+                    i.local_buy,
+                    i.item.volume,
+                )
+                for i in self.items
+            ],
+            dtype="float64",
+        ).reshape(-1, 6)
+        qty = values[:, 0]
+        sums = qty @ values[:, 1:]
+        return {
+            "quantity": int(qty.sum()),
+            "jita_sell": float(sums[0]),
+            "jita_buy": float(sums[1]),
+            "local_sell": float(sums[2]),
+            "local_buy": float(sums[3]),
+            "volume": float(sums[4]),
+        }
+
     # Grand totals - Jita
     @property
     def jita_sell_grand_total(self) -> Price:
         """Sum of all Jita sell totals."""
-        return sum(item.jita_sell_total for item in self.items)
+        return self._grand_totals["jita_sell"]
 
     @property
     def jita_buy_grand_total(self) -> Price:
         """Sum of all Jita buy totals."""
-        return sum(item.jita_buy_total for item in self.items)
+        return self._grand_totals["jita_buy"]
 
     # Grand totals - Local
     @property
     def local_sell_grand_total(self) -> Price:
         """Sum of all 4-HWWF sell totals."""
-        return sum(item.local_sell_total for item in self.items)
+        return self._grand_totals["local_sell"]
 
     @property
     def local_buy_grand_total(self) -> Price:
         """Sum of all 4-HWWF buy totals."""
-        return sum(item.local_buy_total for item in self.items)
+        return self._grand_totals["local_buy"]
 
     # Volume
     @property
     def total_volume(self) -> float:
         """Total volume of all items in m3."""
-        return sum(item.item.total_volume for item in self.items)
+        return self._grand_totals["volume"]
 
     # Item counts
     @property
@@ -354,7 +388,18 @@ class PricerResult:
     @property
     def total_quantity(self) -> int:
         """Total quantity of all items."""
-        return sum(item.quantity for item in self.items)
+        return self._grand_totals["quantity"]
+
+    @cached_property
+    def hull_type_id(self) -> Optional[TypeID]:
+        """type_id of the first Ship-category item (the EFT hull), or None.
+
+        Computed once per result; ``items`` is not expected to change after
+        the pricer builds the result.
+        """
+        return next(
+            (i.type_id for i in self.items if i.item.category_name == "Ship"), None
+        )
 
     # Status
     @property
@@ -380,18 +425,24 @@ class PricerResult:
         """True if input was multibuy format."""
         return self.input_type == InputFormat.MULTIBUY
 
+    @cached_property
+    def _dataframe(self) -> pd.DataFrame:
+        """Items frame built once per result; see ``to_dataframe``."""
+        if not self.items:
+            return pd.DataFrame()
+        return pd.DataFrame([item.to_dict() for item in self.items])
+
     def to_dataframe(self) -> pd.DataFrame:
         """
         Convert priced items to DataFrame for display.
 
+        The frame is built from ``items`` once and memoized on the result
+        (which lives in session state), so reruns only pay for a copy.
+
         Returns:
             DataFrame with columns for all price and metadata fields
         """
-        if not self.items:
-            return pd.DataFrame()
-
-        data = [item.to_dict() for item in self.items]
-        return pd.DataFrame(data)
+        return self._dataframe.copy()
 
     def get_totals_dict(self) -> dict:
         """Get summary totals as a dictionary."""
@@ -4,7 +4,9 @@ Moved from market_stats.py so the dashboard (default landing page)
 can drive DB initialization and periodic staleness checks.
 """
 
+import threading
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import streamlit as st
@@ -50,17 +52,32 @@ def initialize_databases() -> bool:
     return st.session_state.get("db_initialized", False)
 
 
-@st.cache_data(ttl=600)
-def check_for_db_updates(db_alias: str) -> tuple[bool, datetime]:
-    """Check whether local and remote databases are in sync.
+# Seconds a freshness verdict is reused before the remote is asked again.
+DB_UPDATE_CHECK_TTL = 600
 
-    Returns True if the database is in sync or if remote credentials are
-    unavailable (local-only mode).
 
-    The db_alias must be an explicit alias (e.g. "wcmktprod", "wcmktnorth")
-    so the cache key correctly distinguishes between markets.
-    """
-    db = DatabaseConfig(db_alias)
+@dataclass
+class _DbUpdateCheck:
+    """Last freshness verdict for one database, shared by every session."""
+
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    checked_at: float = 0.0
+    result: tuple[bool, datetime] | None = None
+
+
+@st.cache_resource
+def _db_update_check(db_alias: str) -> _DbUpdateCheck:
+    return _DbUpdateCheck()
+
+
+@st.cache_resource
+def _db_config(db_alias: str) -> DatabaseConfig:
+    """One DatabaseConfig per explicit alias, shared by the refresh checks."""
+    return DatabaseConfig(db_alias)
+
+
+def _local_matches_remote(db_alias: str) -> tuple[bool, datetime]:
+    db = _db_config(db_alias)
     if not db.has_remote_credentials:
         logger.info(f"check_for_db_updates(): skipping remote validation for {db_alias}")
         local_time = datetime.now()
@@ -70,6 +87,32 @@ def check_for_db_updates(db_alias: str) -> tuple[bool, datetime]:
     return check, local_time
 
 
+def check_for_db_updates(db_alias: str) -> tuple[bool, datetime]:
+    """Check whether local and remote databases are in sync.
+
+    Returns True if the database is in sync or if remote credentials are
+    unavailable (local-only mode).
+
+    The verdict is held per alias at resource scope for
+    ``DB_UPDATE_CHECK_TTL`` seconds. Concurrent sessions wait on one lock,
+    so an expired entry triggers a single remote validation, not one per tab.
+
+    The db_alias must be an explicit alias (e.g. "wcmktprod", "wcmktnorth")
+    so the cache key correctly distinguishes between markets.
+    """
+    state = _db_update_check(db_alias)
+    with state.lock:
+        if state.result is None or time.time() - state.checked_at > DB_UPDATE_CHECK_TTL:
+            state.result = _local_matches_remote(db_alias)
+            state.checked_at = time.time()
+        return state.result
+
+
+def clear_db_update_checks() -> None:
+    """Forget cached freshness verdicts so the next check asks the remote."""
+    _db_update_check.clear()
+
+
 def check_db(manual_override: bool = False):
     """Check for database updates on *all* markets and sync any that are stale.
 
@@ -85,9 +128,9 @@ def check_db(manual_override: bool = False):
     all_aliases = list(market_aliases) + shared_aliases
 
     if manual_override:
-        check_for_db_updates.clear()
+        clear_db_update_checks()
         logger.info("*" * 60)
-        logger.info("check_for_db_updates() cache cleared for manual override")
+        logger.info("check_for_db_updates() verdicts cleared for manual override")
         logger.info("*" * 60)
 
     synced_any = False
@@ -98,7 +141,7 @@ def check_db(manual_override: bool = False):
     status_ctx = None  # lazily created the first time we actually sync
 
     for alias in all_aliases:
-        db = DatabaseConfig(alias)
+        db = _db_config(alias)
         if not db.has_remote_credentials:
             logger.info(f"check_db(): skipping {alias}; no remote credentials configured")
             local_only_mode = True
@@ -139,7 +182,7 @@ def check_db(manual_override: bool = False):
     if synced_any:
         # Drop the freshness-check cache so the next run doesn't resync from
         # a stale "stale" verdict cached before the sync happened.
-        check_for_db_updates.clear()
+        clear_db_update_checks()
         if not market_aliases.isdisjoint(synced_aliases):
             refresh_market_caches()
         if "build_cost" in synced_aliases:
@@ -573,6 +573,21 @@ def render_current_market_status_ui(
 # History Display Helpers (from market_stats.py)
 # =============================================================================
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _format_history_df(history_df: pd.DataFrame) -> pd.DataFrame:
+    """Date-formatted, rounded history sorted newest first.
+
+    Keyed on the history frame itself, so reruns for the same item skip the
+    per-row strftime and a refreshed history is never served stale.
+    """
+    history_df = history_df.copy()
+    history_df.date = pd.to_datetime(history_df.date).dt.strftime("%Y-%m-%d")
+    history_df.average = round(history_df.average.astype(float), 2)
+    history_df = history_df.sort_values(by="date", ascending=False)
+    history_df.volume = history_df.volume.astype(int)
+    return history_df
+
+
 def display_history_data(history_df: pd.DataFrame, language_code: str = "en") -> pd.DataFrame:
     """Format and display history data table.
 
@@ -582,11 +597,7 @@ def display_history_data(history_df: pd.DataFrame, language_code: str = "en") ->
     Returns:
         Formatted DataFrame (sorted descending by date).
     """
-    history_df = history_df.copy()
-    history_df.date = pd.to_datetime(history_df.date).dt.strftime("%Y-%m-%d")
-    history_df.average = round(history_df.average.astype(float), 2)
-    history_df = history_df.sort_values(by="date", ascending=False)
-    history_df.volume = history_df.volume.astype(int)
+    history_df = _format_history_df(history_df)
 
     hist_col_config = {
         "date": st.column_config.DateColumn(translate_text(language_code, "market_stats.date"), format="localized"),
@@ -666,6 +677,7 @@ def get_fitting_col_config(language_code: str = "en") -> dict:
     }
 
 
+@st.cache_resource(show_spinner=False)
 def get_display_formats(language_code: str = "en") -> dict:
     """Get column configuration for order data display."""
     return {
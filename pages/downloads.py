@@ -13,13 +13,21 @@ Downloads available:
 - SDE Tables: Static data export tables
 """
 
+import gzip
+import os
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
 import streamlit as st
 import pandas as pd
+from sqlalchemy import text, bindparam
 
 from logging_config import setup_logging
 from config import DatabaseConfig
 from services.doctrine_service import DoctrineService, format_doctrine_name
-from repositories import get_sde_repository
+from repositories import DoctrineRepository, get_sde_repository
 from repositories.market_repo import MarketRepository
 from repositories.base import BaseRepository
 from ui.market_selector import render_market_selector
@@ -33,47 +41,244 @@ logger = setup_logging(__name__, log_file="downloads.log")
 # =============================================================================
 
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def _get_market_orders_csv(db_alias: str) -> bytes:
-    """Lazily load and convert market orders to CSV bytes."""
-    repo = MarketRepository(DatabaseConfig(db_alias))
-    df = repo.get_all_orders()
-    return df.to_csv(index=False).encode("utf-8")
+def _attach_targets(fits_df: pd.DataFrame, targets: pd.DataFrame) -> pd.DataFrame:
+    """Left-join ship target columns onto fit rows by fit_id.
 
+    Targets are reduced to one row per fit (first wins), which is the
+    many-to-one guarantee a validated ``merge`` would check. fit_ids are
+    hashed once with ``get_indexer`` and every target column is gathered by
+    position. Columns already present on ``fits_df`` are kept as-is.
+    """
+    targets = targets.drop_duplicates(subset=["fit_id"], keep="first").reset_index(
+        drop=True
+    )
+    positions = pd.Index(targets["fit_id"]).get_indexer(fits_df["fit_id"])
+    return fits_df.assign(
+        **{
+            col: targets[col].reindex(positions).set_axis(fits_df.index)
+            for col in targets.columns
+            if col not in fits_df.columns
+        }
+    )
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def _get_market_stats_csv(db_alias: str) -> bytes:
-    """Lazily load and convert market stats to CSV bytes."""
-    repo = MarketRepository(DatabaseConfig(db_alias))
-    df = repo.get_all_stats()
-    return df.to_csv(index=False).encode("utf-8")
 
+def _shrink(df: pd.DataFrame) -> pd.DataFrame:
+    """Narrow column dtypes ahead of CSV encoding.
 
-@st.cache_data(ttl=1800, show_spinner=False)
-def _get_market_history_csv(db_alias: str) -> bytes:
-    """Lazily load and convert market history to CSV bytes."""
-    repo = MarketRepository(DatabaseConfig(db_alias))
-    df = repo.get_all_history()
-    return df.to_csv(index=False).encode("utf-8")
+    Integer columns are downcast to the smallest lossless width and
+    repetitive string columns become categoricals. Floats are left alone:
+    float32 would change the digits written to the CSV.
+    """
+    if df.empty or not df.columns.is_unique:
+        return df
+    dtypes = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series.dtype):
+            narrow = pd.to_numeric(series, downcast="integer").dtype
+            if narrow != series.dtype:
+                dtypes[col] = narrow
+        elif series.dtype == object:
+            try:
+                if series.nunique(dropna=False) / len(series) < 0.5:
+                    dtypes[col] = "category"
+            except TypeError:  # unhashable cells, e.g. list columns
+                continue
+    return df.astype(dtypes) if dtypes else df
+
+
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Encode a DataFrame as UTF-8 CSV bytes without the index."""
+    return _shrink(df).to_csv(index=False).encode("utf-8")
+
+
+# Large market exports are written to disk as gzipped CSV in row chunks and
+# cached by path, so the Streamlit cache never holds a full payload in memory
+# and downloads ship a fraction of the raw CSV size. File names
+# carry the source DB's mtime, so a restarted process reuses any export whose
+# database has not changed since it was written.
+_EXPORT_DIR = Path(tempfile.gettempdir()) / "wcmkts_exports"
+_CSV_CHUNK_ROWS = 65536
+# Level 1 is several times faster than the default 9 for only a little less
+# compression on CSV text.
+_GZIP_LEVEL = 1
+
+
+# Characters that force a CSV field to be quoted (QUOTE_MINIMAL).
+_CSV_QUOTE_CHARS = r'[",\r\n]'
+
+
+def _csv_row_format(df: pd.DataFrame) -> str | None:
+    """Build a ``%``-format string that renders one row of ``df`` as CSV.
+
+    Returns None when the frame needs pandas' general writer: nulls,
+    datetimes, non-string objects, text that would need quoting, or empty
+    strings in a one-column frame (pandas writes those as ``""`` so the row
+    is not read back as a blank line).
+    """
+    if df.isna().to_numpy().any():
+        return None
+    formats = []
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.categories.to_series()
+        kind = values.dtype.kind
+        if kind in "iu":
+            formats.append("%d")
+        elif kind in "fb":
+            formats.append("%s")
+        elif (
+            kind == "O"
+            and pd.api.types.infer_dtype(values, skipna=False) == "string"
+            and not values.str.contains(_CSV_QUOTE_CHARS).any()
+            and not (len(df.columns) == 1 and values.eq("").any())
+        ):
+            formats.append("%s")
+        else:
+            return None
+    return ",".join(formats) + "\n"
 
 
-@st.cache_data(ttl=600, show_spinner=False)
-def _get_all_doctrine_fits_csv(db_alias: str) -> bytes:
-    """Lazily load all doctrine fits data as CSV bytes."""
+def _write_csv_rows(df: pd.DataFrame, f) -> None:
+    """Write ``df`` as CSV to the binary handle ``f`` in row chunks.
+
+    Plain numeric/text frames are rendered with a prebuilt per-column format
+    string, which is considerably faster than ``DataFrame.to_csv``; anything
+    _csv_row_format() cannot render falls back to pandas.
+    """
+    row_format = _csv_row_format(df)
+    if row_format is None:
+        df.to_csv(f, index=False, chunksize=_CSV_CHUNK_ROWS)
+        return
+    f.write(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+    rows = df.itertuples(index=False, name=None)
+    while chunk := list(islice(rows, _CSV_CHUNK_ROWS)):
+        f.write("".join(row_format % row for row in chunk).encode("utf-8"))
+
+
+def _write_csv_file(df: pd.DataFrame, name: str) -> str:
+    """Write a DataFrame to ``<export dir>/<name>.csv.gz`` in row chunks.
+
+    The file is written under a temporary name and swapped into place, so a
+    concurrent reader never sees a partially written export.
+    """
+    _EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    target = _EXPORT_DIR / f"{name}.csv.gz"
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=_EXPORT_DIR)
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+            filename=f"{name}.csv", mode="wb", fileobj=raw, compresslevel=_GZIP_LEVEL
+        ) as f:
+            _write_csv_rows(_shrink(df), f)
+        os.replace(tmp_path, target)
+    except Exception:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return str(target)
+
+
+def _market_export(db_alias: str, kind: str, method: str) -> str:
+    """Return the gzipped CSV file path for a full-table market export.
+
+    Reuses an existing file written for the current DB mtime; otherwise
+    loads the table via ``MarketRepository.<method>()``, writes it, and
+    removes exports written for older versions of the database.
+    """
+    db = DatabaseConfig(db_alias)
+    prefix = f"{db_alias}_{kind}"
+    try:
+        name = f"{prefix}_{os.stat(db.path).st_mtime_ns}"
+    except OSError:
+        logger.warning("No local DB file for %s; export not disk-cached", db_alias)
+        name = prefix
+    else:
+        existing = _EXPORT_DIR / f"{name}.csv.gz"
+        if existing.exists():
+            return str(existing)
+
+    df = getattr(MarketRepository(db), method)()
+    path = _write_csv_file(df, name)
+    for stale in _EXPORT_DIR.glob(f"{prefix}_*.csv.gz"):
+        if str(stale) != path:
+            stale.unlink(missing_ok=True)
+    return path
+
+
+def _read_csv_file(loader, db_alias: str) -> bytes:
+    """Read the export file produced by a cached path loader.
+
+    Rebuilds the file if it has been removed from disk since it was cached.
+    """
+    path = Path(loader(db_alias))
+    if not path.exists():
+        loader.clear()
+        path = Path(loader(db_alias))
+    return path.read_bytes()
+
+
+# Ship target columns attached to every doctrine fit row in exports.
+_TARGET_COLUMNS = ["fit_name", "ship_target"]
+
+
+class _DoctrineExportData(NamedTuple):
+    """Doctrine fit rows with ship target columns attached."""
+
+    fits: pd.DataFrame
+    # False when ship_targets is empty; target columns are then all NaN.
+    has_targets: bool
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _doctrine_fits_with_targets(db_alias: str) -> _DoctrineExportData:
+    """Build the doctrine fit rows joined with their ship targets.
+
+    Shared by every doctrine export so the fit build and targets query run
+    once per market rather than once per CSV variant. Cached as a resource:
+    callers must copy before mutating. ``fits`` is empty when no fit data is
+    available; when targets are missing the fit rows are still returned.
+    """
     service = DoctrineService.create_default(db_alias)
     all_fits_df = service.build_fit_data().raw_df
     if all_fits_df.empty:
-        logger.warning("No fit data for all-doctrine export (db_alias=%s)", db_alias)
-        return b""
+        logger.warning("No fit data for doctrine export (db_alias=%s)", db_alias)
+        return _DoctrineExportData(pd.DataFrame(), False)
 
     targets = service.repository.get_all_targets()
     if targets.empty:
         logger.warning("No targets data for doctrine export (db_alias=%s)", db_alias)
-        return b""
-    targets = targets[["fit_id", "fit_name", "ship_target"]].drop_duplicates(
-        subset=["fit_id"], keep="first"
+        targets = pd.DataFrame(columns=["fit_id", *_TARGET_COLUMNS])
+    target_cols = ["fit_id"] + [c for c in _TARGET_COLUMNS if c in targets.columns]
+    return _DoctrineExportData(
+        _attach_targets(all_fits_df, targets[target_cols]), not targets.empty
     )
-    data = all_fits_df.merge(targets, on="fit_id", how="left")
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _get_market_orders_csv(db_alias: str) -> str:
+    """Lazily write market orders to a gzipped CSV file and return its path."""
+    return _market_export(db_alias, "market_orders", "get_all_orders")
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _get_market_stats_csv(db_alias: str) -> str:
+    """Lazily write market stats to a gzipped CSV file and return its path."""
+    return _market_export(db_alias, "market_stats", "get_all_stats")
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def _get_market_history_csv(db_alias: str) -> str:
+    """Lazily write market history to a gzipped CSV file and return its path."""
+    return _market_export(db_alias, "market_history", "get_all_history")
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _get_all_doctrine_fits_csv(db_alias: str) -> bytes:
+    """Lazily load all doctrine fits data as CSV bytes."""
+    export = _doctrine_fits_with_targets(db_alias)
+    if export.fits.empty or not export.has_targets:
+        return b""
+    data = export.fits.copy()
 
     ship_target = pd.to_numeric(data["ship_target"], errors="coerce").fillna(0)
     fits_on_mkt = pd.to_numeric(data["fits_on_mkt"], errors="coerce").fillna(0)
@@ -93,26 +298,16 @@ def _get_all_doctrine_fits_csv(db_alias: str) -> bytes:
 
     data = data.sort_values(["ship_name", "fit_id", "type_name"])
     data = data.reset_index(drop=True)
-    return data.to_csv(index=False).encode("utf-8")
+    return _to_csv_bytes(data)
 
 
 @st.cache_data(ttl=600, show_spinner=False)
 def _get_low_stock_doctrine_fits_csv(db_alias: str) -> bytes:
     """Lazily load low stock doctrine fits data as CSV bytes."""
-    service = DoctrineService.create_default(db_alias)
-    df = service.build_fit_data().raw_df
-    if df.empty:
-        logger.warning("No fit data for low-stock export (db_alias=%s)", db_alias)
-        return b""
-
-    targets = service.repository.get_all_targets()
-    if targets.empty:
-        logger.warning("No targets data for low-stock export (db_alias=%s)", db_alias)
+    export = _doctrine_fits_with_targets(db_alias)
+    if export.fits.empty or not export.has_targets:
         return b""
-    targets = targets[["fit_id", "fit_name", "ship_target"]].drop_duplicates(
-        subset=["fit_id"], keep="first"
-    )
-    data = df.merge(targets, on="fit_id", how="left")
+    data = export.fits.copy()
 
     ship_target = pd.to_numeric(data["ship_target"], errors="coerce").fillna(0)
     fits_on_mkt = pd.to_numeric(data["fits_on_mkt"], errors="coerce").fillna(0)
@@ -155,7 +350,7 @@ def _get_low_stock_doctrine_fits_csv(db_alias: str) -> bytes:
     )
     data = data.sort_values(["ship_name", "fit_id"])
     data = data.reset_index(drop=True)
-    return data.to_csv(index=False).encode("utf-8")
+    return _to_csv_bytes(data)
 
 
 @st.cache_data(ttl=600, show_spinner=False)
@@ -164,7 +359,12 @@ def _get_fit_options(db_alias: str) -> list[dict]:
     service = DoctrineService.create_default(db_alias)
     summaries = service.get_all_fit_summaries()
     return [
-        {"fit_id": s.fit_id, "ship_name": s.ship_name, "fit_name": s.fit_name}
+        {
+            "fit_id": s.fit_id,
+            "ship_name": s.ship_name,
+            "ship_name_clean": s.ship_name.replace(" ", "_"),
+            "fit_name": s.fit_name,
+        }
         for s in summaries
     ]
 
@@ -180,84 +380,105 @@ def _get_doctrine_options(db_alias: str) -> dict[int, dict]:
         df.groupby(["doctrine_id", "doctrine_name"]).agg({"fit_id": list}).reset_index()
     )
     return {
-        int(row["doctrine_id"]): {
-            "doctrine_name": row["doctrine_name"],
-            "fit_ids": row["fit_id"],
-        }
-        for _, row in doctrines.iterrows()
+        int(doctrine_id): {"doctrine_name": doctrine_name, "fit_ids": fit_ids}
+        for doctrine_id, doctrine_name, fit_ids in doctrines[
+            ["doctrine_id", "doctrine_name", "fit_id"]
+        ].itertuples(index=False, name=None)
     }
 
 
 @st.cache_data(ttl=600, show_spinner=False)
 def _get_filtered_doctrine_csv(db_alias: str, fit_ids: tuple) -> bytes:
-    """Get doctrine data filtered by fit_ids as CSV bytes."""
-    service = DoctrineService.create_default(db_alias)
-    all_fits_df = service.build_fit_data().raw_df
-    targets = service.repository.get_all_targets()
+    """Get doctrine data filtered by fit_ids as CSV bytes.
 
-    # Filter by fit_ids
-    filtered_df = all_fits_df[all_fits_df["fit_id"].isin(fit_ids)]
-    data = filtered_df.merge(targets, on="fit_id", how="left")
-    data = data.reset_index(drop=True)
-    return data.to_csv(index=False).encode("utf-8")
+    Fit rows carry only the ``fit_name`` and ``ship_target`` columns from
+    ship_targets (NaN when a fit has no target or targets are unavailable).
+    """
+    data = _doctrine_fits_with_targets(db_alias).fits
+    if data.empty:
+        return b""
+    data = data.loc[data["fit_id"].isin(fit_ids)]
+    return _to_csv_bytes(data)
 
 
 @st.cache_data(ttl=600, show_spinner=False)
 def _get_single_fit_csv(db_alias: str, fit_id: int) -> bytes:
-    """Get CSV bytes for a single fit."""
-    service = DoctrineService.create_default(db_alias)
-    fit_df = service.repository.get_fit_by_id(fit_id)
+    """Get CSV bytes for a single fit.
+
+    Only the repository is needed here; its ``get_fit_by_id`` filters on
+    ``fit_id`` in SQL, so the full service (and its price service) is skipped.
+    """
+    fit_df = DoctrineRepository(DatabaseConfig(db_alias)).get_fit_by_id(fit_id)
     if fit_df.empty:
         return b""
-    return fit_df.to_csv(index=False).encode("utf-8")
+    return _to_csv_bytes(fit_df)
+
+
+@st.cache_resource(show_spinner=False)
+def _market_reader(db_alias: str) -> BaseRepository:
+    """Shared read repository for a market database.
+
+    Engines are already pooled per alias by DatabaseConfig; this keeps one
+    config/repository pair per market instead of rebuilding it per export.
+    """
+    return BaseRepository(DatabaseConfig(db_alias))
 
 
 @st.cache_data(ttl=600, show_spinner=False)
 def _get_low_stock_csv(
     db_alias: str, max_days: float, doctrine_only: bool, tech2_only: bool
 ) -> bytes:
-    """Get low stock items as CSV bytes."""
-    mktdb = DatabaseConfig(db_alias)
+    """Get low stock items as CSV bytes.
 
-    tech2_type_ids: list[int] = []
+    The days/doctrine/tech2 predicates and the days_remaining ordering are
+    applied in SQL so only matching rows reach pandas, already sorted.
+    """
+    conditions: list[str] = []
+    params: dict = {}
+    if max_days is not None:
+        conditions.append("ms.days_remaining <= :max_days")
+        params["max_days"] = max_days
+    if doctrine_only:
+        conditions.append("d.type_id IS NOT NULL")
     if tech2_only:
-        tech2_type_ids = get_sde_repository().get_tech2_type_ids()
-
-    query = """
+        # The id list is served from the process-wide SDE cache and is bound
+        # into the market query, so it is resolved first rather than fetched
+        # concurrently and filtered in pandas afterwards.
+        conditions.append("ms.type_id IN :tech2_type_ids")
+        params["tech2_type_ids"] = [
+            int(tid) for tid in get_sde_repository().get_tech2_type_ids()
+        ]
+
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = text(f"""
     SELECT ms.*,
            CASE WHEN d.type_id IS NOT NULL THEN 1 ELSE 0 END as is_doctrine,
            d.ship_name,
            d.fits_on_mkt
     FROM marketstats ms
     LEFT JOIN doctrines d ON ms.type_id = d.type_id
-    """
-
-    df = BaseRepository(mktdb).read_df(query)
-
-    if doctrine_only:
-        df = df[df["is_doctrine"] == 1]
+    {where_clause}
+    ORDER BY ms.days_remaining IS NULL, ms.days_remaining
+    """)
+    if tech2_only:
+        query = query.bindparams(bindparam("tech2_type_ids", expanding=True))
 
-    if max_days is not None:
-        df = df[df["days_remaining"] <= max_days]
+    df = _market_reader(db_alias).read_df(query, params=params)
 
     if not df.empty:
-        ship_groups: dict[int, list[str]] = {}
-        for type_id, group in df.groupby("type_id"):
-            ships = [
-                f"{row['ship_name']} ({int(row['fits_on_mkt'])})"
-                for _, row in group.iterrows()
-                if pd.notna(row["ship_name"]) and pd.notna(row["fits_on_mkt"])
-            ]
-            if ships:
-                ship_groups[type_id] = ships  # type: ignore[index]
-
-        df = df.drop_duplicates(subset=["type_id"])
-        df["ships"] = df["type_id"].map(ship_groups)
-
-    if tech2_only:
-        df = df[df["type_id"].isin(tech2_type_ids)]
+        # One row per type_id (the doctrine join fans out per fit), carrying
+        # the "Ship (fits)" labels of every matching fit in join order.
+        fitted = df[df["ship_name"].notna() & df["fits_on_mkt"].notna()]
+        labels = (
+            fitted["ship_name"].astype(str)
+            + " ("
+            + fitted["fits_on_mkt"].astype(float).astype("int64").astype(str)
+            + ")"
+        )
+        ship_groups = labels.groupby(fitted["type_id"], sort=False).agg(list)
 
-    df = df.sort_values("days_remaining")
+        df = df[~df["type_id"].duplicated()].copy()
+        df["ships"] = df["type_id"].map(ship_groups)
 
     # Clean up columns for export
     columns_to_drop = [
@@ -271,14 +492,13 @@ def _get_low_stock_csv(
         columns=[c for c in columns_to_drop if c in df.columns], errors="ignore"
     )
 
-    return df.to_csv(index=False).encode("utf-8")
+    return _to_csv_bytes(df)
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
 def _get_sde_table_csv(table_name: str) -> bytes:
-    """Get SDE table as CSV bytes."""
-    df = get_sde_repository().get_sde_table(table_name)
-    return df.to_csv(index=False).encode("utf-8")
+    """Get SDE table as CSV bytes, streamed straight from the database."""
+    return get_sde_repository().export_sde_table_csv(table_name)
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
@@ -300,6 +520,7 @@ def clear_download_caches() -> None:
         _get_market_history_csv,
         _get_all_doctrine_fits_csv,
         _get_low_stock_doctrine_fits_csv,
+        _doctrine_fits_with_targets,
         _get_fit_options,
         _get_doctrine_options,
         _get_filtered_doctrine_csv,
@@ -323,16 +544,19 @@ def market_downloads_section():
     short_name = market.short_name
 
     st.subheader(f"Market Data Downloads — {market.name}", divider="blue")
-    st.markdown("Download market orders, statistics, and history data.")
+    st.markdown(
+        "Download market orders, statistics, and history data "
+        "(gzip-compressed CSV)."
+    )
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.download_button(
             "Download Market Orders",
-            data=lambda a=db_alias: _get_market_orders_csv(a),
-            file_name=f"{short_name}_market_orders.csv",
-            mime="text/csv",
+            data=lambda a=db_alias: _read_csv_file(_get_market_orders_csv, a),
+            file_name=f"{short_name}_market_orders.csv.gz",
+            mime="application/gzip",
             use_container_width=True,
             icon=":material/download:",
         )
@@ -340,9 +564,9 @@ def market_downloads_section():
     with col2:
         st.download_button(
             "Download Market Stats",
-            data=lambda a=db_alias: _get_market_stats_csv(a),
-            file_name=f"{short_name}_market_stats.csv",
-            mime="text/csv",
+            data=lambda a=db_alias: _read_csv_file(_get_market_stats_csv, a),
+            file_name=f"{short_name}_market_stats.csv.gz",
+            mime="application/gzip",
             use_container_width=True,
             icon=":material/download:",
         )
@@ -350,9 +574,9 @@ def market_downloads_section():
     with col3:
         st.download_button(
             "Download Market History",
-            data=lambda a=db_alias: _get_market_history_csv(a),
-            file_name=f"{short_name}_market_history.csv",
-            mime="text/csv",
+            data=lambda a=db_alias: _read_csv_file(_get_market_history_csv, a),
+            file_name=f"{short_name}_market_history.csv.gz",
+            mime="application/gzip",
             use_container_width=True,
             icon=":material/download:",
         )
@@ -383,17 +607,20 @@ def doctrine_downloads_section():
     with col2:
         if filter_type == "By Doctrine":
             doctrine_map = _get_doctrine_options(db_alias)
-            doctrine_ids = sorted(
-                doctrine_map,
-                key=lambda did: format_doctrine_name(doctrine_map[did]["doctrine_name"]),
-            )
+            # Resolve each display name once; both the sort and the selectbox
+            # labels read from this dict.
+            display_names = {
+                did: format_doctrine_name(d["doctrine_name"])
+                for did, d in doctrine_map.items()
+            }
+            doctrine_ids = sorted(display_names, key=display_names.__getitem__)
             selected_doctrine_id = st.selectbox(
                 "Select Doctrine",
                 [None] + doctrine_ids,
                 key="doctrine_select",
                 format_func=lambda did: "Select a doctrine..."
                 if did is None
-                else format_doctrine_name(doctrine_map[did]["doctrine_name"]),
+                else display_names[did],
             )
         else:
             selected_doctrine_id = None
@@ -425,7 +652,7 @@ def doctrine_downloads_section():
             safe_name = doctrine_name.replace(" ", "_").lower()
 
             st.download_button(
-                f"Download {format_doctrine_name(doctrine_name)}",
+                f"Download {display_names[selected_doctrine_id]}",
                 data=lambda a=db_alias, fids=fit_ids: _get_filtered_doctrine_csv(
                     a, fids
                 ),
@@ -459,12 +686,11 @@ def individual_fit_downloads_section():
     if selected_fit_label and selected_fit_label != "Select a fit...":
         fit_data = fit_options[selected_fit_label]
         fit_id = fit_data["fit_id"]
-        ship_name = fit_data["ship_name"].replace(" ", "_")
 
         st.download_button(
             f"Download Fit {fit_id}",
             data=lambda a=db_alias, fid=fit_id: _get_single_fit_csv(a, fid),
-            file_name=f"fit_{fit_id}_{ship_name}.csv",
+            file_name=f"fit_{fit_id}_{fit_data['ship_name_clean']}.csv",
             mime="text/csv",
             use_container_width=True,
             icon=":material/download:",
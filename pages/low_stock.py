@@ -7,17 +7,23 @@ options for categories, doctrines, fits, and item meta types.
 Uses LowStockService for all data operations.
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
 from logging_config import setup_logging
-from services import get_low_stock_service, LowStockFilters
+from services import (
+    get_low_stock_service,
+    DoctrineFilterInfo,
+    FitFilterInfo,
+    LowStockFilters,
+    LowStockService,
+)
 from repositories import get_sde_repository
 from services.type_name_localization import get_localized_name_map
 from ui.formatters import get_image_url
 from services.doctrine_service import format_doctrine_name
-from state import get_active_language, ss_init, ss_get, ss_set
+from state import get_active_language, ss_get, ss_set
 from ui.market_selector import render_market_selector
 from ui.i18n import translate_text
 from pages.components.header import render_page_title
@@ -27,6 +33,17 @@ from init_db import ensure_market_db_ready
 from ui.sync_display import display_sync_status
 logger = setup_logging(__name__, log_file="low_stock.log")
 
+# Session defaults for the page's filter widgets, applied once per session.
+_LS_DEFAULTS = (
+    ("ls_selected_category_ids", []),
+    ("ls_selected_doctrine_id", None),
+    ("ls_selected_fit_id", None),
+    ("ls_doctrine_only", False),
+    ("ls_tech2_only", False),
+    ("ls_faction_only", False),
+    ("ls_max_days", 7.0),
+)
+
 # Columns written to the export CSV (visible table + the computed restock qty).
 # Keep in sync with columns_to_show in main().
 EXPORT_CSV_COLUMNS = [
@@ -56,6 +73,56 @@ def compute_restock_qty(avg_volume: float, max_days: float, current_stock: float
     return max(1, int(round(avg_volume * max_days - current_stock)))
 
 
+# =============================================================================
+# Cached filter options
+# =============================================================================
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_category_options(db_alias: str) -> pd.DataFrame:
+    return LowStockService.create_default(db_alias).get_category_options()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_doctrine_options(db_alias: str) -> dict[int, DoctrineFilterInfo]:
+    """Doctrine filter options keyed by doctrine_id."""
+    doctrines = LowStockService.create_default(db_alias).get_doctrine_options()
+    return {d.doctrine_id: d for d in doctrines}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _cached_fit_options(db_alias: str, doctrine_id: int) -> dict[int, FitFilterInfo]:
+    """Fit filter options for a doctrine, keyed by fit_id."""
+    fits = LowStockService.create_default(db_alias).get_fit_options(doctrine_id)
+    return {fit.fit_id: fit for fit in fits}
+
+
+@st.cache_resource(show_spinner=False)
+def _low_stock_column_config(language_code: str) -> dict:
+    """Editor column config per language; data_editor deep-copies it before use."""
+    return get_low_stock_column_config(language_code)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_low_stock_base(db_alias: str) -> pd.DataFrame:
+    """Unfiltered low stock frame; each filter change only re-masks it."""
+    return LowStockService.create_default(db_alias).get_low_stock_base()
+
+
+def clear_low_stock_caches() -> None:
+    """Clear the market-scoped data and filter option caches on this page.
+
+    Called by ``state.market_state.refresh_market_caches()`` after a DB sync.
+    """
+    for fn in (
+        _cached_category_options,
+        _cached_doctrine_options,
+        _cached_fit_options,
+        _cached_low_stock_base,
+    ):
+        fn.clear()
+
+
 # key (num used once) to bust the cache on the low_stock editor df
 _EDITOR_NONCE_KEY: str = "low_stock_editor_nonce"
 
@@ -66,29 +133,62 @@ def _reset_low_stock_selections() -> None:
     """
     ss_set(_EDITOR_NONCE_KEY, ss_get(_EDITOR_NONCE_KEY, 0) + 1)
 
-def create_days_remaining_chart(df: pd.DataFrame, language_code: str):
-    """Create a bar chart showing days of stock remaining."""
+# Bars drawn in the days-remaining chart; the most critical items carry the
+# chart's information and thousands of SVG bars stall the browser.
+CHART_TOP_N = 150
+
+
+def create_days_remaining_chart(
+    df: pd.DataFrame, language_code: str, top_n: int = CHART_TOP_N
+):
+    """Create a bar chart showing days of stock remaining.
+
+    Only the ``top_n`` items with the fewest days remaining are plotted, one
+    bar trace per category. Plotly is imported here, not at module load, and
+    traces are built with graph_objects rather than plotly.express.
+    """
     if df.empty:
         return None
 
-    fig = px.bar(
-        df,
-        x="type_name",
-        y="days_remaining",
-        title=translate_text(language_code, "low_stock.chart_title"),
-        labels={
-            "days_remaining": translate_text(language_code, "low_stock.chart_days_label"),
-            "type_name": translate_text(language_code, "common.item"),
-        },
-        color="category_name",
-        color_discrete_sequence=px.colors.qualitative.Set3,
-    )
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    if len(df) > top_n:
+        df = df.nsmallest(top_n, "days_remaining")
+        title = translate_text(language_code, "low_stock.chart_title_top_n", count=top_n)
+    else:
+        title = translate_text(language_code, "low_stock.chart_title")
+    item_label = translate_text(language_code, "common.item")
+    days_label = translate_text(language_code, "low_stock.chart_days_label")
+    hovertemplate = f"{item_label}=%{{x}}<br>{days_label}=%{{y}}<extra></extra>"
+    palette = qualitative.Set3
+
+    fig = go.Figure()
+    for i, (category, group) in enumerate(
+        df.groupby("category_name", sort=False, dropna=False)
+    ):
+        fig.add_trace(
+            go.Bar(
+                x=group["type_name"],
+                y=group["days_remaining"],
+                name=str(category),
+                marker_color=palette[i % len(palette)],
+                hovertemplate=hovertemplate,
+            )
+        )
 
+    fig.update_layout(
+        title=title,
+        legend_title_text=translate_text(language_code, "common.category"),
+        barmode="relative",
+    )
     fig.update_layout(
         xaxis_title=translate_text(language_code, "common.item"),
         yaxis_title=translate_text(language_code, "low_stock.chart_days_label"),
         xaxis={"tickangle": 45},
         height=500,
+        # Keep zoom/pan and legend toggles across reruns of the page.
+        uirevision="low_stock",
     )
 
     # Add a horizontal line at critical level
@@ -102,46 +202,57 @@ def create_days_remaining_chart(df: pd.DataFrame, language_code: str):
     return fig
 
 
-def highlight_critical(val):
-    """Style function for critical days remaining values."""
-
-    if ss_get("single_fit"):
-        try:
-            fit_target = ss_get("fit_target")
-            val = float(val)
-            perc_target = (val * 1.0) / fit_target
-            if perc_target <= 0.3:
-                return "background-color: #fc4103"  # Red for critical
-            elif perc_target <= 0.8:
-                return "background-color: #c76d14"  # Orange for low
-            return ""
-        except Exception:
-            return ""
-    else:
-        try:
-            val = float(val)
-            if val <= 3:
-                return "background-color: #fc4103"  # Red for critical
-            elif val <= 7:
-                return "background-color: #c76d14"  # Orange for low
-            return ""
-        except Exception:
-            return ""
-
-
-def highlight_doctrine(row):
-    """Style function to highlight doctrine items."""
-    try:
-        if isinstance(row.get("ships"), list) and len(row["ships"]) > 0:
-            styles = [""] * len(row)
-            # Highlight the type_name column
-            if "type_name" in row.index:
-                idx = row.index.get_loc("type_name")
-                styles[idx] = "background-color: #328fed"
-            return styles
-    except Exception:
-        pass
-    return [""] * len(row)
+_CRITICAL_STYLE = "background-color: #fc4103"  # Red for critical
+_LOW_STYLE = "background-color: #c76d14"  # Orange for low
+_DOCTRINE_STYLE = "background-color: #328fed"
+
+
+def blank_empty_ships(ships: pd.Series) -> pd.Series:
+    """Replace empty ``ships`` lists with None so the editor sends no payload for them."""
+    if ships.dtype != object:
+        return ships
+    return ships.where(ships.str.len().gt(0), None)
+
+
+def build_style_matrix(
+    df: pd.DataFrame,
+    style_column: str,
+    single_fit: bool = False,
+    fit_target: float | None = None,
+) -> pd.DataFrame:
+    """CSS for every cell of the low stock table, for ``Styler.apply(axis=None)``.
+
+    ``style_column`` is coloured red/orange by stock level: in single-fit mode
+    as a share of ``fit_target`` (<= 30% / <= 80%), otherwise as days
+    remaining (<= 3 / <= 7). Doctrine items (non-empty ``ships``) get a blue
+    ``type_name`` cell. Built with column masks instead of a Python callback
+    per cell/row.
+    """
+    styles = np.full(df.shape, "", dtype=object)
+
+    if style_column in df.columns:
+        values = pd.to_numeric(df[style_column], errors="coerce").to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+        critical, low = (0.3, 0.8) if single_fit else (3, 7)
+        if single_fit:
+            # Without a usable target there is nothing to compare against.
+            values = values / fit_target if fit_target else np.full_like(values, np.nan)
+        styles[:, df.columns.get_loc(style_column)] = np.select(
+            [values <= critical, values <= low],
+            [_CRITICAL_STYLE, _LOW_STYLE],
+            default="",
+        )
+
+    if "ships" in df.columns and "type_name" in df.columns:
+        ships = df["ships"]
+        # ships holds lists (empty for non-doctrine items) or None; a float
+        # column means it was absent and filled with NaN.
+        if ships.dtype == object:
+            has_ships = ships.str.len().gt(0).to_numpy(dtype=bool)
+            styles[has_ships, df.columns.get_loc("type_name")] = _DOCTRINE_STYLE
+
+    return pd.DataFrame(styles, index=df.index, columns=df.columns)
 
 
 def display_fit_data(selected_fit):
@@ -172,8 +283,8 @@ def _render_low_stock_export(edited_df, max_days: float, language_code: str) ->
     restock quantity.
     """
     st.subheader(translate_text(language_code, "low_stock.export_header"))
-    selected = edited_df[edited_df["select"]]
-    if selected.empty:
+    ticked = edited_df["select"].to_numpy(dtype=bool)
+    if not ticked.any():
         st.caption(translate_text(language_code, "low_stock.export_no_selection"))
         return
 
@@ -181,7 +292,7 @@ def _render_low_stock_export(edited_df, max_days: float, language_code: str) ->
         translate_text(language_code, "low_stock.export_qty_caption", days=f"{max_days:g}")
     )
 
-    export = selected.copy()
+    export = edited_df[ticked].copy()
     export["restock_qty"] = [
         compute_restock_qty(
             avg_volume=row.avg_volume,
@@ -232,17 +343,10 @@ def main():
     service = get_low_stock_service()
 
     # Initialize session state
-    ss_init(
-        {
-            "ls_selected_category_ids": [],
-            "ls_selected_doctrine_id": None,
-            "ls_selected_fit_id": None,
-            "ls_doctrine_only": False,
-            "ls_tech2_only": False,
-            "ls_faction_only": False,
-            "ls_max_days": 7.0,
-        }
-    )
+    for key, default in _LS_DEFAULTS:
+        if key not in st.session_state:
+            # Copy list defaults so sessions never share one mutable object.
+            ss_set(key, list(default) if isinstance(default, list) else default)
 
     render_page_title(translate_text(language_code, "low_stock.title", market_name=market.name))
 
@@ -278,7 +382,7 @@ def main():
 
     # Category filter
     st.sidebar.subheader(translate_text(language_code, "low_stock.category_filter"))
-    category_options = service.get_category_options()
+    category_options = _cached_category_options(market.database_alias)
     category_name_map = {
         int(row["category_id"]): str(row["category_name"])
         for _, row in category_options.iterrows()
@@ -298,10 +402,9 @@ def main():
     st.sidebar.subheader(translate_text(language_code, "low_stock.doctrine_fit_filter"))
 
     # Get doctrine options
-    doctrine_options = service.get_doctrine_options()
+    doctrine_by_id = _cached_doctrine_options(market.database_alias)
     all_label = "All"
     all_fits_label = "All Fits"
-    doctrine_by_id = {d.doctrine_id: d for d in doctrine_options}
     doctrine_ids = sorted(
         doctrine_by_id.keys(),
         key=lambda did: format_doctrine_name(doctrine_by_id[did].doctrine_name),
@@ -336,9 +439,10 @@ def main():
                 )
 
             # Get fit options for this doctrine
-            fit_options = service.get_fit_options(selected_doctrine.doctrine_id)
-            fit_by_id = {fit.fit_id: fit for fit in fit_options}
-            fit_ship_name_map = {fit.ship_id: fit.ship_name for fit in fit_options}
+            fit_by_id = _cached_fit_options(
+                market.database_alias, selected_doctrine.doctrine_id
+            )
+            fit_ship_name_map = {fit.ship_id: fit.ship_name for fit in fit_by_id.values()}
             localized_fit_name_map = get_localized_name_map(
                 list(fit_ship_name_map.keys()),
                 sde_repo,
@@ -380,22 +484,25 @@ def main():
                 ss_set("single_fit", False)
                 ss_set("fit_target", None)
 
-    # Days remaining filter
+    # Days remaining filter. The slider sits in a form so dragging it does not
+    # rerun the whole low stock query per tick; values apply on submit.
     st.sidebar.subheader(translate_text(language_code, "low_stock.days_filter"))
-    max_days_remaining = st.sidebar.slider(
-        translate_text(language_code, "low_stock.max_days_remaining"),
-        min_value=0.0,
-        max_value=30.0,
-        value=ss_get("ls_max_days", 7.0),
-        step=0.5,
-        help=translate_text(language_code, "low_stock.max_days_remaining_help"),
-    )
+    with st.sidebar.form("ls_filters", border=False):
+        max_days_remaining = st.slider(
+            translate_text(language_code, "low_stock.max_days_remaining"),
+            min_value=0.0,
+            max_value=30.0,
+            value=ss_get("ls_max_days", 7.0),
+            step=0.5,
+            help=translate_text(language_code, "low_stock.max_days_remaining_help"),
+        )
+        show_zero_volume_items = st.checkbox(
+            translate_text(language_code, "low_stock.show_zero_volume_items"),
+            value=ss_get("ls_show_zero_volume_items", False),
+            help=translate_text(language_code, "low_stock.show_zero_volume_items_help"),
+        )
+        st.form_submit_button(translate_text(language_code, "low_stock.apply_filters"))
     ss_set("ls_max_days", max_days_remaining)
-    show_zero_volume_items = st.sidebar.checkbox(
-        translate_text(language_code, "low_stock.show_zero_volume_items"),
-        value=ss_get("ls_show_zero_volume_items", False),
-        help=translate_text(language_code, "low_stock.show_zero_volume_items_help"),
-    )
     ss_set("ls_show_zero_volume_items", show_zero_volume_items)
 
     # Build filters
@@ -411,7 +518,8 @@ def main():
 
     # Get filtered data using service
     try:
-        df = service.get_low_stock_items(filters, language_code=language_code)
+        base = _cached_low_stock_base(market.database_alias)
+        df = service.filter_low_stock_items(base, filters, language_code=language_code)
     except RuntimeError as e:
         if "history_data_unavailable" in str(e):
             st.error("History data currently unavailable, try again later.")
@@ -475,27 +583,6 @@ def main():
         else:
             st.subheader(translate_text(language_code, "low_stock.subheader_all"))
 
-        # Format the DataFrame for display
-        display_df = df.copy()
-
-        # Drop columns not needed for display
-        columns_to_drop = [
-            "min_price",
-            "avg_price",
-            "category_id",
-            "group_id",
-            "is_doctrine",
-            "ship_name",
-            "last_update",
-        ]
-        if not ss_get("single_fit"):
-            columns_to_drop.append("fits_on_mkt")
-
-        display_df = display_df.drop(
-            columns=[c for c in columns_to_drop if c in display_df.columns],
-            errors="ignore",
-        )
-
         # Prepare columns for display
         columns_to_show = [
             "select",
@@ -513,24 +600,25 @@ def main():
         if ss_get("single_fit"):
             columns_to_show.insert(6, "fits_on_mkt")
 
-        # Initialize checkbox column
-        display_df["select"] = False
-
-        # Ensure all columns exist
-        for col in columns_to_show:
-            if col not in display_df.columns:
-                display_df[col] = None
-
-        display_df = display_df[columns_to_show]
+        # Project straight to the display columns (absent ones come back
+        # empty), then add the unticked checkbox column in front.
+        display_df = df.reindex(columns=[c for c in columns_to_show if c != "select"])
+        display_df.insert(0, "select", False)
+        display_df["ships"] = blank_empty_ships(display_df["ships"])
         if ss_get("single_fit"):
             display_df.sort_values("fits_on_mkt", ascending=True, inplace=True)
 
-        column_config = get_low_stock_column_config(language_code)
+        column_config = _low_stock_column_config(language_code)
 
         # Apply styling
         style_paramater = "fits_on_mkt" if ss_get("single_fit") else "days_remaining"
-        styled_df = display_df.style.map(highlight_critical, subset=[style_paramater])
-        styled_df = styled_df.apply(highlight_doctrine, axis=1)
+        styled_df = display_df.style.apply(
+            build_style_matrix,
+            axis=None,
+            style_column=style_paramater,
+            single_fit=bool(ss_get("single_fit")),
+            fit_target=ss_get("fit_target"),
+        )
 
         st.button(
             translate_text(language_code, "low_stock.reset_selections"),
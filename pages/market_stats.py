@@ -1,9 +1,13 @@
+import os
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
 import streamlit as st
 import pandas as pd
 from logging_config import setup_logging
 import millify
-from config import get_settings
+from config import DatabaseConfig, get_settings
 from services import get_doctrine_service
 from services.market_service import get_market_service
 from init_db import ensure_market_db_ready
@@ -26,10 +30,11 @@ from services.type_name_localization import (
     apply_localized_type_names,
     get_localized_name,
 )
-from state import get_active_language, ss_has, ss_get
+from state import get_active_language, ss_get
 from repositories import get_sde_repository
+from repositories.market_repo import MarketRepository
 from ui.i18n import translate_text
-from ui.formatters import drop_localized_backup_columns
+from ui.formatters import drop_localized_backup_columns, get_image_url
 from ui.market_selector import render_market_selector
 from ui.sync_display import display_sync_status  # noqa: F401
 from pages.components.header import render_page_title
@@ -52,20 +57,40 @@ logger.info("-" * 100)
 # =============================================================================
 
 
-def get_filter_options(
-    selected_category_id: int | None = None,
-    show_all: bool = False,
-) -> tuple:
-    """Get category/item filter options from SDE data via the market service repo.
+def _market_db_mtime(db_alias: str) -> int:
+    """Modification time of the market DB file, used to key filter caches."""
+    try:
+        return os.stat(DatabaseConfig(db_alias).path).st_mtime_ns
+    except OSError:
+        return 0
 
-    Returns:
-        (categories_df, items_df, cat_type_info) tuple.
+
+def _sorted_items(df: pd.DataFrame) -> pd.DataFrame:
+    return (
+        df[["type_id", "type_name"]]
+        .dropna()
+        .drop_duplicates()
+        .sort_values("type_name")
+        .reset_index(drop=True)
+    )
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _filter_option_tables(
+    db_alias: str, db_mtime: int
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, dict]:
+    """Sorted category/item tables and a per-category lookup for a market.
+
+    ``by_category`` maps category_id to that category's SDE rows
+    (``"rows"``), its sorted item table (``"items"``) and the
+    ``selected_category_info`` fields, all built in one groupby pass.
+
+    ``db_mtime`` only keys the cache, so a synced database gets fresh options.
+    Everything returned is shared across sessions and must not be mutated.
     """
-    service = get_market_service()
-    sde_df = service._repo.get_sde_info()
+    sde_df = MarketRepository(DatabaseConfig(db_alias)).get_sde_info()
     sde_df = sde_df.reset_index(drop=True)
     logger.info(f"sde_df: {len(sde_df)}")
-    logger.debug(f"selected_category_id: {selected_category_id}")
 
     categories_df = (
         sde_df[["category_id", "category_name"]]
@@ -74,50 +99,70 @@ def get_filter_options(
         .sort_values("category_name")
         .reset_index(drop=True)
     )
+    by_category = {}
+    for category_id, rows in sde_df.groupby("category_id", sort=False):
+        items = _sorted_items(rows)
+        by_category[category_id] = {
+            "rows": rows,
+            "items": items,
+            "category_name": str(rows["category_name"].iloc[0]),
+            "type_ids": rows["type_id"].unique().tolist(),
+            "type_names": items["type_name"].tolist(),
+        }
+    return categories_df, _sorted_items(sde_df), sde_df, by_category
+
+
+def _current_filter_tables() -> tuple:
+    """Cached filter tables for the active market service's database."""
+    db_alias = get_market_service()._repo.db.alias
+    return _filter_option_tables(db_alias, _market_db_mtime(db_alias))
+
+
+def _set_ss_if_changed(key: str, value) -> None:
+    """Write a session_state key only when its value actually changes."""
+    if key not in st.session_state or st.session_state[key] != value:
+        st.session_state[key] = value
+
+
+def _store_selected_category(category: dict, selected_category_id: int) -> None:
+    _set_ss_if_changed("selected_category", category["category_name"])
+    _set_ss_if_changed("selected_category_id", selected_category_id)
+    _set_ss_if_changed("selected_category_info", {
+        'category_name': category["category_name"],
+        'category_id': selected_category_id,
+        'type_ids': category["type_ids"],
+        'type_names': category["type_names"],
+    })
+
+
+def get_filter_options(
+    selected_category_id: int | None = None,
+    show_all: bool = False,
+) -> tuple:
+    """Get category/item filter options from SDE data via the market service repo.
+
+    Returns:
+        (categories_df, items_df, cat_type_info) tuple.
+    """
+    categories_df, items_df, sde_df, by_category = _current_filter_tables()
+    logger.debug(f"selected_category_id: {selected_category_id}")
 
     if show_all:
-        items_df = (
-            sde_df[["type_id", "type_name"]]
-            .dropna()
-            .drop_duplicates()
-            .sort_values("type_name")
-            .reset_index(drop=True)
-        )
         return categories_df, items_df, sde_df.copy()
 
     elif selected_category_id is not None:
-        cat_sde_df = sde_df[sde_df["category_id"] == selected_category_id]
-        cat_type_info = cat_sde_df.copy()
-        if cat_sde_df.empty:
-            return categories_df, pd.DataFrame(columns=["type_id", "type_name"]), cat_type_info
-
-        selected_categories_type_ids = cat_sde_df["type_id"].unique().tolist()
-        selected_category_name = str(cat_sde_df["category_name"].iloc[0])
-        selected_items_df = (
-            cat_sde_df[["type_id", "type_name"]]
-            .dropna()
-            .drop_duplicates()
-            .sort_values("type_name")
-            .reset_index(drop=True)
-        )
-        st.session_state.selected_category = selected_category_name
-        st.session_state.selected_category_id = selected_category_id
-        st.session_state.selected_category_info = {
-            'category_name': selected_category_name,
-            'category_id': selected_category_id,
-            'type_ids': selected_categories_type_ids,
-            'type_names': selected_items_df["type_name"].tolist(),
-        }
-        return categories_df, selected_items_df, cat_type_info
+        category = by_category.get(selected_category_id)
+        if category is None:
+            return (
+                categories_df,
+                pd.DataFrame(columns=["type_id", "type_name"]),
+                sde_df.iloc[0:0].copy(),
+            )
+
+        _store_selected_category(category, selected_category_id)
+        return categories_df, category["items"], category["rows"].copy()
 
     else:
-        items_df = (
-            sde_df[["type_id", "type_name"]]
-            .dropna()
-            .drop_duplicates()
-            .sort_values("type_name")
-            .reset_index(drop=True)
-        )
         return categories_df, items_df, sde_df.copy()
 
 
@@ -159,11 +204,11 @@ def check_selected_item(
 ) -> int | None:
     """Check if selected item is valid and set session state."""
     if selected_item_id is None:
-        st.session_state.selected_item = None
-        st.session_state.selected_item_en = None
-        st.session_state.selected_item_id = None
-        st.session_state.jita_price = None
-        st.session_state.current_price = None
+        _set_ss_if_changed("selected_item", None)
+        _set_ss_if_changed("selected_item_en", None)
+        _set_ss_if_changed("selected_item_id", None)
+        _set_ss_if_changed("jita_price", None)
+        _set_ss_if_changed("current_price", None)
         return None
 
     elif selected_item_id is not None:
@@ -171,16 +216,16 @@ def check_selected_item(
         selected_item_en = english_name_map.get(selected_item_id, selected_item_label)
         logger.info(f"selected_item_id: {selected_item_id}")
         st.sidebar.text(f"Item: {selected_item_label}")
-        st.session_state.selected_item = selected_item_label
-        st.session_state.selected_item_en = selected_item_en
-        st.session_state.selected_item_id = selected_item_id
+        _set_ss_if_changed("selected_item", selected_item_label)
+        _set_ss_if_changed("selected_item_en", selected_item_en)
+        _set_ss_if_changed("selected_item_id", selected_item_id)
         jita_price = get_price_service().get_jita_price(selected_item_id).sell_price
-        st.session_state.jita_price = jita_price if jita_price else None
+        _set_ss_if_changed("jita_price", jita_price if jita_price else None)
         return selected_item_id
 
     else:
-        st.session_state.jita_price = None
-        st.session_state.current_price = None
+        _set_ss_if_changed("jita_price", None)
+        _set_ss_if_changed("current_price", None)
         return None
 
 
@@ -189,34 +234,34 @@ def check_selected_category(
     show_all: bool,
 ) -> pd.DataFrame | None:
     if selected_category_id is None:
-        st.session_state.selected_category = None
-        st.session_state.selected_category_id = None
-        st.session_state.selected_category_info = None
-        st.session_state.selected_item = None
-        st.session_state.selected_item_en = None
-        st.session_state.selected_item_id = None
-        st.session_state.jita_price = None
+        _set_ss_if_changed("selected_category", None)
+        _set_ss_if_changed("selected_category_id", None)
+        _set_ss_if_changed("selected_category_info", None)
+        _set_ss_if_changed("selected_item", None)
+        _set_ss_if_changed("selected_item_en", None)
+        _set_ss_if_changed("selected_item_id", None)
+        _set_ss_if_changed("jita_price", None)
         return None
 
     if selected_category_id is not None:
         logger.info(f"selected_category_id {selected_category_id}")
-        _, available_items_df, cat_type_info = get_filter_options(
-            selected_category_id if not show_all else None,
-        )
-        if not cat_type_info.empty:
-            selected_category = str(cat_type_info["category_name"].iloc[0])
-            st.sidebar.text(f"Category: {selected_category}")
-            st.session_state.selected_category = selected_category
-            st.session_state.selected_category_id = selected_category_id
-        return available_items_df
+        _, items_df, _, by_category = _current_filter_tables()
+        if show_all:
+            return items_df
+        category = by_category.get(selected_category_id)
+        if category is None:
+            return pd.DataFrame(columns=["type_id", "type_name"])
+        _store_selected_category(category, selected_category_id)
+        st.sidebar.text(f"Category: {category['category_name']}")
+        return category["items"]
     else:
-        st.session_state.selected_category = None
-        st.session_state.selected_category_id = None
-        st.session_state.selected_category_info = None
-        st.session_state.selected_item = None
-        st.session_state.selected_item_en = None
-        st.session_state.selected_item_id = None
-        st.session_state.jita_price = None
+        _set_ss_if_changed("selected_category", None)
+        _set_ss_if_changed("selected_category_id", None)
+        _set_ss_if_changed("selected_category_info", None)
+        _set_ss_if_changed("selected_item", None)
+        _set_ss_if_changed("selected_item_en", None)
+        _set_ss_if_changed("selected_item_id", None)
+        _set_ss_if_changed("jita_price", None)
         return None
 
 
@@ -228,6 +273,63 @@ def check_selected_category(
 # Title
 # =============================================================================
 
+def _load_item_fits(
+    service, all_fits: Future, selected_item_id: int
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Doctrine fit rows using the selected item, and the fit to show for it.
+
+    Ships show their whole fit (looked up by fit_id); other items show the
+    fit rows that use them. Returns empty frames if the lookup fails.
+    """
+    try:
+        fits = all_fits.result()
+        item_fits = fits[fits['type_id'].to_numpy() == selected_item_id]
+        if item_fits.empty:
+            return item_fits, pd.DataFrame()
+        item_cat_id = item_fits['category_id'].to_numpy()[0] if 'category_id' in item_fits.columns else None
+        if item_cat_id == 6:
+            fit_id = item_fits['fit_id'].to_numpy()[0]
+            fit_df = service.repository.get_fit_by_id(fit_id)
+            return item_fits, fit_df if fit_df is not None else pd.DataFrame()
+        return item_fits, item_fits
+    except Exception as e:
+        logger.warning(f"Failed to get fitting data for {selected_item_id}: {e}")
+        return pd.DataFrame(), pd.DataFrame()
+
+
+# Shared by every session. Workers get no script run context, so only loads
+# that neither render (cache spinners) nor read session state may run here.
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="market_stats_prefetch")
+
+# Loads safe to run on _PREFETCH_POOL: their caches have no spinner and every
+# argument is resolved on the script thread.
+_BACKGROUND_LOADS = frozenset({"totals", "history"})
+
+
+def _prefetch(loads: dict[str, Callable[[], Any]], cold: bool) -> dict[str, Future]:
+    """Run the page's data loads, overlapping the background ones when cold.
+
+    On a cold render (the selection changed) the ``_BACKGROUND_LOADS`` are
+    submitted to the shared pool while the rest run on the script thread. On
+    warm reruns every load is a cache hit, so all of them run inline. Either
+    way the caller gets futures; errors are re-raised by ``Future.result()``.
+    """
+    futures: dict[str, Future] = {}
+    if cold:
+        for key in _BACKGROUND_LOADS & loads.keys():
+            futures[key] = _PREFETCH_POOL.submit(loads[key])
+    for key, load in loads.items():
+        if key in futures:
+            continue
+        future: Future = Future()
+        try:
+            future.set_result(load())
+        except Exception as e:
+            future.set_exception(e)
+        futures[key] = future
+    return futures
+
+
 def render_title_headers(market_name: str, language_code: str):
     render_page_title(
         translate_text(
@@ -329,29 +431,45 @@ def main():
         item_label_map,
         item_english_name_map,
     )
+    # Snapshot the selection once; the rest of main() reads these locals.
     selected_item = ss_get("selected_item")
+    selected_item_id = ss_get('selected_item_id')
+    selected_category = ss_get('selected_category')
+    category_info = ss_get('selected_category_info')
+
+    service = get_doctrine_service()
 
-    # Get market data via service
+    # Get market data via service; the independent loads run concurrently.
+    loads = {
+        "market_data": lambda: market_service.get_market_data(
+            show_all, category_info=category_info, selected_item_id=selected_item_id
+        ),
+        "totals": lambda: market_service.get_order_aggregates(
+            category_info=category_info, selected_item_id=selected_item_id
+        ),
+    }
+    if selected_item_id:
+        loads["all_fits"] = service.repository.get_all_fits
+        loads["history"] = lambda: market_service.get_history_by_type(selected_item_id)
+    # Only a new selection misses the caches; reruns load inline.
+    prefetch_key = (selected_item_id, selected_category, show_all)
+    cold = ss_get("market_stats_prefetch_key") != prefetch_key
+    _set_ss_if_changed("market_stats_prefetch_key", prefetch_key)
     t1 = time.perf_counter()
-    category_info = ss_get('selected_category_info')
-    selected_item_id = ss_get('selected_item_id')
-    sell_data, buy_data, stats = market_service.get_market_data(
-        show_all, category_info=category_info, selected_item_id=selected_item_id
-    )
+    prefetched = _prefetch(loads, cold)
+    sell_data, buy_data, stats = prefetched["market_data"].result()
     t2 = time.perf_counter()
-    logger.info(f"get_market_data elapsed: {round((t2 - t1) * 1000, 2)} ms")
+    logger.info(f"market data prefetch elapsed: {round((t2 - t1) * 1000, 2)} ms")
 
     # Process order counts
-    sell_order_count = sell_data['order_id'].nunique() if not sell_data.empty else 0
-    sell_total_value = (sell_data['price'] * sell_data['volume_remain']).sum() if not sell_data.empty else 0
-    buy_order_count = buy_data['order_id'].nunique() if not buy_data.empty else 0
-    buy_total_value = (buy_data['price'] * buy_data['volume_remain']).sum() if not buy_data.empty else 0
+    totals = prefetched["totals"].result()
+    sell_order_count, sell_total_value = totals["sell_count"], totals["sell_value"]
+    buy_order_count, buy_total_value = totals["buy_count"], totals["buy_value"]
 
     display_formats = get_display_formats(language_code)
 
     # Initialize fitting data
     fit_df = pd.DataFrame()
-    service = get_doctrine_service()
     display_sell_data = apply_localized_type_names(
         sell_data,
         sde_repo,
@@ -370,7 +488,7 @@ def main():
         language_code,
         logger,
     )
-    display_fit_df = fit_df.copy()
+    display_fit_df = fit_df
     display_selected_item = selected_item
     if selected_item_id:
         display_selected_item = get_localized_name(
@@ -381,37 +499,22 @@ def main():
             logger,
         )
 
+    # Fit rows using the selected item; fetched once and reused below.
+    # Only the item view needs them, so the all/category views skip this.
+    item_fits = pd.DataFrame()
+    isship = False
+    fits_on_mkt = None
+    cat_id = None
     if not sell_data.empty:
-        if ss_has('selected_item_id'):
-            selected_item_id = ss_get('selected_item_id')
-            if selected_item_id:
-                try:
-                    all_fits = service.repository.get_all_fits()
-                    item_fits = all_fits[all_fits['type_id'] == selected_item_id]
-                    if not item_fits.empty:
-                        item_cat_id = item_fits['category_id'].iloc[0] if 'category_id' in item_fits.columns else None
-                        if item_cat_id == 6:
-                            fit_id = item_fits['fit_id'].iloc[0]
-                            fit_df = service.repository.get_fit_by_id(fit_id)
-                        else:
-                            fit_df = item_fits
-                    else:
-                        fit_df = pd.DataFrame()
-                except Exception as e:
-                    logger.warning(f"Failed to get fitting data for {selected_item_id}: {e}")
-                    fit_df = pd.DataFrame()
-
-        elif show_all:
-            fit_df = pd.DataFrame()
+        if selected_item_id:
+            item_fits, fit_df = _load_item_fits(
+                service, prefetched["all_fits"], selected_item_id
+            )
 
         # Fit header info
-        isship = False
-        fits_on_mkt = None
-        cat_id = None
-
-        if fit_df is not None and not fit_df.empty:
+        if not fit_df.empty:
             try:
-                cat_id = stats['category_id'].iloc[0]
+                cat_id = stats['category_id'].to_numpy()[0]
             except Exception:
                 cat_id = None
             try:
@@ -420,27 +523,26 @@ def main():
                 fits_on_mkt = None
             if cat_id == 6:
                 isship = True
-        display_fit_df = apply_localized_type_names(
-            fit_df,
-            sde_repo,
-            language_code,
-            logger,
-        )
-        display_fit_df = apply_localized_names(
-            display_fit_df,
-            sde_repo,
-            language_code,
-            id_column="ship_id",
-            name_column="ship_name",
-            logger=logger,
-            english_name_column="ship_name_en",
-        )
+            display_fit_df = apply_localized_type_names(
+                fit_df,
+                sde_repo,
+                language_code,
+                logger,
+            )
+            display_fit_df = apply_localized_names(
+                display_fit_df,
+                sde_repo,
+                language_code,
+                id_column="ship_id",
+                name_column="ship_name",
+                logger=logger,
+                english_name_column="ship_name_en",
+            )
 
         # Headers
         if show_all:
             st.header(translate_text(language_code, "market_stats.all_sell_orders"), divider="green")
-        elif ss_has('selected_item_id'):
-            selected_item_id = ss_get('selected_item_id')
+        elif selected_item_id is not None:
             try:
                 image_id = selected_item_id
                 type_name = display_selected_item
@@ -451,10 +553,7 @@ def main():
             img_col, name_col = st.columns([0.08, 0.92], vertical_alignment="center")
             with img_col:
                 if image_id:
-                    if isship:
-                        st.image(f'https://images.evetech.net/types/{image_id}/render?size=64')
-                    else:
-                        st.image(f'https://images.evetech.net/types/{image_id}/icon?size=64')
+                    st.image(get_image_url(int(image_id), 64, isship=isship))
             with name_col:
                 st.subheader(f"{type_name}", divider="blue")
 
@@ -465,10 +564,8 @@ def main():
                         divider="orange",
                     )
                     if cat_id in [7, 8, 18]:
-                        all_fits = service.repository.get_all_fits()
-                        module_fits = all_fits[all_fits['type_id'] == selected_item_id]
                         module_fits = apply_localized_names(
-                            module_fits,
+                            item_fits,
                             sde_repo,
                             language_code,
                             id_column="ship_id",
@@ -482,15 +579,16 @@ def main():
                             )
                         )
                     else:
-                        st.write(fit_df[fit_df['type_id'] == selected_item_id]['group_name'].iloc[0])
+                        item_rows = fit_df['type_id'].to_numpy() == selected_item_id
+                        st.write(fit_df['group_name'].to_numpy()[item_rows][0])
             except Exception as e:
                 logger.error(f"Error: {e}")
-        elif ss_has('selected_category'):
+        elif selected_category is not None:
             st.header(
                 translate_text(
                     language_code,
                     "market_stats.category_plural",
-                    category_name=st.session_state.selected_category,
+                    category_name=selected_category,
                 ),
                 divider="green",
             )
@@ -516,8 +614,7 @@ def main():
         st.divider()
 
         # Sell orders display
-        display_df = display_sell_data.copy()
-        if ss_has('selected_item'):
+        if selected_item is not None:
             st.subheader(
                 translate_text(
                     language_code,
@@ -526,8 +623,8 @@ def main():
                 ),
                 divider="blue",
             )
-        elif ss_has('selected_category'):
-            cat_label = st.session_state.selected_category
+        elif selected_category is not None:
+            cat_label = selected_category
             if not cat_label.endswith("s"):
                 cat_label += "s"
             st.subheader(
@@ -537,10 +634,8 @@ def main():
         else:
             st.subheader(translate_text(language_code, "market_stats.all_sell_orders"), divider="green")
 
-        if 'is_buy_order' in display_df.columns:
-            display_df.drop(columns='is_buy_order', inplace=True)
         st.dataframe(
-            drop_localized_backup_columns(display_df),
+            drop_localized_backup_columns(display_sell_data, extra_columns=("is_buy_order",)),
             hide_index=True,
             column_config=display_formats,
         )
@@ -549,7 +644,7 @@ def main():
     if not buy_data.empty:
         if show_all:
             st.subheader(translate_text(language_code, "market_stats.all_buy_orders"), divider="orange")
-        elif ss_has('selected_item'):
+        elif selected_item is not None:
             st.subheader(
                 translate_text(
                     language_code,
@@ -558,8 +653,8 @@ def main():
                 ),
                 divider="orange",
             )
-        elif ss_has('selected_category'):
-            cat_label = st.session_state.selected_category
+        elif selected_category is not None:
+            cat_label = selected_category
             if not cat_label.endswith("s"):
                 cat_label += "s"
             st.subheader(
@@ -584,17 +679,14 @@ def main():
             else:
                 st.metric(translate_text(language_code, "market_stats.total_buy_orders"), "0")
 
-        buy_display_df = display_buy_data.copy()
-        if 'is_buy_order' in buy_display_df.columns:
-            buy_display_df.drop(columns='is_buy_order', inplace=True)
         st.dataframe(
-            drop_localized_backup_columns(buy_display_df),
+            drop_localized_backup_columns(display_buy_data, extra_columns=("is_buy_order",)),
             hide_index=True,
             column_config=display_formats,
         )
 
     elif not sell_data.empty:
-        if st.session_state.selected_item is not None:
+        if selected_item is not None:
             st.write(
                 translate_text(
                     language_code,
@@ -603,7 +695,7 @@ def main():
                 )
             )
     else:
-        if st.session_state.selected_item is not None:
+        if selected_item is not None:
             st.write(
                 translate_text(
                     language_code,
@@ -613,7 +705,7 @@ def main():
             )
 
     # Market History section
-    if st.session_state.get('selected_item') is not None:
+    if selected_item is not None:
         st.subheader(
             translate_text(
                 language_code,
@@ -623,8 +715,8 @@ def main():
             divider="blue",
         )
     else:
-        if st.session_state.get('selected_category') is not None:
-            filter_info = st.session_state.get('selected_category')
+        if selected_category is not None:
+            filter_info = selected_category
             suffix = "s"
         else:
             filter_info = "All Items"
@@ -639,22 +731,22 @@ def main():
             render_isk_volume_table_ui(market_service, language_code)
 
     # Item history chart
-    if ss_has('selected_item'):
-        selected_item_id = ss_get('selected_item_id')
-    else:
+    if selected_item is None:
         selected_item_id = None
-        st.session_state.selected_item_id = selected_item_id
+        _set_ss_if_changed("selected_item_id", selected_item_id)
 
     if selected_item_id:
         logger.debug(f"Displaying history chart for {selected_item_id}")
 
-        history_chart = market_service.create_history_chart(selected_item_id)
+        # One history fetch feeds both the chart and the data table below.
+        selected_history = prefetched["history"].result()
+        history_chart = market_service.create_history_chart(
+            selected_item_id, history=selected_history
+        )
         # Set title from session state (service doesn't have access to st)
-        if history_chart is not None and ss_has('selected_item'):
+        if history_chart is not None:
             history_chart.update_layout(title=display_selected_item)
 
-        selected_history = market_service._repo.get_history_by_type(selected_item_id)
-
         if history_chart:
             st.plotly_chart(history_chart, config={'width': 'content'})
 
@@ -674,9 +766,8 @@ def main():
         fit_df = pd.DataFrame()
     if not fit_df.empty:
         st.subheader(translate_text(language_code, "market_stats.fitting_data"), divider="blue")
-        selected_item_id = ss_get('selected_item_id')
         try:
-            fit_id = fit_df['fit_id'].iloc[0]
+            fit_id = fit_df['fit_id'].to_numpy()[0]
         except Exception:
             fit_id = " "
         st.markdown(
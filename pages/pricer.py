@@ -11,8 +11,10 @@ all wrapped in a single bordered card. EFT fittings additionally render a
 from current local market stock and which modules are bottlenecks.
 """
 
+import io
 from datetime import datetime, timezone
 
+import numpy as np
 import pandas as pd
 from repositories.sde_repo import SDERepository
 import streamlit as st
@@ -29,7 +31,8 @@ from pages.components.layout import render_legal_notice
 from repositories import get_sde_repository
 from services import get_pricer_service
 from services.module_equivalents_service import get_module_equivalents_service
-from services.pricer_service import compute_fit_availability
+from services.parser_utils import parse_input
+from services.pricer_service import compute_fit_availability, unpriced_result
 from services.type_name_localization import apply_localized_names, get_localized_name
 from state import get_active_language, ss_get, ss_has, ss_init, ss_set
 from ui.formatters import (
@@ -54,15 +57,41 @@ def format_isk(value: float) -> str:
     return millify(value, precision=2)
 
 
-def round_columns(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
-    """Round float columns for cleaner display."""
-    df2 = df.copy()
-    round_cols = [col for col in df2.columns if df2[col].dtype == "float64"]
-    for column in round_cols:
-        df2[column] = df2[column].apply(
-            lambda x: round(x, 1) if x < 1000 else round(x, 0)
-        )
-    return df2
+def _csv_chunks(df: pd.DataFrame, chunk_bytes: int = 16 * 1024, first_rows: int = 100):
+    """Yield the CSV for ``df`` as encoded chunks, header first.
+
+    One ``StringIO`` is reused for every chunk. After the first chunk, the
+    row count per chunk is sized so each chunk is roughly ``chunk_bytes``.
+    """
+    buf = io.StringIO()
+    df.iloc[:0].to_csv(buf, index=False)
+    yield buf.getvalue().encode("utf-8")
+
+    rows, start = first_rows, 0
+    while start < len(df):
+        buf.seek(0)
+        buf.truncate(0)
+        df.iloc[start : start + rows].to_csv(buf, index=False, header=False)
+        chunk = buf.getvalue()
+        yield chunk.encode("utf-8")
+        if start == 0 and chunk:
+            sampled = min(rows, len(df))
+            rows = max(1, chunk_bytes * sampled // len(chunk))
+            start = sampled
+        else:
+            start += rows
+
+
+def build_csv_download(df: pd.DataFrame) -> io.BytesIO:
+    """Write ``df`` as CSV into a byte buffer chunk by chunk.
+
+    Avoids holding a full CSV ``str`` alongside its encoded bytes.
+    """
+    buffer = io.BytesIO()
+    for chunk in _csv_chunks(df):
+        buffer.write(chunk)
+    buffer.seek(0)
+    return buffer
 
 
 # =============================================================================
@@ -70,6 +99,7 @@ def round_columns(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
 # =============================================================================
 
 
+@st.cache_resource(show_spinner=False)
 def get_pricer_column_config(short_name: str = "4H", language_code: str = "en") -> dict:
     """Column configuration for the main pricer results table."""
     return {
@@ -206,6 +236,7 @@ def get_pricer_column_config(short_name: str = "4H", language_code: str = "en")
     }
 
 
+@st.cache_resource(show_spinner=False)
 def _fit_availability_column_config(language_code: str, short_name: str = "4H") -> dict:
     """Column configuration for the Fit Availability breakdown table."""
     return {
@@ -267,34 +298,50 @@ def _fit_availability_column_config(language_code: str, short_name: str = "4H")
 # =============================================================================
 
 
-def highlight_doctrine_rows(row):
-    if row.get("Is Doctrine", False):
-        return ["background-color: rgba(50, 143, 237, 0.3)"] * len(row)
-    return [""] * len(row)
+_DOCTRINE_ROW_STYLE = "background-color: rgba(50, 143, 237, 0.3)"
+_CRITICAL_STOCK_STYLE = "background-color: #fc4103"
+_LOW_STOCK_STYLE = "background-color: #c76d14"
+_BOTTLENECK_ROW_STYLE = "background-color: rgba(239, 83, 80, 0.25)"
+_NEAR_BOTTLENECK_ROW_STYLE = "background-color: rgba(216, 138, 34, 0.15)"
 
 
-def highlight_low_stock(val):
-    try:
-        v = float(val)
-    except (TypeError, ValueError):
-        return ""
-    if v <= 3:
-        return "background-color: #fc4103"
-    if v <= 7:
-        return "background-color: #c76d14"
-    return ""
+def build_pricer_style_matrix(
+    df: pd.DataFrame, highlight_doctrine: bool, show_stock: bool
+) -> pd.DataFrame:
+    """CSS for every cell of the pricer table, for ``Styler.apply(axis=None)``.
+
+    Doctrine rows get a blue tint; ``Days of Stock`` cells are red/orange at
+    <= 3 / <= 7 days and take precedence over the row tint.
+    """
+    styles = np.full(df.shape, "", dtype=object)
+    if highlight_doctrine and "Is Doctrine" in df.columns:
+        styles[df["Is Doctrine"].to_numpy(dtype=bool), :] = _DOCTRINE_ROW_STYLE
+    if show_stock and "Days of Stock" in df.columns:
+        days = pd.to_numeric(df["Days of Stock"], errors="coerce").to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+        cells = np.select(
+            [days <= 3, days <= 7], [_CRITICAL_STOCK_STYLE, _LOW_STOCK_STYLE], default=""
+        )
+        flagged = cells != ""
+        styles[flagged, df.columns.get_loc("Days of Stock")] = cells[flagged]
+    return pd.DataFrame(styles, index=df.index, columns=df.columns)
 
 
-def _highlight_fit_row(row, fits_available: int):
+def _fit_row_style_matrix(df: pd.DataFrame, fits_available: int) -> pd.DataFrame:
     """Red tint for bottleneck rows, light orange for near-bottleneck."""
-    fits = row.get("Fits", None)
-    if fits is None:
-        return [""] * len(row)
-    if fits == fits_available:
-        return ["background-color: rgba(239, 83, 80, 0.25)"] * len(row)
-    if fits <= fits_available + 2:
-        return ["background-color: rgba(216, 138, 34, 0.15)"] * len(row)
-    return [""] * len(row)
+    styles = np.full(df.shape, "", dtype=object)
+    if "Fits" in df.columns:
+        fits = pd.to_numeric(df["Fits"], errors="coerce").to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+        row_styles = np.select(
+            [fits == fits_available, fits <= fits_available + 2],
+            [_BOTTLENECK_ROW_STYLE, _NEAR_BOTTLENECK_ROW_STYLE],
+            default="",
+        )
+        styles[:] = row_styles[:, None]
+    return pd.DataFrame(styles, index=df.index, columns=df.columns)
 
 
 # =============================================================================
@@ -342,11 +389,7 @@ def _render_appraisal_title(
 def _render_fit_appraisal_header(
     result: PricerResult, language_code: str, sde_repo: SDERepository
 ):
-    ship_type_id = None
-    for item in result.items:
-        if item.item.category_name == "Ship":
-            ship_type_id = item.type_id
-            break
+    ship_type_id = result.hull_type_id
 
     if result.ship_name:
         localized_ship_name = get_localized_name(
@@ -435,7 +478,6 @@ def _render_summary_stats_grid(result: PricerResult, market, language_code: str)
 
 def _render_action_chips(result: PricerResult, language_code: str):
     """Compact action row replicating Janice's Fork/Reprocess/Compress chips."""
-    csv_data = drop_localized_backup_columns(result.to_dataframe()).to_csv(index=False)
     filename = "priced_items.csv"
     if result.ship_name:
         filename = f"{result.ship_name.replace(' ', '_')}_priced.csv"
@@ -444,7 +486,10 @@ def _render_action_chips(result: PricerResult, language_code: str):
     with c1:
         st.download_button(
             translate_text(language_code, "pricer.appraisal.action_download"),
-            data=csv_data,
+            # Built only when clicked, not on every rerun of the page.
+            data=lambda r=result: build_csv_download(
+                drop_localized_backup_columns(r.to_dataframe())
+            ),
             file_name=filename,
             mime="text/csv",
             use_container_width=True,
@@ -457,6 +502,7 @@ def _render_action_chips(result: PricerResult, language_code: str):
         ):
             ss_set("pricer_result", None)
             st.session_state.pop("pricer_result", None)
+            st.session_state.pop("pricer_df", None)
             st.rerun()
 
 
@@ -508,10 +554,21 @@ def _render_control_row(language_code: str):
         )
 
 
-def _render_items_table(result: PricerResult, market, sde_repo, language_code: str):
-    """Render the main pricer results table (existing behaviour, regrouped)."""
-    if not result.items:
-        return
+def _pricer_items_df(
+    result: PricerResult, sde_repo, language_code: str
+) -> tuple[pd.DataFrame, dict]:
+    """Return the localized items table for a result and its style cache.
+
+    Both are kept in session state next to the result they were built from,
+    so toggling the display controls reuses them instead of rebuilding.
+    """
+    cached = ss_get("pricer_df")
+    if (
+        cached is not None
+        and cached["result"] is result
+        and cached["language"] == language_code
+    ):
+        return cached["df"], cached["styles"]
 
     df = result.to_dataframe()
     df = apply_localized_names(
@@ -523,7 +580,34 @@ def _render_items_table(result: PricerResult, market, sde_repo, language_code: s
         logger=logger,
         english_name_column="Item_en",
     )
-    df["Total Volume"] = df["Qty"] * df["Volume"]
+    df["Total Volume"] = df["Qty"].to_numpy(dtype="int64") * df["Volume"].to_numpy(
+        dtype="float64"
+    )
+    df = drop_localized_backup_columns(df)
+    styles: dict = {}
+    ss_set(
+        "pricer_df",
+        {"result": result, "language": language_code, "df": df, "styles": styles},
+    )
+    return df, styles
+
+
+def _pricer_style_matrix(
+    styles: dict, df: pd.DataFrame, highlight_doctrine: bool, show_stock: bool
+) -> pd.DataFrame:
+    """Cell CSS for the items table, computed once per frame and flag pair."""
+    key = (highlight_doctrine, show_stock)
+    if key not in styles:
+        styles[key] = build_pricer_style_matrix(df, highlight_doctrine, show_stock)
+    return styles[key]
+
+
+def _render_items_table(result: PricerResult, market, sde_repo, language_code: str):
+    """Render the main pricer results table (existing behaviour, regrouped)."""
+    if not result.items:
+        return
+
+    df, styles = _pricer_items_df(result, sde_repo, language_code)
 
     show_jita = ss_get("pricer_show_jita", True)
     show_stock = ss_get("pricer_show_stock_metrics", True)
@@ -547,14 +631,13 @@ def _render_items_table(result: PricerResult, market, sde_repo, language_code: s
     column_order += always_show
     column_order = [c for c in column_order if c in df.columns]
 
-    styled_df = drop_localized_backup_columns(df.copy())
-
-    if highlight_doctrine and "Is Doctrine" in styled_df.columns:
-        styled_df = styled_df.style.apply(highlight_doctrine_rows, axis=1)
-        if show_stock and "Days of Stock" in df.columns:
-            styled_df = styled_df.map(highlight_low_stock, subset=["Days of Stock"])
-    elif show_stock and "Days of Stock" in df.columns:
-        styled_df = styled_df.style.map(highlight_low_stock, subset=["Days of Stock"])
+    styled_df = df
+    if (highlight_doctrine and "Is Doctrine" in df.columns) or (
+        show_stock and "Days of Stock" in df.columns
+    ):
+        matrix = _pricer_style_matrix(styles, df, highlight_doctrine, show_stock)
+        # Styler runs this on every render; it only hands back the cached matrix
+        styled_df = df.style.apply(lambda _: matrix, axis=None)
 
     st.markdown(
         f'<div style="font-size:0.9rem; font-weight:600; margin:8px 0 4px 0;">'
@@ -714,7 +797,7 @@ def _render_fit_availability_table(
         )
     df = pd.DataFrame(rows)
     styled = df.style.apply(
-        _highlight_fit_row, axis=1, fits_available=summary.fits_available
+        _fit_row_style_matrix, axis=None, fits_available=summary.fits_available
     )
 
     st.data_editor(
@@ -778,12 +861,26 @@ def _render_fit_availability_section(
 
 
 def _process_input(input_text: str):
-    """Run pricing and store the result in session state."""
+    """Parse and price the input and store the result in session state.
+
+    Input with no item lines is stored as an unpriced result straight away,
+    so its parse errors are listed without building the pricer service.
+    """
     language_code = get_active_language()
+    parsed = parse_input(input_text)
+    raw_items, input_format, ship_name, fit_name, parse_errors = parsed
+    if not raw_items:
+        ss_set(
+            "pricer_result",
+            unpriced_result(input_format, ship_name, fit_name, parse_errors),
+        )
+        ss_set("pricer_input_text", input_text)
+        return
+
     with st.spinner(translate_text(language_code, "pricer.fetching_prices")):
         try:
             service = get_pricer_service()
-            result = service.price_input(input_text)
+            result = service.price_parsed(*parsed)
             ss_set("pricer_result", result)
             ss_set("pricer_input_text", input_text)
             logger.info("Priced %d items", len(result.items))
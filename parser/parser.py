@@ -1,9 +1,17 @@
-from typing import Mapping, MutableMapping, Tuple, TypedDict
+from typing import Mapping, NamedTuple, Tuple
 from typing import *
+import csv
+import io
 import re
+from collections import Counter, namedtuple
+from functools import lru_cache
 # from common.common import EveItem, InvalidItemError, ItemCount
 import logging
 
+import pandas as pd
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, aliased
 
 import model.model
@@ -11,63 +19,107 @@ import model.model
 
 logger = logging.getLogger()
 
-EveItem = model.EsiItemInfo
+# Trailing "x10" quantity on an EFT module/cargo line
+_QTY_RE = re.compile(r"x([1-9][0-9]*)$")
+
+# Read-only snapshot of an EsiItemInfo row; avoids ORM identity-map work on lookups
+_ITEM_COLUMNS = tuple(model.EsiItemInfo.__table__.columns)
+EsiItemRow = namedtuple("EsiItemRow", [col.key for col in _ITEM_COLUMNS])
 
-class ItemCount(TypedDict):
+EveItem = EsiItemRow
+
+class ItemCount(NamedTuple):
     type : EveItem
     count : int
 
 ItemList = List[ItemCount]
 
-def verifyItem(session: Session, typeName: str) -> Optional[model.EsiItemInfo]:
-    item = session.query(model.EsiItemInfo).filter(model.EsiItemInfo.typeName.ilike(typeName)).one_or_none()
-    return item
-
-
-def parse_multibuy_items(session: Session, buylist: str) ->ItemList:
-    entries = buylist.split("\n")
-    items : ItemList = list()
-    invalids : List[str] = list()
-    for entry in entries:
-        #skip empty lines
-        if not entry:
-            continue
-        cols = entry.split("\t")
-        if cols[0] == "Total:":
-            break
-        count:int
-        count = int(cols[1].replace('.','')) if len(cols) > 1 else 1
-        item = cols[0]
-        item_model = verifyItem(session, item)
-        if item_model:
-            items.append(({'type':item_model,'count':count}))
-        else:
-            invalids.append(item)
-    return items
-
-def _add_count(item_list : MutableMapping[EveItem,int], entry: ItemCount):
-    item = entry['type']
-    count = entry['count']
-    if item in item_list:
-        item_list[item] = item_list[item] + count
-    else:
-        item_list[item] = count
-
-def parse_mod(session: Session, item_line: str) -> Optional[ItemCount]:
+@lru_cache(maxsize=None)
+def _ensure_typename_index(bind) -> bool:
+    # NOCASE index so the typeName lookups below are index seeks, not table scans.
+    # Best effort, tried once per bind: on a read-only or replica file the DDL
+    # fails and lookups fall back to the same query without the index.
+    try:
+        with bind.begin() as conn:
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_esiitems_typename_nocase "
+                f"ON {model.EsiItemInfo.__tablename__}(typeName COLLATE NOCASE)"
+            ))
+        return True
+    except SQLAlchemyError as e:
+        logger.warning("Could not create typeName index, lookups will scan: %s", e)
+        return False
+
+@lru_cache(maxsize=4096)
+def _verify_item_cached(bind, name_lower: str) -> Optional[EsiItemRow]:
+    # Plain row, detached from any Session so cache hits never go stale
+    _ensure_typename_index(bind)
+    with bind.connect() as conn:
+        row = conn.execute(
+            select(*_ITEM_COLUMNS).where(model.EsiItemInfo.typeName.collate("NOCASE") == name_lower)
+        ).first()
+    return EsiItemRow(*row) if row else None
+
+def verifyItem(session: Session, typeName: str) -> Optional[EsiItemRow]:
+    return _verify_item_cached(session.get_bind(), typeName.lower())
+
+def verify_items_bulk(session: Session, names: Iterable[str]) -> Dict[str, EsiItemRow]:
+    # One IN query for every candidate name, keyed by the lowercased typeName
+    lowered = list({name.lower() for name in names if name})
+    if not lowered:
+        return {}
+    _ensure_typename_index(session.get_bind())
+    rows = session.execute(
+        select(*_ITEM_COLUMNS).where(model.EsiItemInfo.typeName.collate("NOCASE").in_(lowered))
+    ).all()
+    return {row.typeName.lower(): EsiItemRow(*row) for row in rows}
+
+
+MULTIBUY_COLUMNS = ["typeID", "typeName", "count"]
+
+def parse_multibuy_items(session: Session, buylist: str) -> pd.DataFrame:
+    if not buylist.strip():
+        return pd.DataFrame(columns=MULTIBUY_COLUMNS)
+    # Tokenize the TSV in the C parser; blank lines are skipped, extra columns ignored
+    raw = pd.read_csv(
+        io.StringIO(buylist), sep="\t", header=None, names=[0, 1], usecols=[0, 1],
+        index_col=False, dtype=str, quoting=csv.QUOTE_NONE, engine="c", skip_blank_lines=True,
+    )
+    #stop at the "Total:" footer
+    raw = raw[~raw[0].eq("Total:").cummax()]
+    # A blank name column reads as NaN; such lines can never resolve to an item
+    raw = raw.dropna(subset=[0])
+    counts = pd.to_numeric(raw[1].str.replace('.', '', regex=False), errors="coerce").fillna(1).astype(int)
+    parsed : List[Tuple[str,int]] = list(zip(raw[0].tolist(), counts.tolist()))
+
+    known = verify_items_bulk(session, (item for item, _ in parsed))
+    resolved = [
+        (item_model.typeID, item_model.typeName, count)
+        for item, count in parsed
+        if (item_model := known.get(item.lower())) is not None
+    ]
+    if len(resolved) < len(parsed) and logger.isEnabledFor(logging.DEBUG):
+        invalids = [item for item, _ in parsed if item.lower() not in known]
+        logger.debug("Skipping unknown multibuy items: %s", invalids)
+    return pd.DataFrame.from_records(resolved, columns=MULTIBUY_COLUMNS)
+
+def _split_quantity(item_line: str) -> Tuple[str, int]:
     # Looks for a "Item x10" string which will come out as ("Item", 10)
-    item_line.rstrip()
+    item_line = item_line.rstrip()
     wds = item_line.split(" ")
-    res = re.search("x([1-9]+[0-9]*)", wds[-1])
-
-    model = verifyItem(session, item_line)
+    res = _QTY_RE.match(wds[-1])
+    if len(wds) > 1 and res:
+        return " ".join(wds[0:len(wds)-1]), int(res[1])
+    return item_line, 1
+
+def parse_mod(session: Session, item_line: str, known: Optional[Mapping[str, EveItem]] = None) -> Optional[ItemCount]:
+    item_name, count = _split_quantity(item_line)
+    if known is None:
+        model = verifyItem(session, item_name)
+    else:
+        model = known.get(item_name.lower())
     if model:
-        return (ItemCount(type = model, count = 1))
-    elif res and res[1]:
-        count = int(res[1])
-        item_line = " ".join(wds[0:len(wds)-1])
-        model = verifyItem(session, item_line)
-        if model:
-            return (ItemCount(type = model, count = count))
+        return (ItemCount(type = model, count = count))
     return None
 
 FittingItems = Mapping[EveItem,int]
@@ -77,7 +129,20 @@ def parse_fit(session: Session, fitting : str) -> FittingItems:
     lines = fitting.split("\n")
 
     items = lines
-    item_list : MutableMapping[EveItem,int]= {}
+    item_list : Counter[EveItem] = Counter()
+
+    # Collect every candidate name first so the whole fit resolves in one query
+    names : Set[str] = set()
+    for item_line in lines:
+        if(item_line == ""):
+            continue
+        if(item_line[0] == '['):
+            names.add(item_line.split(",")[0][1:])
+        else:
+            for item_name in item_line.split(","):
+                names.add(_split_quantity(item_name)[0])
+    known = verify_items_bulk(session, names)
+
     # item_list[ship] = 1
     for item_line in items:
         try:
@@ -89,9 +154,9 @@ def parse_fit(session: Session, fitting : str) -> FittingItems:
             if(item_line[0] == '['):
                 wds = item_line.split(",")
                 ship = wds[0][1:]
-                ship_model = verifyItem(session, ship)
+                ship_model = known.get(ship.lower())
                 if(ship_model):
-                    _add_count(item_list, ItemCount(type=ship_model, count=1))
+                    item_list[ship_model] += 1
             else:
                 if "," in item_line:
                     items = item_line.split(",")
@@ -99,9 +164,9 @@ def parse_fit(session: Session, fitting : str) -> FittingItems:
                     items = [item_line]
 
                 for item_name in items:
-                        (item_count) = parse_mod(session, item_name)
+                        (item_count) = parse_mod(session, item_name, known)
                         if item_count:
-                            _add_count(item_list, item_count)
+                            item_list[item_count.type] += item_count.count
         # except InvalidItemError as err:
         #     logger.critical("Skipping invalid Item {}".format(err.itemName))
         finally:
@@ -15,7 +15,11 @@ Key Components:
 """
 
 from repositories.base import BaseRepository
-from repositories.doctrine_repo import DoctrineRepository, get_doctrine_repository
+from repositories.doctrine_repo import (
+    DoctrineRepository,
+    get_doctrine_repository,
+    invalidate_doctrine_caches,
+)
 from repositories.market_repo import (
     MarketRepository,
     get_market_repository,
@@ -35,6 +39,7 @@ __all__ = [
     "BaseRepository",
     "DoctrineRepository",
     "get_doctrine_repository",
+    "invalidate_doctrine_caches",
     "MarketRepository",
     "get_market_repository",
     "invalidate_market_caches",
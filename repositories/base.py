@@ -11,15 +11,32 @@ Design Principles:
 3. Consistent interface - All repositories inherit this pattern
 """
 
-from typing import Any, Mapping, Optional
+from typing import Any, Callable, Mapping, Optional
 import logging
 import pandas as pd
+from sqlalchemy import text
 
 from config import DatabaseConfig
 from logging_config import setup_logging
 
 logger = setup_logging(__name__)
 
+# Substrings of errors that a fresh sync can fix. Matched on the message, not
+# the type: libsql surfaces these as ValueError rather than a DBAPI error, and
+# anything else (pandas, network, SQL mistakes) must not trigger a sync.
+_LOCAL_DB_ERROR_MARKERS = (
+    "malform",
+    "file is not a database",
+    "no such table",
+    "disk i/o error",
+)
+
+
+def _is_local_db_error(exc: Exception) -> bool:
+    """True if ``exc`` looks like a corrupt or incomplete local database file."""
+    msg = str(exc).lower()
+    return any(marker in msg for marker in _LOCAL_DB_ERROR_MARKERS)
+
 
 class BaseRepository:
     """
@@ -73,13 +90,60 @@ class BaseRepository:
             DataFrame with query results
         """
 
-        def _run_local() -> pd.DataFrame:
+        def _run(conn) -> pd.DataFrame:
+            return pd.read_sql_query(query, conn, params=params)
+
+        return self._read_with_recovery(
+            _run, local=local, fallback_remote_on_malformed=fallback_remote_on_malformed
+        )
+
+    def read_scalar(
+        self,
+        query: Any,
+        params: Mapping[str, Any] | None = None,
+        *,
+        local: bool = True,
+        fallback_remote_on_malformed: bool = True,
+    ) -> Any:
+        """Execute a read-only SQL query and return the first column of the first row.
+
+        Same recovery path as read_df(), without building a DataFrame, for
+        single-value lookups. Returns None when the query yields no rows.
+
+        Args:
+            query: SQL query string or SQLAlchemy TextClause
+            params: Optional query parameters
+            local: If False, read directly from remote
+            fallback_remote_on_malformed: If True, fall back to remote on DB errors
+
+        Returns:
+            The scalar value, or None
+        """
+        stmt = text(query) if isinstance(query, str) else query
+
+        def _run(conn) -> Any:
+            return conn.execute(stmt, dict(params or {})).scalar()
+
+        return self._read_with_recovery(
+            _run, local=local, fallback_remote_on_malformed=fallback_remote_on_malformed
+        )
+
+    def _read_with_recovery(
+        self,
+        run: Callable[[Any], Any],
+        *,
+        local: bool,
+        fallback_remote_on_malformed: bool,
+    ) -> Any:
+        """Run ``run(conn)`` locally, syncing and falling back to remote on DB errors."""
+
+        def _run_local() -> Any:
             with self.db.engine.connect() as conn:
-                return pd.read_sql_query(query, conn, params=params)
+                return run(conn)
 
-        def _run_remote() -> pd.DataFrame:
+        def _run_remote() -> Any:
             with self.db.remote_engine.connect() as conn:
-                return pd.read_sql_query(query, conn, params=params)
+                return run(conn)
 
         if not local:
             return _run_remote()
@@ -88,16 +152,9 @@ class BaseRepository:
             return _run_local()
 
         except Exception as e:
-            msg = str(e).lower()
-            if fallback_remote_on_malformed and (
-                "malform" in msg
-                or "database disk image is malformed" in msg
-                or "file is not a database" in msg
-                or "no such table" in msg
-                or "disk i/o error" in msg
-            ):
+            if fallback_remote_on_malformed and _is_local_db_error(e):
                 self._logger.error(
-                    f"Local DB error ('{msg}'); syncing and retrying, "
+                    f"Local DB error ('{str(e).lower()}'); syncing and retrying, "
                     f"with remote fallback..."
                 )
                 try:
@@ -6,11 +6,13 @@ Extracts DB functions from pages/build_costs.py into the repository pattern.
 """
 
 import logging
-from typing import Optional
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 import pandas as pd
 import streamlit as st
-from sqlalchemy import text
+from sqlalchemy import bindparam, inspect, text
 
 from config import DatabaseConfig
 from logging_config import setup_logging
@@ -27,6 +29,38 @@ VALID_STRUCTURE_TYPE_IDS = [35827, 35825, 35826]
 SUPER_SHIPYARD_ID = 1046452498926
 INVALID_RIG_IDS = [46640, 46641, 46496, 46497, 46634]
 
+# Statements are built once so SQLAlchemy's compiled cache sees a stable key;
+# IN-lists use expanding bind params rather than interpolated ids.
+_STRUCTURE_RIGS_STMT = text(
+    """
+    WITH slots AS (
+        SELECT structure, 1 AS slot, rig_1 AS rig FROM structures
+        WHERE structure_type_id IN :structure_type_ids
+        UNION ALL
+        SELECT structure, 2, rig_2 FROM structures
+        WHERE structure_type_id IN :structure_type_ids
+        UNION ALL
+        SELECT structure, 3, rig_3 FROM structures
+        WHERE structure_type_id IN :structure_type_ids
+    )
+    SELECT slots.structure, r.type_name
+    FROM slots
+    LEFT JOIN rigs r
+        ON r.type_name = slots.rig AND r.type_id NOT IN :invalid_rig_ids
+    ORDER BY slots.structure, slots.slot
+    """
+).bindparams(
+    bindparam("structure_type_ids", expanding=True),
+    bindparam("invalid_rig_ids", expanding=True),
+)
+
+_SUPER_STRUCTURES_STMT = text("SELECT * FROM structures WHERE structure_id = :shipyard_id")
+
+_STRUCTURES_STMT = text(
+    "SELECT * FROM structures WHERE structure_id != :shipyard_id "
+    "AND structure_type_id IN :structure_type_ids"
+).bindparams(bindparam("structure_type_ids", expanding=True))
+
 
 # =============================================================================
 # Implementation Functions (non-cached, for testability)
@@ -47,26 +81,26 @@ def _get_valid_rigs_impl(engine) -> dict[str, int]:
 
 
 def _get_structure_rigs_impl(engine) -> dict[str, list[str]]:
-    """Get rigs per structure as {structure_name: [rig_name, ...]}."""
-    valid_rigs = _get_valid_rigs_impl(engine)
-    ids_str = ", ".join(str(tid) for tid in VALID_STRUCTURE_TYPE_IDS)
-    with engine.connect() as conn:
-        res = conn.execute(
-            text(f"SELECT structure, rig_1, rig_2, rig_3 FROM structures "
-                 f"WHERE structure_type_id IN ({ids_str})")
-        )
-        rows = res.fetchall()
+    """Get rigs per structure as {structure_name: [rig_name, ...]}.
 
-    rig_dict = {}
-    for row in rows:
-        structure, rig_1, rig_2, rig_3 = row
-        raw_rigs = [rig_1, rig_2, rig_3]
-        clean_rigs = [
-            r for r in raw_rigs
-            if r is not None and r != "0" and r in valid_rigs
-        ]
-        rig_dict[structure] = clean_rigs
-    return rig_dict
+    One query unpivots the three rig slots and joins them against the valid
+    rigs, so structures come back with their rigs already filtered.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(
+            _STRUCTURE_RIGS_STMT,
+            {
+                "structure_type_ids": VALID_STRUCTURE_TYPE_IDS,
+                "invalid_rig_ids": INVALID_RIG_IDS,
+            },
+        ).fetchall()
+
+    rig_dict: dict[str, list[str]] = defaultdict(list)
+    for structure, rig_name in rows:
+        rigs = rig_dict[structure]
+        if rig_name is not None:
+            rigs.append(rig_name)
+    return dict(rig_dict)
 
 
 def _get_manufacturing_cost_index_impl(engine, system_id: int) -> float:
@@ -85,24 +119,64 @@ def _get_manufacturing_cost_index_impl(engine, system_id: int) -> float:
 def _get_all_structures_impl(engine, is_super: bool):
     """Fetch structures filtered by super mode."""
     if is_super:
-        stmt = text(
-            f"SELECT * FROM structures WHERE structure_id = {SUPER_SHIPYARD_ID}"
-        )
+        stmt, params = _SUPER_STRUCTURES_STMT, {"shipyard_id": SUPER_SHIPYARD_ID}
     else:
-        ids_str = ", ".join(str(tid) for tid in VALID_STRUCTURE_TYPE_IDS)
-        stmt = text(
-            f"SELECT * FROM structures WHERE structure_id != {SUPER_SHIPYARD_ID} "
-            f"AND structure_type_id IN ({ids_str})"
-        )
+        stmt, params = _STRUCTURES_STMT, {
+            "shipyard_id": SUPER_SHIPYARD_ID,
+            "structure_type_ids": VALID_STRUCTURE_TYPE_IDS,
+        }
     with engine.connect() as conn:
-        res = conn.execute(stmt)
+        res = conn.execute(stmt, params)
         return res.fetchall()
 
 
+def _replace_rows_sqlite(engine, table: str, df: pd.DataFrame) -> None:
+    """DELETE + executemany INSERT of plain row tuples in one DBAPI transaction."""
+    columns = ", ".join(f'"{col}"' for col in df.columns)
+    placeholders = ", ".join("?" for _ in df.columns)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.executemany(
+            f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+            list(df.itertuples(index=False, name=None)),
+        )
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+
+
 def _write_industry_index_impl(engine, df: pd.DataFrame) -> None:
-    """Write industry index DataFrame to the database."""
-    with engine.connect() as conn:
-        df.to_sql("industry_index", conn, if_exists="replace", index=False)
+    """Write industry index DataFrame to the database.
+
+    On the stdlib sqlite3 driver, when the table already has the frame's
+    columns, rows are replaced in place with a raw DELETE + executemany.
+    Otherwise (including the libsql driver) the table is recreated with
+    multi-row INSERTs sized to stay under SQLite's 999 bound parameter
+    limit, inside one transaction so the replace is atomic.
+    """
+    if engine.dialect.name == "sqlite" and engine.dialect.driver == "pysqlite":
+        inspector = inspect(engine)
+        if inspector.has_table("industry_index") and {
+            col["name"] for col in inspector.get_columns("industry_index")
+        } == set(df.columns):
+            _replace_rows_sqlite(engine, "industry_index", df)
+            return
+
+    chunksize = max(1, 900 // max(1, len(df.columns)))
+    with engine.begin() as conn:
+        df.to_sql(
+            "industry_index",
+            conn,
+            if_exists="replace",
+            index=False,
+            method="multi",
+            chunksize=chunksize,
+        )
 
 
 def _get_builder_cost_catalog_impl() -> pd.DataFrame:
@@ -128,16 +202,20 @@ def _get_builder_cost_catalog_impl() -> pd.DataFrame:
 # Cached Wrappers (Streamlit cache layer)
 # =============================================================================
 
-@st.cache_data(ttl=3600)
-def _get_valid_rigs_cached(_url: str) -> dict[str, int]:
+# Rig lookups are read on every rerun of the build cost page. They are shared
+# through cache_resource as read-only mappings instead of being unpickled by
+# cache_data on each access.
+
+@st.cache_resource(ttl=3600)
+def _get_valid_rigs_cached(_url: str) -> Mapping[str, int]:
     db = DatabaseConfig("build_cost")
-    return _get_valid_rigs_impl(db.engine)
+    return MappingProxyType(_get_valid_rigs_impl(db.engine))
 
 
-@st.cache_data(ttl=3600)
-def _get_structure_rigs_cached(_url: str) -> dict[str, list[str]]:
+@st.cache_resource(ttl=3600)
+def _get_structure_rigs_cached(_url: str) -> Mapping[str, list[str]]:
     db = DatabaseConfig("build_cost")
-    return _get_structure_rigs_impl(db.engine)
+    return MappingProxyType(_get_structure_rigs_impl(db.engine))
 
 
 @st.cache_data(ttl=3600)
@@ -192,12 +270,12 @@ class BuildCostRepository(BaseRepository):
         super().__init__(db, logger_instance)
         self._cache_key = db.url
 
-    def get_valid_rigs(self) -> dict[str, int]:
-        """Get valid rigs (excludes invalid rig IDs), cached TTL=3600s."""
+    def get_valid_rigs(self) -> Mapping[str, int]:
+        """Get valid rigs (excludes invalid rig IDs) as a read-only mapping, cached TTL=3600s."""
         return _get_valid_rigs_cached(self._cache_key)
 
-    def get_structure_rigs(self) -> dict[str, list[str]]:
-        """Get rigs per structure, cached TTL=3600s."""
+    def get_structure_rigs(self) -> Mapping[str, list[str]]:
+        """Get rigs per structure as a read-only mapping, cached TTL=3600s."""
         return _get_structure_rigs_cached(self._cache_key)
 
     def get_manufacturing_cost_index(self, system_id: int) -> float:
@@ -45,6 +45,109 @@ def _empty_doctrine_fits_df() -> pd.DataFrame:
     return pd.DataFrame(columns=DOCTRINE_FITS_COLUMNS)
 
 
+def _active_market_key() -> Optional[str]:
+    """Resolve the active market key for market_flag filtering.
+
+    Defaults to 'primary' when the state module is unavailable and returns
+    None when the key cannot be resolved, so callers can return empty.
+    """
+    try:
+        from state.market_state import get_active_market_key
+        return get_active_market_key()
+    except ImportError:
+        logger.debug("state.market_state unavailable, defaulting to 'primary'")
+        return "primary"
+    except Exception:
+        logger.error("Failed to resolve active market key", exc_info=True)
+        return None
+
+
+# =============================================================================
+# Queries
+# =============================================================================
+# Built once at import so SQLAlchemy's compiled-statement cache sees a
+# stable key instead of re-parsing the SQL on every call.
+
+_Q_FIT_BY_ID = text("SELECT * FROM doctrines WHERE fit_id = :fit_id")
+_Q_DOCTRINE_FITS = text("SELECT * FROM doctrine_fits")
+_Q_ALL_TARGETS = text("SELECT * FROM ship_targets")
+_Q_TARGET_BY_FIT = text("SELECT ship_target FROM ship_targets WHERE fit_id = :fit_id")
+_Q_TARGET_BY_SHIP = text("SELECT ship_target FROM ship_targets WHERE ship_id = :ship_id")
+_Q_TARGET_QUANTITIES = text(
+    """
+    SELECT d.type_id, MAX(d.fit_qty * t.ship_target) AS target_qty
+    FROM doctrines d
+    JOIN ship_targets t ON d.fit_id = t.fit_id
+    WHERE d.fit_id IN :fit_ids
+    GROUP BY d.type_id
+    """
+).bindparams(bindparam("fit_ids", expanding=True))
+_Q_FIT_NAME = text("SELECT fit_name FROM ship_targets WHERE fit_id = :fit_id")
+_Q_FIT_NAME_FALLBACK = text("SELECT fit_name FROM doctrine_fits WHERE fit_id = :fit_id LIMIT 1")
+_Q_FRIENDLY_NAMES = text(
+    "SELECT DISTINCT doctrine_name, friendly_name "
+    "FROM doctrine_fits "
+    "WHERE friendly_name IS NOT NULL"
+)
+_Q_LEAD_SHIP = text("SELECT lead_ship FROM lead_ships WHERE doctrine_id = :doctrine_id")
+_Q_DOCTRINE_FIT_IDS = text("""
+    SELECT DISTINCT fit_id
+    FROM doctrine_fits
+    WHERE doctrine_name = :name
+      AND market_flag IN :market_flags
+""").bindparams(bindparam("market_flags", expanding=True))
+_Q_DOCTRINE = text("""
+    SELECT df.doctrine_id, df.doctrine_name, df.fit_id, ls.lead_ship
+    FROM doctrine_fits df
+    LEFT JOIN lead_ships ls ON ls.doctrine_id = df.doctrine_id
+    WHERE df.doctrine_name = :name
+      AND df.market_flag IN :market_flags
+""").bindparams(bindparam("market_flags", expanding=True))
+_Q_MODULE_STOCK = text("""
+    SELECT type_name, type_id, total_stock, fits_on_mkt
+    FROM doctrines
+    WHERE type_id = :type_id
+    LIMIT 1
+""")
+_Q_MODULE_USAGE = text("""
+    SELECT st.ship_name, st.ship_target, d.fit_qty
+    FROM doctrines d
+    JOIN ship_targets st ON d.fit_id = st.fit_id
+    WHERE d.type_id = :type_id
+""")
+_Q_MODULE_STOCKS = text("""
+    SELECT type_name, type_id, total_stock, fits_on_mkt
+    FROM doctrines
+    WHERE type_id IN :type_ids
+""").bindparams(bindparam("type_ids", expanding=True))
+_Q_MODULE_USAGES = text("""
+    SELECT d.type_id, st.ship_name, st.ship_target, d.fit_qty
+    FROM doctrines d
+    JOIN ship_targets st ON d.fit_id = st.fit_id
+    WHERE d.type_id IN :type_ids
+""").bindparams(bindparam("type_ids", expanding=True))
+_Q_MODULE_FIT_INFO = text("""
+    SELECT fit_id, ship_name, fit_qty, type_name, type_id, total_stock, fits_on_mkt
+    FROM doctrines
+    WHERE type_id = :type_id
+""")
+_Q_SHIP_STOCK = text("""
+    SELECT type_name, type_id, total_stock, fits_on_mkt, fit_id
+    FROM doctrines
+    WHERE type_id = :type_id
+    LIMIT 1
+""")
+_Q_SHIP_STOCK_FOR_FIT = text("""
+    SELECT type_name, type_id, total_stock, fits_on_mkt, fit_id
+    FROM doctrines
+    WHERE type_id = :type_id AND fit_id = :fit_id
+    LIMIT 1
+""")
+_Q_AVG_PRICES = text(
+    "SELECT type_id, avg_price FROM marketstats WHERE type_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+
 class DoctrineRepository:
     """
     Repository for all doctrine-related database operations.
@@ -167,30 +270,12 @@ class DoctrineRepository:
         Returns:
             DataFrame with columns: doctrine_id, doctrine_name, fit_id, market_flag, ...
         """
-        query = "SELECT * FROM doctrine_fits"
-
-        try:
-            df = self._reader.read_df(query)
-
-            # Filter by active market key
-            try:
-                from state.market_state import get_active_market_key
-                market_key = get_active_market_key()
-            except ImportError:
-                logger.debug("state.market_state unavailable, defaulting to 'primary'")
-                market_key = "primary"
-            except Exception:
-                logger.error("Failed to resolve active market key — returning empty DataFrame", exc_info=True)
-                return _empty_doctrine_fits_df()
-
-            if "market_flag" in df.columns:
-                df = df[df["market_flag"].isin([market_key, "both"])]
-
-            return df
-        except Exception as e:
-            self._logger.error(f"Failed to get doctrine compositions: {e}")
+        market_key = _active_market_key()
+        if market_key is None:
             return _empty_doctrine_fits_df()
 
+        return get_doctrine_compositions_with_cache(self._db.alias, market_key)
+
     def get_doctrine_fit_ids(self, doctrine_name: str) -> list[int]:
         """
         Get all fit IDs belonging to a specific doctrine.
@@ -201,12 +286,19 @@ class DoctrineRepository:
         Returns:
             List of fit IDs in this doctrine
         """
-        df = self.get_all_doctrine_compositions()
-        if df.empty:
+        market_key = _active_market_key()
+        if market_key is None:
             return []
 
-        filtered = df[df['doctrine_name'] == doctrine_name]
-        return filtered['fit_id'].unique().tolist()
+        try:
+            df = self._reader.read_df(
+                _Q_DOCTRINE_FIT_IDS,
+                params={"name": doctrine_name, "market_flags": [market_key, "both"]},
+            )
+            return [int(fit_id) for fit_id in df["fit_id"]]
+        except Exception as e:
+            self._logger.error(f"Failed to get fit IDs for doctrine {doctrine_name}: {e}")
+            return []
 
     def get_doctrine_lead_ship(self, doctrine_id: int) -> Optional[int]:
         """
@@ -220,14 +312,9 @@ class DoctrineRepository:
         Returns:
             Lead ship type ID, or None if not found
         """
-        query = text("SELECT lead_ship FROM lead_ships WHERE doctrine_id = :doctrine_id")
-
         try:
-            df = self._reader.read_df(query, params={"doctrine_id": doctrine_id})
-
-            if not df.empty and pd.notna(df.loc[0, 'lead_ship']):
-                return int(df.loc[0, 'lead_ship'])
-            return None
+            lead_ship = self._reader.read_scalar(_Q_LEAD_SHIP, params={"doctrine_id": doctrine_id})
+            return int(lead_ship) if lead_ship is not None else None
 
         except Exception as e:
             self._logger.error(f"Failed to get lead ship for doctrine {doctrine_id}: {e}")
@@ -247,16 +334,9 @@ class DoctrineRepository:
         Returns:
             DataFrame with type_name, type_id, total_stock, fits_on_mkt
         """
-        query = text("""
-            SELECT type_name, type_id, total_stock, fits_on_mkt
-            FROM doctrines
-            WHERE type_id = :type_id
-            LIMIT 1
-        """)
-
         try:
             with self._db.engine.connect() as conn:
-                return pd.read_sql_query(query, conn, params={"type_id": type_id})
+                return pd.read_sql_query(_Q_MODULE_STOCK, conn, params={"type_id": type_id})
         except Exception as e:
             self._logger.error(f"Failed to get module stock for type_id={type_id}: {e}")
             return pd.DataFrame()
@@ -271,16 +351,9 @@ class DoctrineRepository:
         Returns:
             DataFrame with ship_name, ship_target, fit_qty
         """
-        query = text("""
-            SELECT st.ship_name, st.ship_target, d.fit_qty
-            FROM doctrines d
-            JOIN ship_targets st ON d.fit_id = st.fit_id
-            WHERE d.type_id = :type_id
-        """)
-
         try:
             with self._db.engine.connect() as conn:
-                return pd.read_sql_query(query, conn, params={"type_id": type_id})
+                return pd.read_sql_query(_Q_MODULE_USAGE, conn, params={"type_id": type_id})
         except Exception as e:
             self._logger.error(f"Failed to get module usage for type_id={type_id}: {e}")
             return pd.DataFrame()
@@ -298,14 +371,9 @@ class DoctrineRepository:
             Empty DataFrame if the type_id is not in any fit or on query failure.
             Callers must distinguish "not in any fit" from "DB error" via logs.
         """
-        query = text("""
-            SELECT fit_id, ship_name, fit_qty, type_name, type_id, total_stock, fits_on_mkt
-            FROM doctrines
-            WHERE type_id = :type_id
-        """)
         try:
             with self._db.engine.connect() as conn:
-                return pd.read_sql_query(query, conn, params={"type_id": type_id})
+                return pd.read_sql_query(_Q_MODULE_FIT_INFO, conn, params={"type_id": type_id})
         except Exception as e:
             self._logger.error(f"Failed to get module fit info for type_id={type_id}: {e}")
             return pd.DataFrame()
@@ -340,11 +408,29 @@ class DoctrineRepository:
         Returns:
             Dict mapping type_id to ModuleStock
         """
+        if not type_ids:
+            return {}
+
+        params = {"type_ids": list(type_ids)}
+        try:
+            with self._db.engine.connect() as conn:
+                stock_df = pd.read_sql_query(_Q_MODULE_STOCKS, conn, params=params)
+                if stock_df.empty:
+                    return {}
+                usage_df = pd.read_sql_query(_Q_MODULE_USAGES, conn, params=params)
+        except Exception as e:
+            self._logger.error(f"Failed to get module stocks for {len(type_ids)} type_ids: {e}")
+            return {}
+
+        stock_rows = stock_df.drop_duplicates("type_id").set_index("type_id", drop=False)
+        usage_by_type = dict(tuple(usage_df.groupby("type_id")))
+
         result = {}
         for tid in type_ids:
-            stock = self.get_module_stock(tid)
-            if stock:
-                result[tid] = stock
+            if tid in stock_rows.index:
+                result[tid] = ModuleStock.from_query_results(
+                    stock_rows.loc[tid], usage_by_type.get(tid)
+                )
         return result
 
     # =========================================================================
@@ -367,22 +453,12 @@ class DoctrineRepository:
         preferred_fits = _load_preferred_fits()
         preferred_fit_id = preferred_fits.get(type_id)
 
-        # Build query with optional fit_id filter
+        # Optional fit_id filter
         if preferred_fit_id:
-            query = text("""
-                SELECT type_name, type_id, total_stock, fits_on_mkt, fit_id
-                FROM doctrines
-                WHERE type_id = :type_id AND fit_id = :fit_id
-                LIMIT 1
-            """)
+            query = _Q_SHIP_STOCK_FOR_FIT
             params = {"type_id": type_id, "fit_id": preferred_fit_id}
         else:
-            query = text("""
-                SELECT type_name, type_id, total_stock, fits_on_mkt, fit_id
-                FROM doctrines
-                WHERE type_id = :type_id
-                LIMIT 1
-            """)
+            query = _Q_SHIP_STOCK
             params = {"type_id": type_id}
 
         try:
@@ -445,14 +521,15 @@ class DoctrineRepository:
         if not type_ids:
             return {}
 
-        placeholders = ','.join(['?' for _ in type_ids])
-        query = f"SELECT type_id, avg_price FROM marketstats WHERE type_id IN ({placeholders})"
-
         try:
             with self._db.engine.connect() as conn:
-                df = pd.read_sql_query(query, conn, params=tuple(type_ids))
+                rows = conn.execute(_Q_AVG_PRICES, {"ids": list(type_ids)}).fetchall()
 
-            return dict(zip(df['type_id'], df['avg_price']))
+            # NULL prices stay as NaN, matching the old DataFrame result.
+            return {
+                int(type_id): float("nan") if avg_price is None else float(avg_price)
+                for type_id, avg_price in rows
+            }
 
         except Exception as e:
             self._logger.error(f"Failed to get avg prices: {e}")
@@ -476,7 +553,7 @@ class DoctrineRepository:
         if df.empty:
             return []
 
-        return [FitItem.from_dataframe_row(row) for _, row in df.iterrows()]
+        return FitItem.from_dataframe(df)
 
     def get_doctrine(self, doctrine_name: str) -> Optional[Doctrine]:
         """
@@ -488,18 +565,26 @@ class DoctrineRepository:
         Returns:
             Doctrine instance, or None if not found
         """
-        compositions_df = self.get_all_doctrine_compositions()
-        if compositions_df.empty:
+        market_key = _active_market_key()
+        if market_key is None:
             return None
 
-        doctrine_rows = compositions_df[compositions_df['doctrine_name'] == doctrine_name]
-        if doctrine_rows.empty:
+        try:
+            df = self._reader.read_df(
+                _Q_DOCTRINE,
+                params={"name": doctrine_name, "market_flags": [market_key, "both"]},
+            )
+        except Exception as e:
+            self._logger.error(f"Failed to get doctrine {doctrine_name}: {e}")
             return None
 
-        first_row = doctrine_rows.iloc[0]
-        doctrine_id = int(first_row['doctrine_id'])
-        fit_ids = doctrine_rows['fit_id'].unique().tolist()
-        lead_ship_id = self.get_doctrine_lead_ship(doctrine_id)
+        if df.empty:
+            return None
+
+        first_row = df.iloc[0]
+        fit_ids = [int(fit_id) for fit_id in df["fit_id"].unique()]
+        lead_ship = first_row["lead_ship"]
+        lead_ship_id = int(lead_ship) if pd.notna(lead_ship) else None
 
         return Doctrine.from_dataframe(
             first_row,
@@ -616,14 +701,27 @@ def get_all_fits_with_cache(db_alias: str = "wcmkt", market_key: str = "primary"
         logger.error(f"Failed to get all fits: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=600, show_spinner="Getting doctrine compositions...")
+def get_doctrine_compositions_with_cache(db_alias: str = "wcmkt", market_key: str = "primary") -> pd.DataFrame:
+    """Get doctrine_fits rows whose market_flag is ``market_key`` or ``"both"``."""
+    logger.debug("Getting doctrine compositions for market_key=%s ...with cache", market_key)
+    reader = BaseRepository(DatabaseConfig(db_alias), logger)
+    try:
+        df = reader.read_df(_Q_DOCTRINE_FITS)
+        if "market_flag" in df.columns:
+            df = df[df["market_flag"].isin([market_key, "both"])]
+        return df
+    except Exception as e:
+        logger.error(f"Failed to get doctrine compositions: {e}")
+        return _empty_doctrine_fits_df()
+
 @st.cache_data(ttl=600, show_spinner="Getting fit {fit_id}...")
 def get_fit_by_id_with_cache(fit_id: int, db_alias: str = "wcmkt") -> pd.DataFrame:
     """Get all items for a specific fit."""
     logger.debug(f"Getting fit {fit_id}...with cache")
-    query = text("SELECT * FROM doctrines WHERE fit_id = :fit_id")
     reader = BaseRepository(DatabaseConfig(db_alias), logger)
     try:
-        return reader.read_df(query, params={"fit_id": fit_id})
+        return reader.read_df(_Q_FIT_BY_ID, params={"fit_id": fit_id})
     except Exception as e:
         logger.error(f"Failed to get fit {fit_id}: {e}")
         return pd.DataFrame()
@@ -632,10 +730,9 @@ def get_fit_by_id_with_cache(fit_id: int, db_alias: str = "wcmkt") -> pd.DataFra
 def get_all_targets_with_cache(db_alias: str = "wcmkt") -> pd.DataFrame:
     """Get all ship targets."""
     logger.debug("Getting all ship targets...")
-    query = text("SELECT * FROM ship_targets")
     reader = BaseRepository(DatabaseConfig(db_alias), logger)
     try:
-        return reader.read_df(query)
+        return reader.read_df(_Q_ALL_TARGETS)
     except Exception as e:
         logger.error(f"Failed to get all targets: {e}")
         return pd.DataFrame()
@@ -675,16 +772,7 @@ def get_target_quantities_with_cache(db_alias: str = "wcmkt", market_key: str =
             )
             return pd.DataFrame(columns=["type_id", "target_qty"])
 
-        query = text(
-            """
-            SELECT d.type_id, MAX(d.fit_qty * t.ship_target) AS target_qty
-            FROM doctrines d
-            JOIN ship_targets t ON d.fit_id = t.fit_id
-            WHERE d.fit_id IN :fit_ids
-            GROUP BY d.type_id
-            """
-        ).bindparams(bindparam("fit_ids", expanding=True))
-        return reader.read_df(query, params={"fit_ids": valid_fit_ids})
+        return reader.read_df(_Q_TARGET_QUANTITIES, params={"fit_ids": valid_fit_ids})
     except Exception as e:
         logger.error(f"Failed to get doctrine target quantities: {e}")
         return pd.DataFrame(columns=["type_id", "target_qty"])
@@ -693,13 +781,10 @@ def get_target_quantities_with_cache(db_alias: str = "wcmkt", market_key: str =
 def get_target_by_fit_id_with_cache(fit_id: int, default: int = DEFAULT_SHIP_TARGET, db_alias: str = "wcmkt") -> int:
     """Get target stock level for a specific fit."""
     logger.debug(f"Getting target for fit {fit_id}...")
-    query = text("SELECT ship_target FROM ship_targets WHERE fit_id = :fit_id")
     reader = BaseRepository(DatabaseConfig(db_alias), logger)
     try:
-        df = reader.read_df(query, params={"fit_id": fit_id})
-        if not df.empty:
-            return int(df.iloc[0]['ship_target'])
-        return default
+        target = reader.read_scalar(_Q_TARGET_BY_FIT, params={"fit_id": fit_id})
+        return int(target) if target is not None else default
     except Exception as e:
         logger.error(f"Failed to get target for fit {fit_id}: {e}")
         return default
@@ -708,13 +793,10 @@ def get_target_by_fit_id_with_cache(fit_id: int, default: int = DEFAULT_SHIP_TAR
 def get_target_by_ship_id_with_cache(ship_id: int, default: int = DEFAULT_SHIP_TARGET, db_alias: str = "wcmkt") -> int:
     """Get target stock level for a specific ship type."""
     logger.debug(f"Getting target for ship {ship_id}...")
-    query = text("SELECT ship_target FROM ship_targets WHERE ship_id = :ship_id")
     reader = BaseRepository(DatabaseConfig(db_alias), logger)
     try:
-        df = reader.read_df(query, params={"ship_id": ship_id})
-        if not df.empty:
-            return int(df.iloc[0]['ship_target'])
-        return default
+        target = reader.read_scalar(_Q_TARGET_BY_SHIP, params={"ship_id": ship_id})
+        return int(target) if target is not None else default
     except Exception as e:
         logger.error(f"Failed to get target for ship {ship_id}: {e}")
         return default
@@ -738,15 +820,10 @@ def get_friendly_names_with_cache(db_alias: str = "wcmktprod") -> dict[str, str]
     Returns a dict of {doctrine_name: friendly_name} for all rows where
     friendly_name is not NULL. Cached for 10 minutes.
     """
-    query = (
-        "SELECT DISTINCT doctrine_name, friendly_name "
-        "FROM doctrine_fits "
-        "WHERE friendly_name IS NOT NULL"
-    )
     db = DatabaseConfig(db_alias)
     reader = BaseRepository(db, logger)
     try:
-        df = reader.read_df(text(query))
+        df = reader.read_df(_Q_FRIENDLY_NAMES)
         return dict(zip(df["doctrine_name"], df["friendly_name"]))
     except Exception as e:
         logger.warning(f"Failed to load friendly names from DB: {e}")
@@ -771,23 +848,27 @@ def get_fit_name_with_cache(fit_id: int, default: str = "Unknown Fit", db_alias:
     engine = DatabaseConfig(db_alias).engine
     try:
         with engine.connect() as conn:
-            # Try ship_targets first
-            query = text("SELECT fit_name FROM ship_targets WHERE fit_id = :fit_id")
-            df = pd.read_sql_query(query, conn, params={"fit_id": fit_id})
-            if not df.empty:
-                name = df.iloc[0]['fit_name']
-                if pd.notna(name) and str(name).strip():
-                    return str(name).strip()
-
-            # Fall back to doctrine_fits
-            query = text("SELECT fit_name FROM doctrine_fits WHERE fit_id = :fit_id LIMIT 1")
-            df = pd.read_sql_query(query, conn, params={"fit_id": fit_id})
-            if not df.empty:
-                name = df.iloc[0]['fit_name']
-                if pd.notna(name) and str(name).strip():
+            # Try ship_targets first, then fall back to doctrine_fits
+            for query in (_Q_FIT_NAME, _Q_FIT_NAME_FALLBACK):
+                name = conn.execute(query, {"fit_id": fit_id}).scalar()
+                if name is not None and str(name).strip():
                     return str(name).strip()
 
             return default
     except Exception as e:
         logger.error(f"Failed to get fit name for {fit_id}: {e}")
         return default
+
+
+def invalidate_doctrine_caches():
+    """Clear only doctrine caches (e.g. after a DB sync or market switch)."""
+    get_all_fits_with_cache.clear()
+    get_doctrine_compositions_with_cache.clear()
+    get_fit_by_id_with_cache.clear()
+    get_all_targets_with_cache.clear()
+    get_target_quantities_with_cache.clear()
+    get_target_by_fit_id_with_cache.clear()
+    get_target_by_ship_id_with_cache.clear()
+    get_friendly_names_with_cache.clear()
+    get_fit_name_with_cache.clear()
+    logger.info("Doctrine caches invalidated")
@@ -12,6 +12,7 @@ Design Principles:
 """
 
 from typing import Optional
+import json
 import logging
 import time
 from datetime import datetime, timedelta
@@ -51,6 +52,25 @@ def _get_all_orders_impl(db_alias: str = "wcmkt") -> pd.DataFrame:
     return df.reset_index(drop=True)
 
 
+def _get_orders_for_type_ids_impl(type_ids: list[int], db_alias: str = "wcmkt") -> pd.DataFrame:
+    """Fetch marketorders rows for specific type_ids (filtered in SQL).
+
+    The ids are bound as one JSON array and expanded with json_each, so a
+    whole category filters in SQL without hitting SQLite's variable limit.
+    """
+    if not type_ids:
+        return pd.DataFrame()
+    repo = BaseRepository(DatabaseConfig(db_alias), logger)
+    query = text(
+        """
+        SELECT * FROM marketorders
+        WHERE type_id IN (SELECT value FROM json_each(:type_ids))
+        """
+    )
+    df = repo.read_df(query, params={"type_ids": json.dumps([int(tid) for tid in type_ids])})
+    return df.reset_index(drop=True)
+
+
 def _get_all_history_impl(db_alias: str = "wcmkt") -> pd.DataFrame:
     """Fetch all rows from market_history with malformed-DB recovery."""
     repo = BaseRepository(DatabaseConfig(db_alias), logger)
@@ -252,6 +272,42 @@ def _get_order_counts_impl(db_alias: str = "wcmkt") -> dict:
     }
 
 
+def _get_market_aggregates_impl(
+    type_ids: Optional[list[int]] = None, db_alias: str = "wcmkt"
+) -> dict:
+    """Distinct order count and ISK value per side via one SQL GROUP BY.
+
+    ``type_ids=None`` aggregates the whole market; otherwise only orders for
+    those types are counted (bound as a JSON array, see
+    _get_orders_for_type_ids_impl).
+    """
+    totals = {"sell_count": 0, "sell_value": 0.0, "buy_count": 0, "buy_value": 0.0}
+    if type_ids is not None and not type_ids:
+        return totals
+    repo = BaseRepository(DatabaseConfig(db_alias), logger)
+    where = ""
+    params = {}
+    if type_ids is not None:
+        where = "WHERE type_id IN (SELECT value FROM json_each(:type_ids))"
+        params["type_ids"] = json.dumps([int(tid) for tid in type_ids])
+    query = text(
+        f"""
+        SELECT is_buy_order,
+               COUNT(DISTINCT order_id) AS order_count,
+               COALESCE(SUM(price * volume_remain), 0) AS order_value
+        FROM marketorders
+        {where}
+        GROUP BY is_buy_order
+        """
+    )
+    df = repo.read_df(query, params=params)
+    for row in df.itertuples(index=False):
+        side = "buy" if int(row.is_buy_order) == 1 else "sell"
+        totals[f"{side}_count"] = int(row.order_count)
+        totals[f"{side}_value"] = float(row.order_value)
+    return totals
+
+
 def _get_sde_info_impl(type_ids: list) -> pd.DataFrame:
     """Fetch SDE info (name, group, category) for given type_ids."""
     if not type_ids:
@@ -294,6 +350,11 @@ def _get_all_orders_cached(db_alias: str = "wcmkt") -> pd.DataFrame:
     return _get_all_orders_impl(db_alias)
 
 
+@st.cache_data(ttl=1800)
+def _get_orders_for_type_ids_cached(type_ids: tuple, db_alias: str = "wcmkt") -> pd.DataFrame:
+    return _get_orders_for_type_ids_impl(list(type_ids), db_alias)
+
+
 @st.cache_data(ttl=3600, show_spinner="Loading market history...")
 def _get_all_history_cached(db_alias: str = "wcmkt") -> pd.DataFrame:
     return _get_all_history_impl(db_alias)
@@ -354,6 +415,13 @@ def _get_order_counts_cached(db_alias: str = "wcmkt") -> dict:
     return _get_order_counts_impl(db_alias)
 
 
+@st.cache_data(ttl=1800)
+def _get_market_aggregates_cached(type_ids: Optional[tuple], db_alias: str = "wcmkt") -> dict:
+    return _get_market_aggregates_impl(
+        list(type_ids) if type_ids is not None else None, db_alias
+    )
+
+
 @st.cache_resource
 def _get_sde_info_cached(type_ids: tuple) -> pd.DataFrame:
     return _get_sde_info_impl(list(type_ids))
@@ -378,6 +446,7 @@ def invalidate_market_caches():
     """
     _get_all_stats_cached.clear()
     _get_all_orders_cached.clear()
+    _get_orders_for_type_ids_cached.clear()
     _get_all_history_cached.clear()
     _get_history_by_type_cached.clear()
     _get_history_by_type_ids_cached.clear()
@@ -389,6 +458,7 @@ def invalidate_market_caches():
     _get_sell_order_summary_cached.clear()
     _get_stats_for_type_ids_cached.clear()
     _get_order_counts_cached.clear()
+    _get_market_aggregates_cached.clear()
     logger.info("Market caches invalidated")
 
 
@@ -449,6 +519,14 @@ class MarketRepository(BaseRepository):
         """Get all market orders (cached, TTL=1800s)."""
         return _get_all_orders_cached(self.db.alias)
 
+    def get_orders_for_type_ids(self, type_ids: list[int]) -> pd.DataFrame:
+        """Get market orders for specific type_ids (cached, TTL=1800s).
+
+        Filtering happens in SQL, so an item or category view never loads
+        the full marketorders table.
+        """
+        return _get_orders_for_type_ids_cached(tuple(type_ids), self.db.alias)
+
     def get_all_history(self) -> pd.DataFrame:
         """Get all market history (cached, TTL=3600s)."""
         return _get_all_history_cached(self.db.alias)
@@ -525,6 +603,14 @@ class MarketRepository(BaseRepository):
         """Get active sell/buy order counts via SQL aggregation (cached, TTL=1800s)."""
         return _get_order_counts_cached(self.db.alias)
 
+    def get_market_aggregates(self, type_ids: Optional[list[int]] = None) -> dict:
+        """Get sell/buy order counts and ISK values, optionally for type_ids (cached, TTL=1800s).
+
+        Returns a dict with sell_count, sell_value, buy_count and buy_value.
+        """
+        key = tuple(type_ids) if type_ids is not None else None
+        return _get_market_aggregates_cached(key, self.db.alias)
+
     def get_sde_info(self, type_ids: list = None) -> pd.DataFrame:
         """Get SDE info for type_ids. If None, uses market type_ids."""
         if not type_ids:
@@ -14,6 +14,8 @@ Design:
 - Module-level get_type_name() convenience function for models.py import
 """
 
+import csv
+import io
 import logging
 from pathlib import Path
 from typing import Optional
@@ -221,15 +223,38 @@ def _get_sde_table_impl(engine, table_name: str) -> pd.DataFrame:
     Validates table_name against VALID_SDE_TABLES allowlist to prevent
     SQL injection (table names cannot be parameterized in SQL).
     """
+    _validate_sde_table_name(table_name)
+
+    with engine.connect() as conn:
+        df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
+    return df.reset_index(drop=True)
+
+
+def _validate_sde_table_name(table_name: str) -> None:
+    """Raise ValueError unless table_name is in the VALID_SDE_TABLES allowlist."""
     if table_name not in VALID_SDE_TABLES:
         raise ValueError(
             f"Invalid SDE table name: {table_name!r}. "
             f"Valid tables: {sorted(VALID_SDE_TABLES)}"
         )
 
+
+def _export_sde_table_csv_impl(engine, table_name: str, batch_size: int = 10_000) -> bytes:
+    """Export an entire SDE table as UTF-8 CSV bytes.
+
+    Rows are fetched from the cursor in batches and written straight to a
+    csv.writer, so no DataFrame is built for what is a plain table dump.
+    """
+    _validate_sde_table_name(table_name)
+
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
     with engine.connect() as conn:
-        df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-    return df.reset_index(drop=True)
+        result = conn.execute(text(f"SELECT * FROM {table_name}"))
+        writer.writerow(result.keys())
+        while rows := result.fetchmany(batch_size):
+            writer.writerows(rows)
+    return buf.getvalue().encode("utf-8")
 
 
 def _get_tech2_type_ids_impl(engine) -> list[int]:
@@ -455,6 +480,13 @@ class SDERepository(BaseRepository):
         """
         return _get_sde_table_cached(self._cache_key, table_name)
 
+    def export_sde_table_csv(self, table_name: str) -> bytes:
+        """Export a full SDE table as CSV bytes (uncached, no DataFrame).
+
+        Validates table_name against allowlist to prevent SQL injection.
+        """
+        return _export_sde_table_csv_impl(self.db.engine, table_name)
+
     def get_tech2_type_ids(self) -> list[int]:
         """Get all Tech 2 type IDs (cached)."""
         return _get_tech2_type_ids_cached(self._cache_key)
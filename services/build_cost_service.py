@@ -8,7 +8,7 @@ fetching, industry index management. No Streamlit imports.
 import asyncio
 import datetime
 from dataclasses import dataclass
-from typing import Protocol, Optional
+from typing import Mapping, Protocol, Optional
 
 import httpx
 import pandas as pd
@@ -113,7 +113,7 @@ class BuildCostService:
 
         return urls
 
-    def _construct_url(self, job: BuildCostJob, structure, valid_rigs: dict[str, int]) -> str:
+    def _construct_url(self, job: BuildCostJob, structure, valid_rigs: Mapping[str, int]) -> str:
         """Construct a single EverRef API URL for a structure."""
         rigs = [structure.rig_1, structure.rig_2, structure.rig_3]
         clean_rigs = [rig for rig in rigs if rig != "0" and rig is not None]
@@ -14,6 +14,7 @@ Design Principles:
 from dataclasses import dataclass, field
 from typing import Optional
 import logging
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 
@@ -392,7 +393,9 @@ class LowStockService:
         Get low stock items with optional filters applied.
 
         This is the main data fetching method that combines market stats
-        with doctrine information and applies all filters.
+        with doctrine information and applies all filters. It is
+        ``filter_low_stock_items(get_low_stock_base(), ...)``; callers that
+        re-filter often can cache the base frame and filter it themselves.
 
         For items with equivalents, the stock and days_remaining are
         calculated based on combined stock across all equivalent modules.
@@ -403,8 +406,26 @@ class LowStockService:
         Returns:
             DataFrame with low stock items and all relevant columns
         """
-        filters = filters or LowStockFilters()
+        base = self.get_low_stock_base()
+        if base.empty:
+            return base
+        return self.filter_low_stock_items(base, filters, language_code)
+
+    def get_low_stock_base(self) -> pd.DataFrame:
+        """
+        Get every market item with stock metrics, before any filtering.
+
+        Joins market stats with doctrine usage (one row per item/fit pair),
+        replaces avg_volume with the 30-day history average, recomputes
+        days_remaining and applies module equivalents when enabled.
+
+        Raises:
+            RuntimeError: ``history_data_unavailable`` when no 30-day
+                history metrics could be loaded.
 
+        Returns:
+            Unfiltered DataFrame; empty on query failure
+        """
         # Base query joining marketstats with doctrines
         query = """
         SELECT ms.*,
@@ -451,9 +472,6 @@ class LowStockService:
                 / df.loc[nonzero_avg_volume, "avg_volume"]
             )
 
-            if not filters.show_zero_volume_items:
-                df = df[df["avg_volume"] >= 0.05]
-
             from settings_service import SettingsService
 
             use_equivalents_setting = SettingsService().use_equivalents
@@ -463,34 +481,79 @@ class LowStockService:
                 df = self._apply_equivalents_to_stock(df)
             else:
                 self._logger.debug("use_equivalents is disabled")
+
+            return df
+
+        except RuntimeError:
+            raise
+        except Exception as e:
+            self._logger.error(f"Failed to get low stock items: {e}")
+            return pd.DataFrame()
+
+    def filter_low_stock_items(
+        self,
+        base: pd.DataFrame,
+        filters: Optional[LowStockFilters] = None,
+        language_code: str = "en",
+    ) -> pd.DataFrame:
+        """
+        Apply filters to a frame from ``get_low_stock_base``.
+
+        Every filter is a row-wise predicate, so they are combined into one
+        boolean mask and ``base`` is sliced once. ``base`` is not modified.
+        Matching rows are then collapsed to one per item with a ``ships``
+        list and localized type names.
+
+        Equivalents are already applied to ``base``, so the zero-volume filter
+        runs after them. It only reads ``avg_volume``, which equivalents never
+        change, so it keeps the same rows and stock as filtering first would.
+
+        Args:
+            base: Frame returned by get_low_stock_base
+            filters: Optional LowStockFilters configuration
+            language_code: Language for type names
+
+        Returns:
+            DataFrame with low stock items and all relevant columns
+        """
+        filters = filters or LowStockFilters()
+        if base.empty:
+            return base
+
+        try:
+            mask = np.ones(len(base), dtype=bool)
+
+            if not filters.show_zero_volume_items:
+                mask &= base["avg_volume"].to_numpy() >= 0.05
+
             # Apply category filter
             if filters.category_ids:
-                df = df[df["category_id"].isin(filters.category_ids)]
+                mask &= base["category_id"].isin(filters.category_ids).to_numpy()
             elif filters.categories:
-                df = df[df["category_name"].isin(filters.categories)]
+                mask &= base["category_name"].isin(filters.categories).to_numpy()
 
             # Apply doctrine filter
             if filters.doctrine_only:
-                df = df[df["is_doctrine"] == 1]
+                mask &= base["is_doctrine"].to_numpy() == 1
 
             # Apply days remaining filter
             if filters.max_days_remaining is not None:
-                df = df[df["days_remaining"] <= filters.max_days_remaining]
+                mask &= base["days_remaining"].to_numpy() <= filters.max_days_remaining
 
             # Apply fit_ids filter (doctrine/fit filtering)
             if filters.fit_ids:
                 # Get type_ids that are part of the selected fits
                 fit_type_ids = self._get_type_ids_for_fits(filters.fit_ids)
-                df = df[df["type_id"].isin(fit_type_ids)]
+                mask &= base["type_id"].isin(fit_type_ids).to_numpy()
 
             # Apply type_ids filter
             if filters.type_ids:
-                df = df[df["type_id"].isin(filters.type_ids)]
+                mask &= base["type_id"].isin(filters.type_ids).to_numpy()
 
             # Apply Tech II filter
             if filters.tech2_only:
                 tech2_ids = self.get_type_ids_by_metagroup(2)
-                df = df[df["type_id"].isin(tech2_ids)]
+                mask &= base["type_id"].isin(tech2_ids).to_numpy()
 
             # Apply Faction filter (metagroupID=4 for faction items)
             if filters.faction_only:
@@ -498,7 +561,9 @@ class LowStockService:
                 # The task mentioned metagroupID=7 but that doesn't exist in standard SDE
                 # If the database uses a different scheme, adjust accordingly
                 faction_ids = self.get_type_ids_by_metagroup(4)
-                df = df[df["type_id"].isin(faction_ids)]
+                mask &= base["type_id"].isin(faction_ids).to_numpy()
+
+            df = base[mask]
 
             # Aggregate ship/fit usage for each item
             if not df.empty:
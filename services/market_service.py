@@ -80,28 +80,27 @@ class MarketService:
         Returns:
             (sell_df, buy_df, stats_df) tuple of DataFrames.
         """
-        df = self._repo.get_all_orders()
-        if df.empty:
-            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-        # Apply filters
-        if selected_item_id:
-            orders_df = df[df["type_id"] == selected_item_id]
-        elif category_info and "type_ids" in category_info:
-            orders_df = df[df["type_id"].isin(category_info["type_ids"])]
+        # Item and category filters are pushed into SQL by the repository.
+        type_ids = self._order_filter_type_ids(category_info, selected_item_id)
+        if type_ids is None:
+            orders_df = self._repo.get_all_orders()
         else:
-            orders_df = df
+            orders_df = self._repo.get_orders_for_type_ids(type_ids)
+        if orders_df.empty:
+            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
         # Get stats filtered to matching type_ids
         stats_df = self._repo.get_all_stats()
         if not stats_df.empty and not orders_df.empty:
+            order_type_ids = pd.unique(orders_df["type_id"].to_numpy())
             stats_df = stats_df[
-                stats_df["type_id"].isin(orders_df["type_id"].unique())
+                np.isin(stats_df["type_id"].to_numpy(), order_type_ids)
             ].reset_index(drop=True)
 
         # Split into sell/buy
-        sell_df = orders_df[orders_df["is_buy_order"] == 0].reset_index(drop=True)
-        buy_df = orders_df[orders_df["is_buy_order"] == 1].reset_index(drop=True)
+        side = orders_df["is_buy_order"].to_numpy()
+        sell_df = orders_df[side == 0].reset_index(drop=True)
+        buy_df = orders_df[side == 1].reset_index(drop=True)
 
         # Clean order data
         if not sell_df.empty:
@@ -111,6 +110,30 @@ class MarketService:
 
         return sell_df, buy_df, stats_df
 
+    def get_order_aggregates(
+        self,
+        category_info: Optional[dict] = None,
+        selected_item_id: Optional[int] = None,
+    ) -> dict:
+        """Sell/buy order counts and ISK values for the same filter as get_market_data.
+
+        Returns:
+            Dict with sell_count, sell_value, buy_count and buy_value.
+        """
+        type_ids = self._order_filter_type_ids(category_info, selected_item_id)
+        return self._repo.get_market_aggregates(type_ids)
+
+    @staticmethod
+    def _order_filter_type_ids(
+        category_info: Optional[dict], selected_item_id: Optional[int]
+    ) -> Optional[list[int]]:
+        """type_ids the order views are limited to, or None for the whole market."""
+        if selected_item_id:
+            return [selected_item_id]
+        if category_info and "type_ids" in category_info:
+            return list(category_info["type_ids"])
+        return None
+
     def get_current_market_snapshot(self, type_ids: list[int]) -> pd.DataFrame:
         """Get current local sell price and sell-order volume for specific type IDs."""
         if not type_ids:
@@ -587,20 +610,28 @@ class MarketService:
         table["ISK Volume"] = table["ISK Volume"].apply(lambda x: f"{x:,.0f}")
         return table.sort_values("Date", ascending=False)
 
-    def create_history_chart(self, type_id: int) -> Optional[go.Figure]:
+    def get_history_by_type(self, type_id: int) -> pd.DataFrame:
+        """Market history rows for one item (cached in the repository)."""
+        return self._repo.get_history_by_type(type_id)
+
+    def create_history_chart(
+        self, type_id: int, history: Optional[pd.DataFrame] = None
+    ) -> Optional[go.Figure]:
         """Create price+volume history chart for a specific item.
 
         Args:
             type_id: EVE type ID
+            history: History rows already fetched for ``type_id``; loaded
+                from the repository when omitted. Not modified.
 
         Returns:
             Plotly Figure with price and volume subplots, or None if no data.
         """
-        df = self._repo.get_history_by_type(type_id)
+        df = self.get_history_by_type(type_id) if history is None else history
         if df.empty:
             return None
 
-        df["ma_14"] = df["average"].rolling(window=14).mean()
+        ma_14 = df["average"].rolling(window=14).mean()
 
         fig = make_subplots(
             rows=2, cols=1,
@@ -620,7 +651,7 @@ class MarketService:
 
         fig.add_trace(
             go.Scatter(
-                x=df["date"], y=df["ma_14"],
+                x=df["date"], y=ma_14,
                 name="14-Day MA",
                 line=dict(color="#b87fe3", width=2, dash="dot"),
             ),
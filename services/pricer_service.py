@@ -15,7 +15,7 @@ Data Flow:
 from typing import Optional
 import logging
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 from config import DatabaseConfig
 from domain.pricer import (
@@ -39,6 +39,18 @@ from services.price_service import JitaPriceService, get_price_service, PriceRes
 
 logger = setup_logging(__name__, log_file="pricer_service.log")
 
+# Expanding IN lists compile to one cached statement whatever the list length.
+_Q_MARKET_STATS = text("""
+    SELECT type_id, avg_volume, days_remaining, total_volume_remain
+    FROM marketstats
+    WHERE type_id IN :type_ids
+""").bindparams(bindparam("type_ids", expanding=True))
+_Q_DOCTRINE_INFO = text("""
+    SELECT DISTINCT type_id, ship_name, fits_on_mkt
+    FROM doctrines
+    WHERE type_id IN :type_ids
+""").bindparams(bindparam("type_ids", expanding=True))
+
 
 # =============================================================================
 # SDE Lookup Service
@@ -229,17 +241,11 @@ class PricerService:
         if not type_ids:
             return {}
 
-        placeholders = ','.join([':id' + str(i) for i in range(len(type_ids))])
-        query = f"""
-            SELECT type_id, avg_volume, days_remaining, total_volume_remain
-            FROM marketstats
-            WHERE type_id IN ({placeholders})
-        """
-        params = {f'id{i}': tid for i, tid in enumerate(type_ids)}
-
         try:
             with self._mkt_db.engine.connect() as conn:
-                df = pd.read_sql_query(text(query), conn, params=params)
+                df = pd.read_sql_query(
+                    _Q_MARKET_STATS, conn, params={"type_ids": list(type_ids)}
+                )
 
             result = {}
             for _, row in df.iterrows():
@@ -271,17 +277,11 @@ class PricerService:
         if not type_ids:
             return {}
 
-        placeholders = ','.join([':id' + str(i) for i in range(len(type_ids))])
-        query = f"""
-            SELECT DISTINCT type_id, ship_name, fits_on_mkt
-            FROM doctrines
-            WHERE type_id IN ({placeholders})
-        """
-        params = {f'id{i}': tid for i, tid in enumerate(type_ids)}
-
         try:
             with self._mkt_db.engine.connect() as conn:
-                df = pd.read_sql_query(text(query), conn, params=params)
+                df = pd.read_sql_query(
+                    _Q_DOCTRINE_INFO, conn, params={"type_ids": list(type_ids)}
+                )
 
             # Group ships by type_id
             result = {}
@@ -323,15 +323,28 @@ class PricerService:
             )
 
         # Step 1: Parse input
-        raw_items, input_format, ship_name, fit_name, parse_errors = parse_input(text)
+        return self.price_parsed(*parse_input(text))
+
+    def price_parsed(
+        self,
+        raw_items: list[RawParsedItem],
+        input_format: InputFormat,
+        ship_name: Optional[str],
+        fit_name: Optional[str],
+        parse_errors: list[str],
+    ) -> PricerResult:
+        """
+        Price input that has already been through parse_input().
+
+        Args:
+            raw_items, input_format, ship_name, fit_name, parse_errors:
+                The tuple returned by parse_input()
 
+        Returns:
+            PricerResult with priced items and metadata
+        """
         if not raw_items:
-            return PricerResult(
-                parse_errors=parse_errors or ["No items found in input"],
-                input_type=input_format,
-                ship_name=ship_name,
-                fit_name=fit_name,
-            )
+            return unpriced_result(input_format, ship_name, fit_name, parse_errors)
 
         # Step 2: Resolve items in SDE
         parsed_items = self._resolve_items(raw_items)
@@ -452,6 +465,21 @@ class PricerService:
 # Fit Availability - pure helper (no Streamlit, no DB)
 # =============================================================================
 
+def unpriced_result(
+    input_format: InputFormat,
+    ship_name: Optional[str],
+    fit_name: Optional[str],
+    parse_errors: list[str],
+) -> PricerResult:
+    """Result for parsed input with no item lines; keeps the parse errors."""
+    return PricerResult(
+        parse_errors=parse_errors or ["No items found in input"],
+        input_type=input_format,
+        ship_name=ship_name,
+        fit_name=fit_name,
+    )
+
+
 def _empty_fit_availability(result: PricerResult) -> FitAvailabilitySummary:
     return FitAvailabilitySummary(
         fits_available=0,
@@ -547,17 +575,11 @@ def compute_fit_availability(
             continue
         total_isk_per_fit += i.quantity_per_fit * i.isk_per_unit
 
-    ship_type_id: Optional[int] = None
-    for priced in result.items:
-        if priced.item.category_name == "Ship":
-            ship_type_id = priced.type_id
-            break
-
     return FitAvailabilitySummary(
         fits_available=fits_available,
         items=tuple(items),
         total_isk_per_fit=total_isk_per_fit,
-        ship_type_id=ship_type_id,
+        ship_type_id=result.hull_type_id,
         ship_name=result.ship_name,
         unpriced_item_count=unpriced_item_count,
     )
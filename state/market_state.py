@@ -103,6 +103,7 @@ def refresh_market_caches() -> None:
       - market_repo @st.cache_data entries
       - doctrine_repo @st.cache_data entries
       - module_equivalents @st.cache_data entries
+      - downloads / low_stock page @st.cache_data entries
       - DoctrineService._cached_result on the active session-state singleton
         (if one exists — we deliberately do not instantiate it here)
 
@@ -119,22 +120,9 @@ def refresh_market_caches() -> None:
     except ImportError:
         pass
 
-    # Clear doctrine cached functions
     try:
-        from repositories.doctrine_repo import (
-            get_all_fits_with_cache,
-            get_fit_by_id_with_cache,
-            get_all_targets_with_cache,
-            get_target_by_fit_id_with_cache,
-            get_target_by_ship_id_with_cache,
-            get_fit_name_with_cache,
-        )
-        get_all_fits_with_cache.clear()
-        get_fit_by_id_with_cache.clear()
-        get_all_targets_with_cache.clear()
-        get_target_by_fit_id_with_cache.clear()
-        get_target_by_ship_id_with_cache.clear()
-        get_fit_name_with_cache.clear()
+        from repositories.doctrine_repo import invalidate_doctrine_caches
+        invalidate_doctrine_caches()
     except ImportError:
         pass
 
@@ -158,6 +146,12 @@ def refresh_market_caches() -> None:
     except ImportError as e:
         logger.debug(f"Skipping download cache clear: {e}")
 
+    try:
+        from pages.low_stock import clear_low_stock_caches
+        clear_low_stock_caches()
+    except ImportError as e:
+        logger.debug(f"Skipping low stock cache clear: {e}")
+
     # Clear DoctrineService's in-memory _cached_result on the cached singleton
     # for the active market, without creating one if none exists.
     service_key = f"doctrine_service_{get_active_market_key()}"
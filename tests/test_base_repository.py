@@ -7,6 +7,7 @@ Tests the foundation repository class with:
 - Remote fallback when sync fails
 - Direct remote reads
 - Non-malformed errors are re-raised
+- Single-value reads via read_scalar()
 """
 import pytest
 import pandas as pd
@@ -193,6 +194,17 @@ class TestBaseRepository:
             # sync should NOT have been called
             mock_db.sync.assert_not_called()
 
+    def test_read_df_pandas_error_does_not_sync(self):
+        """Errors from the pandas layer are re-raised without a sync."""
+        mock_engine, _ = self._mock_engine_with_data(pd.DataFrame())
+        repo, mock_db = self._make_repo(engine=mock_engine)
+
+        with patch('pandas.read_sql_query', side_effect=TypeError("Cannot cast object dtype to int64")):
+            with pytest.raises(TypeError):
+                repo.read_df("SELECT * FROM test")
+
+            mock_db.sync.assert_not_called()
+
     def test_read_df_no_fallback_when_disabled(self):
         """Test that fallback is skipped when fallback_remote_on_malformed=False."""
         mock_engine, _ = self._mock_engine_with_data(pd.DataFrame())
@@ -219,6 +231,30 @@ class TestBaseRepository:
             call_kwargs = mock_read.call_args
             assert call_kwargs[1]['params'] == {"id": 42}
 
+    def test_read_scalar_returns_first_value(self):
+        """read_scalar returns the first column of the first row, or None."""
+        mock_engine, mock_conn = self._mock_engine_with_data(pd.DataFrame())
+        mock_conn.execute.return_value.scalar.return_value = 7
+        repo, _ = self._make_repo(engine=mock_engine)
+
+        assert repo.read_scalar("SELECT n FROM test WHERE id = :id", {"id": 1}) == 7
+        assert mock_conn.execute.call_args[0][1] == {"id": 1}
+
+        mock_conn.execute.return_value.scalar.return_value = None
+        assert repo.read_scalar("SELECT n FROM test") is None
+
+    def test_read_scalar_malformed_falls_back_to_remote(self):
+        """read_scalar shares read_df's sync + remote fallback."""
+        local_engine, local_conn = self._mock_engine_with_data(pd.DataFrame())
+        local_conn.execute.side_effect = Exception("database disk image is malformed")
+        remote_engine, remote_conn = self._mock_engine_with_data(pd.DataFrame())
+        remote_conn.execute.return_value.scalar.return_value = "remote"
+        repo, mock_db = self._make_repo(engine=local_engine, remote_engine=remote_engine)
+        mock_db.sync.side_effect = Exception("sync failed")
+
+        assert repo.read_scalar("SELECT n FROM test") == "remote"
+        mock_db.sync.assert_called_once()
+
     def test_db_attribute_accessible(self):
         """Test that the db attribute is publicly accessible."""
         mock_db = Mock()
@@ -3,6 +3,10 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
 from repositories.build_cost_repo import (
     INVALID_RIG_IDS,
     SUPER_SHIPYARD_ID,
@@ -11,6 +15,10 @@ from repositories.build_cost_repo import (
     _get_valid_rigs_impl,
     _get_manufacturing_cost_index_impl,
     _get_all_structures_impl,
+    _get_structure_rigs_cached,
+    _get_structure_rigs_impl,
+    _get_valid_rigs_cached,
+    _write_industry_index_impl,
 )
 
 
@@ -40,6 +48,66 @@ class TestGetValidRigsImpl(unittest.TestCase):
         self.assertNotIn("Invalid Rig", result)
 
 
+class TestGetStructureRigsImpl(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE rigs (type_name TEXT, type_id INTEGER)"))
+            conn.execute(text(
+                "CREATE TABLE structures (structure TEXT, structure_type_id INTEGER, "
+                "rig_1 TEXT, rig_2 TEXT, rig_3 TEXT)"
+            ))
+            conn.execute(
+                text("INSERT INTO rigs VALUES (:n, :i)"),
+                [
+                    {"n": "Rig A", "i": 100},
+                    {"n": "Rig B", "i": 200},
+                    {"n": "Bad Rig", "i": INVALID_RIG_IDS[0]},
+                ],
+            )
+            conn.execute(
+                text("INSERT INTO structures VALUES (:s, :t, :r1, :r2, :r3)"),
+                [
+                    {"s": "Alpha", "t": VALID_STRUCTURE_TYPE_IDS[0],
+                     "r1": "Rig B", "r2": "Bad Rig", "r3": "Rig A"},
+                    {"s": "Bare", "t": VALID_STRUCTURE_TYPE_IDS[1],
+                     "r1": "0", "r2": None, "r3": None},
+                    {"s": "Other", "t": 1, "r1": "Rig A", "r2": None, "r3": None},
+                ],
+            )
+
+    def test_filters_invalid_rigs_in_slot_order(self):
+        result = _get_structure_rigs_impl(self.engine)
+        self.assertEqual(result["Alpha"], ["Rig B", "Rig A"])
+
+    def test_keeps_structures_without_valid_rigs(self):
+        result = _get_structure_rigs_impl(self.engine)
+        self.assertEqual(result["Bare"], [])
+        self.assertNotIn("Other", result)
+
+
+class TestRigCachedWrappers(unittest.TestCase):
+    """Cached rig lookups are shared objects, so they must be read-only."""
+
+    @patch("repositories.build_cost_repo.DatabaseConfig")
+    def test_valid_rigs_are_read_only(self, _mock_db):
+        with patch("repositories.build_cost_repo._get_valid_rigs_impl", return_value={"Rig A": 1}):
+            result = _get_valid_rigs_cached.__wrapped__("url")
+        self.assertEqual(result["Rig A"], 1)
+        with self.assertRaises(TypeError):
+            result["Rig B"] = 2
+
+    @patch("repositories.build_cost_repo.DatabaseConfig")
+    def test_structure_rigs_are_read_only(self, _mock_db):
+        with patch("repositories.build_cost_repo._get_structure_rigs_impl", return_value={"Alpha": ["Rig A"]}):
+            result = _get_structure_rigs_cached.__wrapped__("url")
+        self.assertEqual(result["Alpha"], ["Rig A"])
+        with self.assertRaises(TypeError):
+            result["Beta"] = []
+
+
 class TestGetManufacturingCostIndexImpl(unittest.TestCase):
     def test_returns_float(self):
         mock_engine = MagicMock()
@@ -64,9 +132,9 @@ class TestGetAllStructuresImpl(unittest.TestCase):
         mock_conn.execute.return_value.fetchall.return_value = [("Super Structure",)]
 
         result = _get_all_structures_impl(mock_engine, is_super=True)
-        call_args = mock_conn.execute.call_args
-        sql = str(call_args[0][0])
-        self.assertIn(str(SUPER_SHIPYARD_ID), sql)
+        stmt, params = mock_conn.execute.call_args[0]
+        self.assertIn("structure_id = :shipyard_id", str(stmt))
+        self.assertEqual(params["shipyard_id"], SUPER_SHIPYARD_ID)
         self.assertEqual(len(result), 1)
 
     def test_non_super_excludes_shipyard(self):
@@ -78,11 +146,67 @@ class TestGetAllStructuresImpl(unittest.TestCase):
         ]
 
         result = _get_all_structures_impl(mock_engine, is_super=False)
-        call_args = mock_conn.execute.call_args
-        sql = str(call_args[0][0])
-        self.assertIn(f"structure_id != {SUPER_SHIPYARD_ID}", sql)
+        stmt, params = mock_conn.execute.call_args[0]
+        self.assertIn("structure_id != :shipyard_id", str(stmt))
+        self.assertEqual(params["shipyard_id"], SUPER_SHIPYARD_ID)
+        self.assertEqual(params["structure_type_ids"], VALID_STRUCTURE_TYPE_IDS)
         self.assertEqual(len(result), 2)
 
 
+class TestWriteIndustryIndexImpl(unittest.TestCase):
+    def test_replaces_table_with_all_rows(self):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        df = pd.DataFrame({
+            "solar_system_id": range(1000),
+            "manufacturing": [i / 1000 for i in range(1000)],
+        })
+
+        _write_industry_index_impl(engine, df.head(3))
+        _write_industry_index_impl(engine, df)
+
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT COUNT(*) FROM industry_index")).scalar()
+        self.assertEqual(count, 1000)
+
+    def test_reuses_existing_table_on_sqlite(self):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE industry_index (solar_system_id INTEGER PRIMARY KEY, "
+                "manufacturing REAL)"
+            ))
+            conn.execute(text("INSERT INTO industry_index VALUES (1, 0.5)"))
+        df = pd.DataFrame({"manufacturing": [0.01, 0.02], "solar_system_id": [7, 8]})
+
+        _write_industry_index_impl(engine, df)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT solar_system_id, manufacturing FROM industry_index ORDER BY 1"
+            )).fetchall()
+            ddl = conn.execute(text(
+                "SELECT sql FROM sqlite_master WHERE name = 'industry_index'"
+            )).scalar()
+        self.assertEqual([tuple(r) for r in rows], [(7, 0.01), (8, 0.02)])
+        self.assertIn("PRIMARY KEY", ddl)
+
+    def test_non_pysqlite_driver_uses_to_sql(self):
+        engine = MagicMock()
+        engine.dialect.name = "sqlite"
+        engine.dialect.driver = "libsql"
+        df = pd.DataFrame({"solar_system_id": [7], "manufacturing": [0.01]})
+
+        with patch("repositories.build_cost_repo._replace_rows_sqlite") as mock_replace, \
+             patch.object(pd.DataFrame, "to_sql") as mock_to_sql:
+            _write_industry_index_impl(engine, df)
+
+        mock_replace.assert_not_called()
+        mock_to_sql.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+"""Tests for the shared database freshness check in pages.components.db_refresh."""
+
+from unittest.mock import patch
+
+import pytest
+
+import pages.components.db_refresh as db_refresh
+
+
+@pytest.fixture(autouse=True)
+def _fresh_verdicts():
+    db_refresh.clear_db_update_checks()
+    db_refresh._db_config.clear()
+    yield
+    db_refresh.clear_db_update_checks()
+    db_refresh._db_config.clear()
+
+
+class TestCheckForDbUpdates:
+    """Verdicts are shared per alias and expire after DB_UPDATE_CHECK_TTL."""
+
+    @patch("pages.components.db_refresh.DatabaseConfig")
+    def test_reuses_verdict_within_ttl(self, mock_db_cls):
+        mock_db_cls.return_value.has_remote_credentials = True
+        mock_db_cls.return_value.local_matches_remote.return_value = True
+
+        first = db_refresh.check_for_db_updates("wcmktprod")
+        second = db_refresh.check_for_db_updates("wcmktprod")
+
+        assert first == second
+        mock_db_cls.return_value.local_matches_remote.assert_called_once()
+
+    @patch("pages.components.db_refresh.time.time")
+    @patch("pages.components.db_refresh.DatabaseConfig")
+    def test_rechecks_after_ttl(self, mock_db_cls, mock_time):
+        mock_db_cls.return_value.has_remote_credentials = True
+        mock_db_cls.return_value.local_matches_remote.side_effect = [True, False]
+        mock_time.return_value = 1_000.0
+
+        assert db_refresh.check_for_db_updates("wcmktprod")[0] is True
+        mock_time.return_value += db_refresh.DB_UPDATE_CHECK_TTL + 1
+        assert db_refresh.check_for_db_updates("wcmktprod")[0] is False
+
+    @patch("pages.components.db_refresh.DatabaseConfig")
+    def test_clear_forces_a_new_check(self, mock_db_cls):
+        mock_db_cls.return_value.has_remote_credentials = True
+        mock_db_cls.return_value.local_matches_remote.return_value = True
+
+        db_refresh.check_for_db_updates("wcmktprod")
+        db_refresh.clear_db_update_checks()
+        db_refresh.check_for_db_updates("wcmktprod")
+
+        assert mock_db_cls.return_value.local_matches_remote.call_count == 2
+
+    @patch("pages.components.db_refresh.DatabaseConfig")
+    def test_local_only_mode_skips_remote(self, mock_db_cls):
+        mock_db_cls.return_value.has_remote_credentials = False
+
+        check, _ = db_refresh.check_for_db_updates("wcmktnorth")
+
+        assert check is True
+        mock_db_cls.return_value.local_matches_remote.assert_not_called()
+
+
+class TestDbConfig:
+    """check_db and the freshness check share one DatabaseConfig per alias."""
+
+    @patch("pages.components.db_refresh.DatabaseConfig")
+    def test_reuses_config_per_alias(self, mock_db_cls):
+        mock_db_cls.return_value.has_remote_credentials = True
+        mock_db_cls.return_value.local_matches_remote.return_value = True
+
+        db_refresh.check_for_db_updates("wcmktprod")
+        db_refresh.clear_db_update_checks()
+        db_refresh.check_for_db_updates("wcmktprod")
+
+        mock_db_cls.assert_called_once_with("wcmktprod")
@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
 from domain import ModuleStock, ShipStock
 from repositories.doctrine_repo import DOCTRINE_FITS_COLUMNS
 
@@ -20,6 +22,21 @@ def _make_repo(engine=None):
     return db, DoctrineRepository(db)
 
 
+def _sqlite_engine(ddl, rows):
+    """In-memory SQLite engine with tables created from ``ddl`` and seeded with
+    ``rows`` ({table: [tuple, ...]}). StaticPool keeps one shared connection."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        for statement in ddl:
+            conn.exec_driver_sql(statement)
+        for table, table_rows in rows.items():
+            placeholders = ", ".join("?" * len(table_rows[0]))
+            conn.exec_driver_sql(f"INSERT INTO {table} VALUES ({placeholders})", table_rows)
+    return engine
+
+
 def _stock_df(type_id=2048, type_name="Damage Control II", total_stock=500, fits_on_mkt=25):
     return pd.DataFrame([{
         "type_name": type_name,
@@ -124,15 +141,69 @@ class TestGetModuleFitInfo:
 
 
 class TestGetAllDoctrineCompositions:
+    @staticmethod
+    def _call(reader, market_key="primary"):
+        from repositories.doctrine_repo import get_doctrine_compositions_with_cache
+
+        with patch("repositories.doctrine_repo.BaseRepository", return_value=reader), \
+             patch("repositories.doctrine_repo.DatabaseConfig"):
+            # __wrapped__ bypasses the st.cache_data decorator (see TestLoadPreferredFits).
+            return get_doctrine_compositions_with_cache.__wrapped__("test", market_key)
+
     def test_returns_schema_on_database_exception(self):
-        db, repo = _make_repo()
-        db.engine.connect.side_effect = Exception("db down")
+        reader = MagicMock()
+        reader.read_df.side_effect = Exception("db down")
 
-        result = repo.get_all_doctrine_compositions()
+        result = self._call(reader)
 
         assert result.empty
         assert list(result.columns) == DOCTRINE_FITS_COLUMNS
 
+    def test_filters_by_market_flag(self):
+        reader = MagicMock()
+        reader.read_df.return_value = pd.DataFrame([
+            {"fit_id": 1, "market_flag": "primary"},
+            {"fit_id": 2, "market_flag": "both"},
+            {"fit_id": 3, "market_flag": "secondary"},
+        ])
+
+        result = self._call(reader, market_key="primary")
+
+        assert list(result["fit_id"]) == [1, 2]
+
+    def test_repository_delegates_with_active_market_key(self):
+        db, repo = _make_repo()
+
+        with patch("state.market_state.get_active_market_key", return_value="secondary"), \
+             patch("repositories.doctrine_repo.get_doctrine_compositions_with_cache") as mock_cached:
+            result = repo.get_all_doctrine_compositions()
+
+        mock_cached.assert_called_once_with("test", "secondary")
+        assert result is mock_cached.return_value
+
+
+class TestInvalidateDoctrineCaches:
+    def test_clears_every_cached_reader(self):
+        import repositories.doctrine_repo as doctrine_repo
+
+        names = [
+            "get_all_fits_with_cache",
+            "get_doctrine_compositions_with_cache",
+            "get_fit_by_id_with_cache",
+            "get_all_targets_with_cache",
+            "get_target_quantities_with_cache",
+            "get_target_by_fit_id_with_cache",
+            "get_target_by_ship_id_with_cache",
+            "get_friendly_names_with_cache",
+            "get_fit_name_with_cache",
+        ]
+        mocks = {name: MagicMock() for name in names}
+        with patch.multiple(doctrine_repo, **mocks):
+            doctrine_repo.invalidate_doctrine_caches()
+
+        for m in mocks.values():
+            m.clear.assert_called_once()
+
 
 class TestDoctrineDisplayName:
     def test_display_name_uses_active_market_alias_when_alias_omitted(self):
@@ -209,20 +280,206 @@ class TestGetModuleStock:
 # ---------------------------------------------------------------------------
 
 class TestGetMultipleModuleStocks:
-    def test_returns_dict_keyed_by_type_id(self):
-        db, repo = _make_repo()
-        stock_a = ModuleStock(type_id=100, type_name="Item A", total_stock=10, fits_on_mkt=5)
-        stock_b = ModuleStock(type_id=200, type_name="Item B", total_stock=20, fits_on_mkt=10)
+    @staticmethod
+    def _engine():
+        return _sqlite_engine(
+            [
+                "CREATE TABLE doctrines (fit_id INTEGER, type_id INTEGER, type_name TEXT, "
+                "total_stock INTEGER, fits_on_mkt INTEGER, fit_qty INTEGER)",
+                "CREATE TABLE ship_targets (fit_id INTEGER, ship_name TEXT, ship_target INTEGER)",
+            ],
+            {
+                "doctrines": [
+                    (1, 100, "Item A", 10, 5, 1),
+                    (2, 100, "Item A", 10, 5, 2),
+                    (1, 200, "Item B", 20, 10, 3),
+                ],
+                "ship_targets": [(1, "Ferox", 30), (2, "Drake", 20)],
+            },
+        )
 
-        def mock_get(tid):
-            return {100: stock_a, 200: stock_b}.get(tid)
+    def test_returns_dict_keyed_by_type_id(self):
+        db, repo = _make_repo(engine=self._engine())
 
-        with patch.object(repo, "get_module_stock", side_effect=mock_get):
-            result = repo.get_multiple_module_stocks([100, 200, 999])
+        result = repo.get_multiple_module_stocks([100, 200, 999])
 
         assert set(result.keys()) == {100, 200}
         assert result[100].type_name == "Item A"
         assert result[200].type_name == "Item B"
+        assert {u.ship_name for u in result[100].usage} == {"Ferox", "Drake"}
+        assert [u.fit_qty for u in result[200].usage] == [3]
+
+    def test_matches_single_module_lookup(self):
+        db, repo = _make_repo(engine=self._engine())
+
+        assert repo.get_multiple_module_stocks([100])[100] == repo.get_module_stock(100)
+
+    def test_returns_empty_on_exception(self):
+        db, repo = _make_repo()
+        db.engine.connect.side_effect = Exception("db down")
+
+        assert repo.get_multiple_module_stocks([100]) == {}
+
+
+# ---------------------------------------------------------------------------
+# get_avg_prices
+# ---------------------------------------------------------------------------
+
+class TestGetAvgPrices:
+    @staticmethod
+    def _engine():
+        return _sqlite_engine(
+            ["CREATE TABLE marketstats (type_id INTEGER, avg_price REAL)"],
+            {"marketstats": [(34, 5.5), (35, None), (36, 7)]},
+        )
+
+    def test_returns_prices_for_requested_ids(self):
+        db, repo = _make_repo(engine=self._engine())
+
+        result = repo.get_avg_prices([34, 36, 999])
+
+        assert result == {34: 5.5, 36: 7.0}
+        assert all(type(v) is float for v in result.values())
+
+    def test_null_price_is_nan(self):
+        import math
+
+        db, repo = _make_repo(engine=self._engine())
+
+        assert math.isnan(repo.get_avg_prices([35])[35])
+
+    def test_empty_input_skips_query(self):
+        db, repo = _make_repo()
+
+        assert repo.get_avg_prices([]) == {}
+        db.engine.connect.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# get_fit_items
+# ---------------------------------------------------------------------------
+
+class TestGetFitItems:
+    def test_matches_row_factory(self):
+        from domain.models import FitItem
+
+        db, repo = _make_repo()
+        df = pd.DataFrame([
+            {"fit_id": 1, "type_id": 100, "type_name": "Ferox", "fit_qty": 1,
+             "total_stock": 5, "price": 1.5e7, "ship_id": 100, "hulls": 5},
+            {"fit_id": 1, "type_id": 200, "type_name": None, "fit_qty": float("nan"),
+             "total_stock": float("nan"), "price": None, "ship_id": 100, "hulls": 5},
+        ])
+
+        with patch.object(repo, "get_fit_by_id", return_value=df):
+            result = repo.get_fit_items(1)
+
+        assert result == [FitItem.from_dataframe_row(row) for _, row in df.iterrows()]
+        assert result[1].fit_qty == 1
+        assert result[1].type_name == ""
+        assert result[0].group_name == ""
+
+    def test_empty_fit_returns_empty_list(self):
+        db, repo = _make_repo()
+
+        with patch.object(repo, "get_fit_by_id", return_value=pd.DataFrame()):
+            assert repo.get_fit_items(1) == []
+
+
+# ---------------------------------------------------------------------------
+# get_doctrine
+# ---------------------------------------------------------------------------
+
+class TestGetDoctrine:
+    @staticmethod
+    def _engine():
+        return _sqlite_engine(
+            [
+                "CREATE TABLE doctrine_fits (doctrine_id INTEGER, doctrine_name TEXT, "
+                "fit_id INTEGER, market_flag TEXT)",
+                "CREATE TABLE lead_ships (doctrine_id INTEGER, lead_ship INTEGER)",
+            ],
+            {
+                "doctrine_fits": [
+                    (7, "Ferox Fleet", 11, "primary"),
+                    (7, "Ferox Fleet", 12, "both"),
+                    (7, "Ferox Fleet", 13, "secondary"),
+                    (8, "Drake Fleet", 21, "secondary"),
+                ],
+                "lead_ships": [(7, 37480)],
+            },
+        )
+
+    def test_builds_doctrine_for_active_market(self):
+        db, repo = _make_repo(engine=self._engine())
+
+        with patch("state.market_state.get_active_market_key", return_value="primary"):
+            doctrine = repo.get_doctrine("Ferox Fleet")
+
+        assert doctrine.doctrine_id == 7
+        assert doctrine.doctrine_name == "Ferox Fleet"
+        assert doctrine.fit_ids == (11, 12)
+        assert doctrine.lead_ship_id == 37480
+
+    def test_missing_lead_ship_defaults_to_zero(self):
+        db, repo = _make_repo(engine=self._engine())
+
+        with patch("state.market_state.get_active_market_key", return_value="secondary"):
+            doctrine = repo.get_doctrine("Drake Fleet")
+
+        assert doctrine.fit_ids == (21,)
+        assert doctrine.lead_ship_id == 0
+
+    def test_malformed_local_db_syncs_and_retries(self):
+        db, repo = _make_repo(engine=self._engine())
+        real_read = pd.read_sql_query
+        calls = []
+
+        def flaky_read(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise Exception("database disk image is malformed")
+            return real_read(*args, **kwargs)
+
+        with patch("state.market_state.get_active_market_key", return_value="primary"), \
+             patch("pandas.read_sql_query", side_effect=flaky_read):
+            doctrine = repo.get_doctrine("Ferox Fleet")
+
+        db.sync.assert_called_once()
+        assert doctrine.fit_ids == (11, 12)
+
+    def test_returns_none_for_other_market(self):
+        db, repo = _make_repo(engine=self._engine())
+
+        with patch("state.market_state.get_active_market_key", return_value="primary"):
+            assert repo.get_doctrine("Drake Fleet") is None
+
+
+class TestGetDoctrineFitIds:
+    def test_returns_fit_ids_for_active_market(self):
+        db, repo = _make_repo(engine=TestGetDoctrine._engine())
+
+        with patch("state.market_state.get_active_market_key", return_value="primary"):
+            assert sorted(repo.get_doctrine_fit_ids("Ferox Fleet")) == [11, 12]
+            assert repo.get_doctrine_fit_ids("Drake Fleet") == []
+
+    def test_reads_through_recovering_reader(self):
+        db, repo = _make_repo()
+
+        with patch("state.market_state.get_active_market_key", return_value="primary"), \
+             patch.object(repo._reader, "read_df", return_value=pd.DataFrame({"fit_id": [11]})) as mock_read:
+            assert repo.get_doctrine_fit_ids("Ferox Fleet") == [11]
+
+        assert mock_read.call_args.kwargs["params"] == {
+            "name": "Ferox Fleet", "market_flags": ["primary", "both"],
+        }
+
+    def test_returns_empty_on_exception(self):
+        db, repo = _make_repo()
+        db.engine.connect.side_effect = Exception("db down")
+
+        with patch("state.market_state.get_active_market_key", return_value="primary"):
+            assert repo.get_doctrine_fit_ids("Ferox Fleet") == []
 
 
 # ---------------------------------------------------------------------------
@@ -4,6 +4,10 @@ Tests for pages/downloads.py
 Verifies that download functions respect the active market context
 by passing the correct database alias through to repositories.
 """
+import gzip
+import io
+from pathlib import Path
+
 import pytest
 import pandas as pd
 from unittest.mock import Mock, patch, PropertyMock, MagicMock
@@ -12,10 +16,15 @@ from unittest.mock import Mock, patch, PropertyMock, MagicMock
 class TestMarketDownloadsCsv:
     """Test that market CSV functions use the provided db_alias."""
 
+    @pytest.fixture(autouse=True)
+    def _isolated_export_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("pages.downloads._EXPORT_DIR", tmp_path)
+
     def _mock_db_and_repo(self, df: pd.DataFrame):
         """Create mocked DatabaseConfig and MarketRepository returning df."""
         mock_db = Mock()
         mock_db.alias = "test_alias"
+        mock_db.path = __file__  # any existing file gives the export an mtime key
         mock_repo = Mock()
         mock_repo.get_all_orders.return_value = df
         mock_repo.get_all_stats.return_value = df
@@ -37,8 +46,45 @@ class TestMarketDownloadsCsv:
 
         mock_db_cls.assert_called_once_with("wcmktprod")
         mock_repo_cls.assert_called_once_with(mock_db)
-        assert b"type_id" in result
-        assert b"34" in result
+        content = gzip.decompress(Path(result).read_bytes())
+        assert b"type_id" in content
+        assert b"34" in content
+
+    @patch("pages.downloads.MarketRepository")
+    @patch("pages.downloads.DatabaseConfig")
+    def test_market_csv_file_is_rebuilt_when_missing(self, mock_db_cls, mock_repo_cls):
+        """_read_csv_file regenerates an export whose cached file was deleted."""
+        df = pd.DataFrame({"type_id": [34], "price": [10.0]})
+        mock_db, mock_repo = self._mock_db_and_repo(df)
+        mock_db_cls.return_value = mock_db
+        mock_repo_cls.return_value = mock_repo
+
+        from pages.downloads import _get_market_orders_csv, _read_csv_file
+        _get_market_orders_csv.clear()
+        Path(_get_market_orders_csv("wcmktprod")).unlink()
+
+        content = _read_csv_file(_get_market_orders_csv, "wcmktprod")
+
+        assert gzip.decompress(content) == df.to_csv(index=False).encode("utf-8")
+        assert mock_repo.get_all_orders.call_count == 2
+
+    @patch("pages.downloads.MarketRepository")
+    @patch("pages.downloads.DatabaseConfig")
+    def test_market_csv_reuses_file_for_unchanged_db(self, mock_db_cls, mock_repo_cls):
+        """A cold cache reuses the on-disk export while the DB mtime is unchanged."""
+        df = pd.DataFrame({"type_id": [34], "price": [10.0]})
+        mock_db, mock_repo = self._mock_db_and_repo(df)
+        mock_db_cls.return_value = mock_db
+        mock_repo_cls.return_value = mock_repo
+
+        from pages.downloads import _get_market_history_csv
+        _get_market_history_csv.clear()
+        first = _get_market_history_csv("wcmktprod")
+        _get_market_history_csv.clear()  # simulate a process restart
+        second = _get_market_history_csv("wcmktprod")
+
+        assert first == second
+        mock_repo.get_all_history.assert_called_once()
 
     @patch("pages.downloads.MarketRepository")
     @patch("pages.downloads.DatabaseConfig")
@@ -107,8 +153,9 @@ class TestLowStockCsvMarketContext:
         mock_repo.read_df.return_value = df
         mock_base_repo_cls.return_value = mock_repo
 
-        from pages.downloads import _get_low_stock_csv
+        from pages.downloads import _get_low_stock_csv, _market_reader
         _get_low_stock_csv.clear()
+        _market_reader.clear()
         _get_low_stock_csv("wcmktnorth", 7.0, False, False)
 
         mock_db_cls.assert_called_once_with("wcmktnorth")
@@ -131,12 +178,84 @@ class TestLowStockCsvMarketContext:
         mock_repo.read_df.return_value = df
         mock_base_repo_cls.return_value = mock_repo
 
-        from pages.downloads import _get_low_stock_csv
+        from pages.downloads import _get_low_stock_csv, _market_reader
         _get_low_stock_csv.clear()
+        _market_reader.clear()
         _get_low_stock_csv("wcmktprod", 7.0, False, False)
 
         mock_db_cls.assert_called_once_with("wcmktprod")
 
+    @patch("pages.downloads.BaseRepository")
+    @patch("pages.downloads.DatabaseConfig")
+    def test_low_stock_csv_reuses_market_reader(self, mock_db_cls, mock_base_repo_cls):
+        """Repeated exports for one market share a single repository."""
+        mock_base_repo_cls.return_value.read_df.return_value = pd.DataFrame(
+            {"type_id": [34], "ship_name": [None], "fits_on_mkt": [None]}
+        )
+
+        from pages.downloads import _get_low_stock_csv, _market_reader
+        _get_low_stock_csv.clear()
+        _market_reader.clear()
+        _get_low_stock_csv("wcmktprod", 7.0, False, False)
+        _get_low_stock_csv("wcmktprod", 3.0, False, False)
+
+        mock_db_cls.assert_called_once_with("wcmktprod")
+        assert mock_base_repo_cls.return_value.read_df.call_count == 2
+
+    @patch("pages.downloads.BaseRepository")
+    @patch("pages.downloads.DatabaseConfig")
+    def test_low_stock_csv_collapses_doctrine_rows(self, mock_db_cls, mock_base_repo_cls):
+        """One row per type_id, listing every fit that uses it."""
+        mock_base_repo_cls.return_value.read_df.return_value = pd.DataFrame({
+            "type_id": [34, 34, 35],
+            "days_remaining": [1.0, 1.0, 2.0],
+            "ship_name": ["Osprey", "Scythe", None],
+            "fits_on_mkt": [4.0, 2.0, None],
+        })
+
+        from pages.downloads import _get_low_stock_csv, _market_reader
+        _get_low_stock_csv.clear()
+        _market_reader.clear()
+        result = pd.read_csv(io.BytesIO(_get_low_stock_csv("wcmktprod", 7.0, False, False)))
+
+        assert list(result["type_id"]) == [34, 35]
+        assert result.loc[0, "ships"] == "['Osprey (4)', 'Scythe (2)']"
+        assert pd.isna(result.loc[1, "ships"])
+
+    @patch("pages.downloads.get_sde_repository")
+    @patch("pages.downloads.BaseRepository")
+    @patch("pages.downloads.DatabaseConfig")
+    def test_low_stock_csv_pushes_filters_into_sql(
+        self, mock_db_cls, mock_base_repo_cls, mock_get_sde
+    ):
+        """max_days/doctrine_only/tech2_only are SQL predicates, not pandas filters."""
+        mock_get_sde.return_value.get_tech2_type_ids.return_value = [34, 35]
+        mock_repo = Mock()
+        mock_repo.read_df.return_value = pd.DataFrame({
+            "type_id": [34],
+            "days_remaining": [3.0],
+            "is_doctrine": [1],
+            "ship_name": ["Osprey"],
+            "fits_on_mkt": [4],
+        })
+        mock_base_repo_cls.return_value = mock_repo
+
+        from pages.downloads import _get_low_stock_csv, _market_reader
+        _get_low_stock_csv.clear()
+        _market_reader.clear()
+        _get_low_stock_csv("wcmktprod", 7.0, True, True)
+
+        query, = mock_repo.read_df.call_args.args
+        sql = str(query)
+        assert "ms.days_remaining <= :max_days" in sql
+        assert "d.type_id IS NOT NULL" in sql
+        assert "ms.type_id IN" in sql
+        assert "ORDER BY ms.days_remaining IS NULL, ms.days_remaining" in sql
+        assert mock_repo.read_df.call_args.kwargs["params"] == {
+            "max_days": 7.0,
+            "tech2_type_ids": [34, 35],
+        }
+
 
 class TestDoctrineDownloadsCsv:
     """Test that doctrine CSV functions use the provided db_alias."""
@@ -154,8 +273,9 @@ class TestDoctrineDownloadsCsv:
         })
         mock_svc_cls.create_default.return_value = mock_service
 
-        from pages.downloads import _get_all_doctrine_fits_csv
+        from pages.downloads import _get_all_doctrine_fits_csv, _doctrine_fits_with_targets
         _get_all_doctrine_fits_csv.clear()
+        _doctrine_fits_with_targets.clear()
         result = _get_all_doctrine_fits_csv("wcmktnorth")
 
         mock_svc_cls.create_default.assert_called_once_with("wcmktnorth")
@@ -166,7 +286,7 @@ class TestDoctrineDownloadsCsv:
         """_get_fit_options passes db_alias to DoctrineService.create_default."""
         mock_summary = Mock()
         mock_summary.fit_id = 1
-        mock_summary.ship_name = "Osprey"
+        mock_summary.ship_name = "Osprey Navy Issue"
         mock_summary.fit_name = "Logi"
         mock_service = Mock()
         mock_service.get_all_fit_summaries.return_value = [mock_summary]
@@ -178,22 +298,23 @@ class TestDoctrineDownloadsCsv:
 
         mock_svc_cls.create_default.assert_called_once_with("wcmktnorth")
         assert len(result) == 1
-        assert result[0]["ship_name"] == "Osprey"
+        assert result[0]["ship_name"] == "Osprey Navy Issue"
+        assert result[0]["ship_name_clean"] == "Osprey_Navy_Issue"
 
-    @patch("pages.downloads.DoctrineService")
-    def test_single_fit_csv_uses_provided_alias(self, mock_svc_cls):
-        """_get_single_fit_csv passes db_alias to DoctrineService.create_default."""
-        mock_service = Mock()
-        mock_service.repository.get_fit_by_id.return_value = pd.DataFrame({
+    @patch("pages.downloads.DoctrineRepository")
+    @patch("pages.downloads.DatabaseConfig")
+    def test_single_fit_csv_uses_provided_alias(self, mock_db_cls, mock_repo_cls):
+        """_get_single_fit_csv reads the fit straight from the repository for db_alias."""
+        mock_repo_cls.return_value.get_fit_by_id.return_value = pd.DataFrame({
             "fit_id": [1], "type_id": [34]
         })
-        mock_svc_cls.create_default.return_value = mock_service
 
         from pages.downloads import _get_single_fit_csv
         _get_single_fit_csv.clear()
         result = _get_single_fit_csv("wcmktprod", 1)
 
-        mock_svc_cls.create_default.assert_called_once_with("wcmktprod")
+        mock_db_cls.assert_called_once_with("wcmktprod")
+        mock_repo_cls.return_value.get_fit_by_id.assert_called_once_with(1)
         assert b"fit_id" in result
 
     @patch("pages.downloads.DoctrineService")
@@ -208,13 +329,165 @@ class TestDoctrineDownloadsCsv:
         })
         mock_svc_cls.create_default.return_value = mock_service
 
-        from pages.downloads import _get_filtered_doctrine_csv
+        from pages.downloads import _get_filtered_doctrine_csv, _doctrine_fits_with_targets
         _get_filtered_doctrine_csv.clear()
+        _doctrine_fits_with_targets.clear()
         result = _get_filtered_doctrine_csv("wcmktnorth", (1,))
 
         mock_svc_cls.create_default.assert_called_once_with("wcmktnorth")
         assert b"fit_id" in result
 
+    @patch("pages.downloads.DoctrineService")
+    def test_doctrine_exports_share_one_fit_build(self, mock_svc_cls):
+        """All-fits and per-doctrine exports reuse the cached fits+targets frame."""
+        mock_service = Mock()
+        mock_service.build_fit_data.return_value.raw_df = pd.DataFrame({
+            "fit_id": [1, 2], "type_id": [34, 35], "fit_qty": [1, 2],
+            "fits_on_mkt": [2, 3], "ship_name": ["Osprey", "Scythe"],
+            "type_name": ["Tritanium", "Pyerite"],
+        })
+        mock_service.repository.get_all_targets.return_value = pd.DataFrame({
+            "fit_id": [1, 2], "fit_name": ["Logi", "Logi2"], "ship_target": [10, 20]
+        })
+        mock_svc_cls.create_default.return_value = mock_service
+
+        from pages.downloads import (
+            _doctrine_fits_with_targets,
+            _get_all_doctrine_fits_csv,
+            _get_filtered_doctrine_csv,
+        )
+        _doctrine_fits_with_targets.clear()
+        _get_all_doctrine_fits_csv.clear()
+        _get_filtered_doctrine_csv.clear()
+
+        _get_all_doctrine_fits_csv("wcmktprod")
+        result = _get_filtered_doctrine_csv("wcmktprod", (2,))
+
+        mock_service.build_fit_data.assert_called_once()
+        mock_service.repository.get_all_targets.assert_called_once()
+        rows = pd.read_csv(io.BytesIO(result))
+        assert list(rows["fit_id"]) == [2]
+        assert list(rows["ship_target"]) == [20]
+
+    @patch("pages.downloads.DoctrineService")
+    def test_missing_targets_only_empty_the_aggregate_exports(self, mock_svc_cls):
+        """Per-doctrine export keeps fit rows when ship_targets is empty."""
+        mock_service = Mock()
+        mock_service.build_fit_data.return_value.raw_df = pd.DataFrame({
+            "fit_id": [1, 2], "type_id": [34, 35], "fit_qty": [1, 2],
+            "fits_on_mkt": [2, 3], "ship_name": ["Osprey", "Scythe"],
+            "type_name": ["Tritanium", "Pyerite"],
+        })
+        mock_service.repository.get_all_targets.return_value = pd.DataFrame()
+        mock_svc_cls.create_default.return_value = mock_service
+
+        from pages.downloads import (
+            _doctrine_fits_with_targets,
+            _get_all_doctrine_fits_csv,
+            _get_filtered_doctrine_csv,
+            _get_low_stock_doctrine_fits_csv,
+        )
+        for fn in (
+            _doctrine_fits_with_targets,
+            _get_all_doctrine_fits_csv,
+            _get_filtered_doctrine_csv,
+            _get_low_stock_doctrine_fits_csv,
+        ):
+            fn.clear()
+
+        assert _get_all_doctrine_fits_csv("wcmktprod") == b""
+        assert _get_low_stock_doctrine_fits_csv("wcmktprod") == b""
+        rows = pd.read_csv(io.BytesIO(_get_filtered_doctrine_csv("wcmktprod", (1,))))
+        assert list(rows["fit_id"]) == [1]
+        assert rows["ship_target"].isna().all()
+        assert rows["fit_name"].isna().all()
+
+
+class TestAttachTargets:
+    """_attach_targets is a fit_id lookup join, not a suffixing merge."""
+
+    def test_maps_target_columns_by_fit_id(self):
+        from pages.downloads import _attach_targets
+
+        fits = pd.DataFrame({"fit_id": [1, 1, 2, 3], "type_id": [34, 35, 34, 36]})
+        targets = pd.DataFrame({
+            "fit_id": [1, 2], "fit_name": ["Logi", "DPS"], "ship_target": [10, 20]
+        })
+
+        data = _attach_targets(fits, targets)
+
+        assert list(data["fit_name"].iloc[:3]) == ["Logi", "Logi", "DPS"]
+        assert pd.isna(data["ship_target"].iloc[3])
+        assert list(data.columns) == ["fit_id", "type_id", "fit_name", "ship_target"]
+
+    def test_keeps_existing_columns_without_suffixes(self):
+        from pages.downloads import _attach_targets
+
+        fits = pd.DataFrame({"fit_id": [1], "ship_name": ["Osprey"]})
+        targets = pd.DataFrame({
+            "fit_id": [1, 1], "ship_name": ["Other", "Other"], "ship_target": [5, 9]
+        })
+
+        data = _attach_targets(fits, targets)
+
+        assert list(data.columns) == ["fit_id", "ship_name", "ship_target"]
+        assert data.loc[0, "ship_name"] == "Osprey"
+        # Duplicate target rows resolve to the first, never duplicating fits.
+        assert len(data) == 1 and data.loc[0, "ship_target"] == 5
+
+    def test_aligns_to_filtered_fit_rows(self):
+        from pages.downloads import _attach_targets
+
+        fits = pd.DataFrame({"fit_id": [3, 2, 2]}, index=[10, 4, 7])
+        targets = pd.DataFrame({"fit_id": [2, 3], "ship_target": [20, 30]})
+
+        data = _attach_targets(fits, targets)
+
+        assert list(data.index) == [10, 4, 7]
+        assert list(data["ship_target"]) == [30, 20, 20]
+
+
+class TestWriteCsvRows:
+    """The format-string CSV writer must match DataFrame.to_csv byte for byte."""
+
+    @pytest.mark.parametrize("extra", [
+        {},
+        {"note": ["a,b", "c"]},
+        {"avg": [1.5, float("nan")]},
+        {"date": pd.to_datetime(["2025-01-01", "2025-01-02"])},
+    ])
+    def test_matches_pandas_output(self, extra):
+        from pages.downloads import _write_csv_rows
+
+        df = pd.DataFrame({
+            "type_id": [34, 35], "price": [4.25, 1e21], "is_buy": [True, False],
+            "name": ["Tritanium", "Pyerite"], **extra,
+        })
+        buf = io.BytesIO()
+
+        _write_csv_rows(df, buf)
+
+        assert buf.getvalue() == df.to_csv(index=False).encode("utf-8")
+
+    def test_single_column_empty_string_falls_back_to_pandas(self):
+        from pages.downloads import _csv_row_format, _write_csv_rows
+
+        df = pd.DataFrame({"name": ["Tritanium", "", "Pyerite"]})
+        buf = io.BytesIO()
+
+        _write_csv_rows(df, buf)
+
+        assert _csv_row_format(df) is None
+        assert buf.getvalue() == df.to_csv(index=False).encode("utf-8")
+        assert len(pd.read_csv(io.BytesIO(buf.getvalue()), keep_default_na=False)) == 3
+
+    def test_plain_frames_use_format_string(self):
+        from pages.downloads import _csv_row_format
+
+        df = pd.DataFrame({"type_id": [34], "price": [4.25], "name": ["Tritanium"]})
+        assert _csv_row_format(df) == "%d,%s,%s\n"
+        assert _csv_row_format(df.assign(name=['say "hi"'])) is None
+
 
 class TestClearDownloadCaches:
     """Regression tests for post-sync cache invalidation.
@@ -231,6 +504,7 @@ class TestClearDownloadCaches:
         "_get_market_history_csv",
         "_get_all_doctrine_fits_csv",
         "_get_low_stock_doctrine_fits_csv",
+        "_doctrine_fits_with_targets",
         "_get_fit_options",
         "_get_doctrine_options",
         "_get_filtered_doctrine_csv",
@@ -1,7 +1,7 @@
 """Tests for the Low Stock page export helpers."""
 
 import io
-from unittest.mock import patch
+from unittest.mock import DEFAULT, patch
 
 import pandas as pd
 import pytest
@@ -12,6 +12,7 @@ from pages.low_stock import (
     _EDITOR_NONCE_KEY,
     _render_low_stock_export,
     _reset_low_stock_selections,
+    build_style_matrix,
     compute_restock_qty,
 )
 
@@ -199,3 +200,127 @@ class TestResetSelections:
             _reset_low_stock_selections()
             keys.append(f"low_stock_editor_{state[_EDITOR_NONCE_KEY]}")
         assert len(set(keys)) == 3
+
+
+class TestBuildStyleMatrix:
+    """Vectorised replacement for the per-cell/per-row Styler callbacks."""
+
+    RED = "background-color: #fc4103"
+    ORANGE = "background-color: #c76d14"
+    BLUE = "background-color: #328fed"
+
+    def _frame(self):
+        return pd.DataFrame({
+            "type_name": ["Tritanium", "Pyerite", "Mexallon", "Isogen"],
+            "days_remaining": [2.0, 5.0, 10.0, None],
+            "fits_on_mkt": [1, 5, 10, 2],
+            "ships": [["Osprey (4)"], [], None, ["Drake (1)"]],
+        })
+
+    def test_days_remaining_thresholds(self):
+        styles = build_style_matrix(self._frame(), "days_remaining")
+
+        assert list(styles["days_remaining"]) == [self.RED, self.ORANGE, "", ""]
+        assert list(styles["fits_on_mkt"]) == ["", "", "", ""]
+
+    def test_single_fit_uses_share_of_target(self):
+        styles = build_style_matrix(
+            self._frame(), "fits_on_mkt", single_fit=True, fit_target=10
+        )
+
+        assert list(styles["fits_on_mkt"]) == [self.RED, self.ORANGE, "", self.RED]
+
+    def test_single_fit_without_target_is_unstyled(self):
+        styles = build_style_matrix(
+            self._frame(), "fits_on_mkt", single_fit=True, fit_target=None
+        )
+
+        assert (styles["fits_on_mkt"] == "").all()
+
+    def test_doctrine_items_highlight_type_name(self):
+        styles = build_style_matrix(self._frame(), "days_remaining")
+
+        assert list(styles["type_name"]) == [self.BLUE, "", "", self.BLUE]
+        assert styles.shape == self._frame().shape
+
+
+class TestCreateDaysRemainingChart:
+    """The chart only plots the most critical items."""
+
+    def test_plots_top_n_lowest_days_remaining(self):
+        from pages.low_stock import create_days_remaining_chart
+
+        df = pd.DataFrame({
+            "type_name": [f"Item {i}" for i in range(10)],
+            "days_remaining": [float(d) for d in range(10, 0, -1)],
+            "category_name": ["Module"] * 10,
+        })
+
+        fig = create_days_remaining_chart(df, "en", top_n=3)
+
+        plotted = [x for trace in fig.data for x in trace.x]
+        assert plotted == ["Item 9", "Item 8", "Item 7"]
+        assert "3 most critical" in fig.layout.title.text
+
+    def test_small_frames_keep_plain_title(self):
+        from pages.low_stock import create_days_remaining_chart
+
+        df = pd.DataFrame({
+            "type_name": ["Item 0"], "days_remaining": [1.0], "category_name": ["Module"],
+        })
+
+        fig = create_days_remaining_chart(df, "en", top_n=3)
+
+        assert fig.layout.title.text == "Days of Stock Remaining"
+
+    def test_empty_frame_has_no_chart(self):
+        from pages.low_stock import create_days_remaining_chart
+
+        assert create_days_remaining_chart(pd.DataFrame(), "en") is None
+
+
+class TestBlankEmptyShips:
+    """Only doctrine rows keep their ship list for the editor."""
+
+    def test_empty_lists_become_none(self):
+        from pages.low_stock import blank_empty_ships
+
+        ships = pd.Series([["Ferox (3)"], [], None])
+
+        result = blank_empty_ships(ships)
+
+        assert result.tolist() == [["Ferox (3)"], None, None]
+
+    def test_all_missing_column_is_untouched(self):
+        from pages.low_stock import blank_empty_ships
+
+        ships = pd.Series([float("nan")] * 2)
+
+        assert blank_empty_ships(ships) is ships
+
+
+class TestClearLowStockCaches:
+    """Page data and filter option caches are market-scoped and drop on a DB sync."""
+
+    def test_clears_all_filter_option_caches(self):
+        import pages.low_stock as low_stock
+
+        names = (
+            "_cached_category_options",
+            "_cached_doctrine_options",
+            "_cached_fit_options",
+            "_cached_low_stock_base",
+        )
+        with patch.multiple(low_stock, **{name: DEFAULT for name in names}) as mocks:
+            low_stock.clear_low_stock_caches()
+
+        for m in mocks.values():
+            m.clear.assert_called_once()
+
+    @patch("pages.low_stock.clear_low_stock_caches")
+    def test_refresh_market_caches_invokes_low_stock_clear(self, mock_clear):
+        from state.market_state import refresh_market_caches
+
+        refresh_market_caches()
+
+        mock_clear.assert_called_once()
@@ -184,6 +184,112 @@ class TestLowStockService:
         assert hidden_result["type_id"].tolist() == [34]
         assert shown_result["type_id"].tolist() == [34, 35, 36]
 
+    @patch("services.low_stock_service.apply_localized_type_names")
+    @patch("pandas.read_sql_query")
+    def test_filter_low_stock_items_masks_a_shared_base(
+        self,
+        mock_read_sql,
+        mock_localize,
+    ):
+        from services.low_stock_service import LowStockFilters, LowStockService
+
+        mock_read_sql.return_value = pd.DataFrame(
+            {
+                "type_id": [34, 35, 35, 36],
+                "total_volume_remain": [2, 20, 20, 3],
+                "category_id": [4, 7, 7, 4],
+                "category_name": ["Mineral", "Module", "Module", "Mineral"],
+                "is_doctrine": [0, 1, 1, 0],
+                "ship_name": [None, "Osprey", "Scythe", None],
+                "fits_on_mkt": [None, 4, 2, None],
+            }
+        )
+        mock_localize.side_effect = lambda df, *_args, **_kwargs: df
+
+        market_repo = Mock()
+        market_repo.get_30day_volume_metrics.return_value = pd.DataFrame(
+            {
+                "type_id": [34, 35, 36],
+                "volume_30d": [30.0, 30.0, 30.0],
+                "avg_volume_30d": [1.0, 1.0, 1.0],
+            }
+        )
+
+        with patch("settings_service.SettingsService") as mock_settings_service:
+            mock_settings_service.return_value.use_equivalents = False
+            service = LowStockService(_mock_db(), Mock(), market_repo)
+            base = service.get_low_stock_base()
+            snapshot = base.copy()
+            minerals = service.filter_low_stock_items(
+                base, LowStockFilters(category_ids=[4], max_days_remaining=2.5)
+            )
+            doctrine = service.filter_low_stock_items(
+                base, LowStockFilters(doctrine_only=True)
+            )
+
+        pd.testing.assert_frame_equal(base, snapshot)
+        assert minerals["type_id"].tolist() == [34]
+        assert doctrine["type_id"].tolist() == [35]
+        assert doctrine.iloc[0]["ships"] == ["Osprey (4)", "Scythe (2)"]
+
+    @patch("services.low_stock_service.apply_localized_type_names")
+    @patch("pandas.read_sql_query")
+    def test_zero_volume_filter_runs_after_equivalents_on_history_volume(
+        self,
+        mock_read_sql,
+        mock_localize,
+    ):
+        from services.low_stock_service import LowStockFilters, LowStockService
+
+        mock_read_sql.return_value = pd.DataFrame(
+            {
+                "type_id": [34, 36],
+                "total_volume_remain": [2, 1],
+                "category_id": [7, 7],
+                "category_name": ["Module", "Module"],
+                "is_doctrine": [0, 0],
+                "ship_name": [None, None],
+                "fits_on_mkt": [None, None],
+            }
+        )
+        mock_localize.side_effect = lambda df, *_args, **_kwargs: df
+
+        market_repo = Mock()
+        market_repo.get_30day_volume_metrics.return_value = pd.DataFrame(
+            {
+                "type_id": [34, 36],
+                "volume_30d": [30.0, 0.3],
+                "avg_volume_30d": [1.0, 0.01],
+            }
+        )
+        equiv_service = Mock()
+        equiv_service.get_type_ids_with_equivalents.return_value = {34, 36}
+        equiv_service.get_aggregated_stock.return_value = {34: 50, 36: 100}
+
+        with patch("settings_service.SettingsService") as mock_settings_service, patch(
+            "services.module_equivalents_service.get_module_equivalents_service",
+            return_value=equiv_service,
+        ):
+            mock_settings_service.return_value.use_equivalents = True
+            service = LowStockService(_mock_db(), Mock(), market_repo)
+            base = service.get_low_stock_base()
+            hidden = service.filter_low_stock_items(base)
+            shown = service.filter_low_stock_items(
+                base, LowStockFilters(show_zero_volume_items=True)
+            )
+            short = service.filter_low_stock_items(
+                base, LowStockFilters(max_days_remaining=10)
+            )
+
+        # Equivalents raise stock but never avg_volume, so the zero-volume
+        # filter drops the same items it would before equivalents.
+        assert hidden["type_id"].tolist() == [34]
+        assert hidden.iloc[0]["total_volume_remain"] == 50
+        assert shown["type_id"].tolist() == [34, 36]
+        assert shown.set_index("type_id").loc[36, "total_volume_remain"] == 100
+        # days_remaining is still filtered on the combined stock.
+        assert short.empty
+
     @patch("services.low_stock_service.apply_localized_type_names")
     @patch("pandas.read_sql_query")
     def test_get_low_stock_items_uses_history_based_avg_volume_and_recalculates_days(
@@ -42,3 +42,19 @@ def test_30day_metrics_forwards_windows_with_correct_labels():
     kwargs = mock_top_n.call_args.kwargs
     assert kwargs["df_7days"] is df_7, "7-day slot must carry the true 7-day frame"
     assert kwargs["df_30days"] is df_30, "30-day slot must carry the true 30-day frame"
+
+
+def test_format_history_df_sorts_newest_first_without_mutating_input():
+    from pages.components.market_components import _format_history_df
+
+    raw = pd.DataFrame({
+        "date": pd.to_datetime(["2026-01-01", "2026-01-03", "2026-01-02"]),
+        "average": [1.234, 2.345, 3.456],
+        "volume": [10.0, 30.0, 20.0],
+    })
+
+    result = _format_history_df(raw)
+
+    assert result["date"].tolist() == ["2026-01-03", "2026-01-02", "2026-01-01"]
+    assert result["volume"].tolist() == [30, 20, 10]
+    assert raw["volume"].dtype == float
@@ -519,6 +519,90 @@ class TestStatsForTypeIdsImpl:
         assert mock_repo.read_df.call_args[1]["params"]["type_ids"] == [34, 35]
 
 
+class TestOrdersForTypeIdsImpl:
+    """Test the SQL-filtered marketorders fetch behind item/category views."""
+
+    def test_empty_type_ids_returns_empty_frame_without_query(self):
+        from repositories.market_repo import _get_orders_for_type_ids_impl
+
+        with patch("repositories.market_repo.BaseRepository") as mock_repo_cls:
+            result = _get_orders_for_type_ids_impl([])
+
+        assert result.empty
+        mock_repo_cls.assert_not_called()
+
+    @patch("repositories.market_repo.DatabaseConfig")
+    def test_filters_orders_in_sql(self, mock_db_cls):
+        """json_each expands the bound id array against a real SQLite engine."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import StaticPool
+
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        pd.DataFrame({
+            "order_id": [1, 2, 3],
+            "type_id": [34, 35, 36],
+            "price": [5.0, 6.0, 7.0],
+            "is_buy_order": [0, 1, 0],
+        }).to_sql("marketorders", engine, index=False)
+        mock_db = Mock()
+        mock_db.engine = engine
+        mock_db_cls.return_value = mock_db
+
+        from repositories.market_repo import _get_orders_for_type_ids_impl
+        result = _get_orders_for_type_ids_impl(["34", 36])
+
+        assert sorted(result["order_id"]) == [1, 3]
+
+
+class TestMarketAggregatesImpl:
+    """Test the per-side order count/value aggregate used by market stats."""
+
+    def _engine(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import StaticPool
+
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        pd.DataFrame({
+            "order_id": [1, 2, 3, 3],
+            "type_id": [34, 34, 35, 35],
+            "price": [5.0, 4.0, 10.0, 10.0],
+            "volume_remain": [100, 50, 10, 10],
+            "is_buy_order": [0, 1, 0, 0],
+        }).to_sql("marketorders", engine, index=False)
+        return engine
+
+    @patch("repositories.market_repo.DatabaseConfig")
+    def test_aggregates_whole_market(self, mock_db_cls):
+        mock_db_cls.return_value = Mock(engine=self._engine())
+
+        from repositories.market_repo import _get_market_aggregates_impl
+        result = _get_market_aggregates_impl(None)
+
+        assert result == {
+            "sell_count": 2, "sell_value": 700.0, "buy_count": 1, "buy_value": 200.0,
+        }
+
+    @patch("repositories.market_repo.DatabaseConfig")
+    def test_aggregates_only_requested_types(self, mock_db_cls):
+        mock_db_cls.return_value = Mock(engine=self._engine())
+
+        from repositories.market_repo import _get_market_aggregates_impl
+        result = _get_market_aggregates_impl([35])
+
+        assert result == {
+            "sell_count": 1, "sell_value": 200.0, "buy_count": 0, "buy_value": 0.0,
+        }
+
+    def test_empty_type_ids_short_circuits(self):
+        from repositories.market_repo import _get_market_aggregates_impl
+
+        with patch("repositories.market_repo.BaseRepository") as mock_repo_cls:
+            result = _get_market_aggregates_impl([])
+
+        assert result["sell_count"] == 0 and result["buy_count"] == 0
+        mock_repo_cls.assert_not_called()
+
+
 class TestOrderCountsImpl:
     """Test the SQL GROUP BY order-count aggregation."""
 
@@ -50,6 +50,7 @@ def mock_repo():
     """Mock MarketRepository for service tests."""
     repo = Mock()
     repo.get_all_orders.return_value = pd.DataFrame()
+    repo.get_orders_for_type_ids.return_value = pd.DataFrame()
     repo.get_all_stats.return_value = pd.DataFrame()
     repo.get_all_history.return_value = pd.DataFrame()
     repo.get_category_type_ids.return_value = []
@@ -289,6 +290,30 @@ class TestCreateISKVolumeChart:
         assert isinstance(fig, go.Figure)
 
 
+class TestCreateHistoryChart:
+    """Test the single-item price/volume history chart."""
+
+    def test_uses_supplied_history_without_refetch(self, sample_history_df, mock_repo):
+        from services.market_service import MarketService
+        service = MarketService(mock_repo)
+        columns = list(sample_history_df.columns)
+
+        fig = service.create_history_chart(34, history=sample_history_df)
+
+        assert isinstance(fig, go.Figure)
+        mock_repo.get_history_by_type.assert_not_called()
+        assert list(sample_history_df.columns) == columns
+
+    def test_fetches_history_when_not_supplied(self, mock_repo):
+        mock_repo.get_history_by_type.return_value = pd.DataFrame()
+
+        from services.market_service import MarketService
+        service = MarketService(mock_repo)
+
+        assert service.create_history_chart(34) is None
+        mock_repo.get_history_by_type.assert_called_once_with(34)
+
+
 # ---------------------------------------------------------------------------
 # Test: get_top_n_items
 # ---------------------------------------------------------------------------
@@ -419,7 +444,9 @@ class TestGetMarketData:
         assert isinstance(stats, pd.DataFrame)
 
     def test_filters_by_item_id(self, sample_orders_df, mock_repo):
-        mock_repo.get_all_orders.return_value = sample_orders_df
+        mock_repo.get_orders_for_type_ids.return_value = (
+            sample_orders_df[sample_orders_df["type_id"] == 34]
+        )
         mock_repo.get_all_stats.return_value = pd.DataFrame({
             "type_id": [34, 35],
             "price": [5.0, 10.0],
@@ -432,8 +459,22 @@ class TestGetMarketData:
             show_all=False, selected_item_id=34
         )
 
-        if not sell.empty:
-            assert all(sell["type_id"] == 34)
+        mock_repo.get_orders_for_type_ids.assert_called_once_with([34])
+        mock_repo.get_all_orders.assert_not_called()
+        assert all(sell["type_id"] == 34)
+        assert stats["type_id"].tolist() == [34]
+
+    def test_category_filter_is_pushed_to_repository(self, sample_orders_df, mock_repo):
+        mock_repo.get_orders_for_type_ids.return_value = sample_orders_df
+
+        from services.market_service import MarketService
+        service = MarketService(mock_repo)
+        service.get_market_data(
+            show_all=False, category_info={"type_ids": [34, 35]}
+        )
+
+        mock_repo.get_orders_for_type_ids.assert_called_once_with([34, 35])
+        mock_repo.get_all_orders.assert_not_called()
 
     def test_empty_orders(self, mock_repo):
         mock_repo.get_all_orders.return_value = pd.DataFrame()
@@ -447,6 +488,22 @@ class TestGetMarketData:
         assert buy.empty
 
 
+class TestGetOrderAggregates:
+    """Order totals use the same item/category filter as get_market_data."""
+
+    def test_item_filter(self, mock_repo):
+        from services.market_service import MarketService
+        MarketService(mock_repo).get_order_aggregates(selected_item_id=34)
+
+        mock_repo.get_market_aggregates.assert_called_once_with([34])
+
+    def test_unfiltered_uses_whole_market(self, mock_repo):
+        from services.market_service import MarketService
+        MarketService(mock_repo).get_order_aggregates()
+
+        mock_repo.get_market_aggregates.assert_called_once_with(None)
+
+
 class TestGetCurrentMarketSnapshot:
     """Test fixed-item current market snapshot aggregation."""
 
@@ -0,0 +1,50 @@
+"""Tests for the market stats page data prefetch."""
+
+import threading
+
+import pytest
+
+from pages.market_stats import _prefetch
+
+
+def _thread_name_load(value):
+    def load():
+        return value, threading.current_thread().name
+    return load
+
+
+class TestPrefetch:
+    """Tests for _prefetch()."""
+
+    def _loads(self):
+        return {
+            "market_data": _thread_name_load("market"),
+            "totals": _thread_name_load("totals"),
+            "history": _thread_name_load("history"),
+        }
+
+    def test_cold_runs_background_loads_on_the_pool(self):
+        script_thread = threading.current_thread().name
+
+        results = {key: f.result() for key, f in _prefetch(self._loads(), cold=True).items()}
+
+        assert results["market_data"] == ("market", script_thread)
+        assert results["totals"][1].startswith("market_stats_prefetch")
+        assert results["history"][1].startswith("market_stats_prefetch")
+
+    def test_warm_runs_everything_inline(self):
+        script_thread = threading.current_thread().name
+
+        futures = _prefetch(self._loads(), cold=False)
+
+        assert all(f.done() for f in futures.values())
+        assert {f.result()[1] for f in futures.values()} == {script_thread}
+
+    def test_inline_errors_surface_from_result(self):
+        def fail():
+            raise ValueError("boom")
+
+        futures = _prefetch({"market_data": fail}, cold=False)
+
+        with pytest.raises(ValueError, match="boom"):
+            futures["market_data"].result()
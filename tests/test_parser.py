@@ -0,0 +1,82 @@
+"""Tests for the legacy multibuy/EFT parser in parser/parser.py."""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+PARSER_PATH = Path(__file__).resolve().parent.parent / "parser" / "parser.py"
+
+Base = declarative_base()
+
+
+class EsiItemInfo(Base):
+    __tablename__ = "esi_item_info"
+    typeID = Column(Integer, primary_key=True)
+    typeName = Column(String)
+
+
+@pytest.fixture
+def parser_module(monkeypatch):
+    # parser.py does `import model.model` and reads model.EsiItemInfo
+    model = types.ModuleType("model")
+    model.EsiItemInfo = EsiItemInfo
+    model.model = types.ModuleType("model.model")
+    monkeypatch.setitem(sys.modules, "model", model)
+    monkeypatch.setitem(sys.modules, "model.model", model.model)
+
+    spec = importlib.util.spec_from_file_location("legacy_parser", PARSER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _seed(engine):
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([
+            EsiItemInfo(typeID=34, typeName="Tritanium"),
+            EsiItemInfo(typeID=2048, typeName="Damage Control II"),
+        ])
+        session.commit()
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    _seed(engine)
+    with Session(engine) as session:
+        yield session
+
+
+class TestItemLookup:
+    def test_lookups_work_on_read_only_database(self, parser_module, tmp_path):
+        db_path = tmp_path / "sde.db"
+        writable = create_engine(f"sqlite:///{db_path}")
+        _seed(writable)
+        writable.dispose()
+        read_only = create_engine(f"sqlite:///file:{db_path}?mode=ro&uri=true")
+
+        with Session(read_only) as ro_session:
+            assert parser_module.verifyItem(ro_session, "tritanium").typeID == 34
+            assert set(parser_module.verify_items_bulk(ro_session, ["Tritanium"])) == {"tritanium"}
+
+        assert parser_module._ensure_typename_index(read_only) is False
+
+
+class TestParseMultibuyItems:
+    def test_resolves_items_case_insensitively(self, parser_module, session):
+        df = parser_module.parse_multibuy_items(
+            session, "Tritanium\t1.000\ndamage control ii\nUnknown\t2\nTotal:\t5\nTritanium\t9"
+        )
+
+        assert df.values.tolist() == [[34, "Tritanium", 1000], [2048, "Damage Control II", 1]]
+
+    def test_blank_name_row_is_skipped(self, parser_module, session):
+        df = parser_module.parse_multibuy_items(session, "\t5\nTritanium\t1")
+
+        assert df.values.tolist() == [[34, "Tritanium", 1]]
@@ -349,3 +349,35 @@ def test_pricer_result_jita_failure_signal_populated():
 
     assert result.failed_jita_count == 3
     assert result.jita_provider_failed is True
+
+
+def test_pricer_result_hull_type_id_is_first_ship():
+    result = _make_result([
+        _make_item(type_id=10, category_name="Module"),
+        _make_item(type_id=587, name="Rifter", category_name="Ship"),
+    ])
+
+    assert result.hull_type_id == 587
+    assert _make_result([_make_item(type_id=10)]).hull_type_id is None
+
+
+def test_pricer_result_grand_totals_scale_with_quantity():
+    result = _make_result([
+        _make_item(type_id=10, quantity=3, local_sell=100.0),
+        _make_item(type_id=11, quantity=2, local_sell=50.5),
+    ])
+
+    assert result.local_sell_grand_total == 401.0
+    assert result.jita_sell_grand_total == 0.0
+    assert result.total_quantity == 5
+    assert _make_result([]).local_sell_grand_total == 0.0
+
+
+def test_pricer_result_to_dataframe_is_memoized_copy():
+    result = _make_result([_make_item(type_id=10, quantity=3, local_sell=100.0)])
+
+    first = result.to_dataframe()
+    first["Qty"] = 0
+
+    assert result.to_dataframe()["Qty"].tolist() == [3]
+    assert result._dataframe is result._dataframe
@@ -0,0 +1,62 @@
+"""Tests for the Pricer page helpers."""
+
+from unittest.mock import patch
+
+import pandas as pd
+
+from pages.pricer import (
+    _csv_chunks,
+    _pricer_style_matrix,
+    build_csv_download,
+    build_pricer_style_matrix,
+)
+
+
+class TestBuildCsvDownload:
+    """The chunked CSV buffer matches a single to_csv call."""
+
+    def test_matches_to_csv_across_chunks(self):
+        df = pd.DataFrame({"Item": [f"Item {i}" for i in range(1203)], "Qty": range(1203)})
+
+        buffer = build_csv_download(df)
+
+        assert buffer.read().decode("utf-8") == df.to_csv(index=False)
+
+    def test_empty_frame_keeps_header(self):
+        df = pd.DataFrame(columns=["Item", "Qty"])
+
+        assert build_csv_download(df).read().decode("utf-8") == df.to_csv(index=False)
+
+    def test_small_byte_budget_still_covers_every_row(self):
+        df = pd.DataFrame({"Item": [f"Item {i}" for i in range(257)], "Qty": range(257)})
+
+        chunks = list(_csv_chunks(df, chunk_bytes=64, first_rows=7))
+
+        assert len(chunks) > 3
+        assert b"".join(chunks).decode("utf-8") == df.to_csv(index=False)
+
+
+class TestPricerStyleMatrix:
+    """Style matrices are computed once per frame and highlight flags."""
+
+    def test_reuses_matrix_for_same_flags(self):
+        df = pd.DataFrame({"Is Doctrine": [True, False], "Days of Stock": [2.0, 30.0]})
+        styles = {}
+
+        with patch(
+            "pages.pricer.build_pricer_style_matrix", wraps=build_pricer_style_matrix
+        ) as mock_build:
+            first = _pricer_style_matrix(styles, df, True, True)
+            second = _pricer_style_matrix(styles, df, True, True)
+            _pricer_style_matrix(styles, df, False, True)
+
+        assert first is second
+        assert mock_build.call_count == 2
+
+    def test_styler_applies_cached_matrix(self):
+        df = pd.DataFrame({"Is Doctrine": [True, False], "Days of Stock": [2.0, 30.0]})
+        matrix = _pricer_style_matrix({}, df, True, True)
+
+        html = df.style.apply(lambda _: matrix, axis=None).to_html()
+
+        assert "#fc4103" in html
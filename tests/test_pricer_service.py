@@ -1,6 +1,6 @@
 """Tests for multilingual SDE item resolution in the Pricer service."""
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from sqlalchemy import create_engine, text
 
@@ -59,3 +59,84 @@ def test_resolve_item_matches_localized_prefix():
     assert result is not None
     assert result["type_id"] == 34
     assert result["type_name"] == "Tritanium"
+
+
+def _build_pricer_service():
+    from services.pricer_service import PricerService
+
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE marketstats ("
+            " type_id INTEGER,"
+            " avg_volume REAL,"
+            " days_remaining REAL,"
+            " total_volume_remain INTEGER)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE doctrines ("
+            " type_id INTEGER,"
+            " ship_name TEXT,"
+            " fits_on_mkt INTEGER)"
+        ))
+        conn.execute(text(
+            "INSERT INTO marketstats VALUES "
+            " (34, 100.0, 5.0, 500),"
+            " (35, NULL, NULL, NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO doctrines VALUES "
+            " (34, 'Ferox', 12),"
+            " (34, 'Drake', 3)"
+        ))
+
+    mock_db = Mock()
+    type(mock_db).engine = engine
+    return PricerService(Mock(), mock_db, Mock(), Mock())
+
+
+def test_get_market_stats_binds_type_id_list():
+    service = _build_pricer_service()
+
+    result = service.get_market_stats([34, 35, 999])
+
+    assert result == {
+        34: {"avg_volume": 100.0, "days_remaining": 5.0, "total_volume_remain": 500},
+        35: {"avg_volume": 0.0, "days_remaining": 0.0, "total_volume_remain": 0},
+    }
+
+
+def test_get_doctrine_info_binds_type_id_list():
+    service = _build_pricer_service()
+
+    result = service.get_doctrine_info([34, 35])
+
+    assert result[34]["is_doctrine"] is True
+    assert len(result[34]["ships"]) == 2
+    assert result[35] == {"is_doctrine": False, "ships": []}
+
+
+def test_price_parsed_without_items_keeps_parse_errors():
+    from domain import InputFormat
+    from services.pricer_service import PricerService
+
+    price_service = Mock()
+    service = PricerService(Mock(), Mock(), Mock(), price_service)
+
+    result = service.price_parsed([], InputFormat.MULTIBUY, None, None, ["Line 1: bad"])
+
+    assert result.items == []
+    assert result.parse_errors == ["Line 1: bad"]
+    price_service.get_jita_prices.assert_not_called()
+
+
+def test_price_input_parses_once_and_delegates():
+    from services.pricer_service import PricerService
+
+    service = PricerService(Mock(), Mock(), Mock(), Mock())
+    with patch("services.pricer_service.parse_input", return_value=([], "fmt", None, None, [])) as mock_parse, \
+         patch.object(service, "price_parsed") as mock_priced:
+        service.price_input("Tritanium 10")
+
+    mock_parse.assert_called_once_with("Tritanium 10")
+    mock_priced.assert_called_once_with([], "fmt", None, None, [])
@@ -270,6 +270,36 @@ class TestGetSdeTable:
             _get_sde_table_impl(engine, "DROP TABLE invTypes; --")
 
 
+class TestExportSdeTableCsv:
+    def test_streams_rows_matching_pandas_csv(self):
+        from sqlalchemy import create_engine
+        from repositories.sde_repo import _export_sde_table_csv_impl
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE invTypes (typeID INTEGER, typeName TEXT, volume REAL)"
+            )
+            conn.exec_driver_sql(
+                "INSERT INTO invTypes VALUES (34, 'Tritanium', 0.01), "
+                "(35, 'Pyerite, \"Refined\"', NULL), (36, 'Mexallon', 0.01)"
+            )
+
+        # batch_size=2 forces more than one fetchmany() round.
+        result = _export_sde_table_csv_impl(engine, "invTypes", batch_size=2)
+
+        with engine.connect() as conn:
+            expected = pd.read_sql_query("SELECT * FROM invTypes", conn)
+        assert result == expected.to_csv(index=False).encode("utf-8")
+
+    def test_invalid_table_raises_valueerror(self):
+        from repositories.sde_repo import _export_sde_table_csv_impl
+        engine, conn = _mock_engine()
+
+        with pytest.raises(ValueError, match="Invalid SDE table name"):
+            _export_sde_table_csv_impl(engine, "invTypes; DROP TABLE invTypes")
+        conn.execute.assert_not_called()
+
+
 class TestGetTech2TypeIds:
     def test_returns_type_id_list(self):
         from repositories.sde_repo import _get_tech2_type_ids_impl
@@ -22,9 +22,15 @@ from ui.i18n import translate_text
 _LOCALIZED_BACKUP_COLUMNS = ["type_name_en", "ship_name_en", "Item_en"]
 
 
-def drop_localized_backup_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Remove localization helper columns that should not appear in display tables."""
-    return df.drop(columns=_LOCALIZED_BACKUP_COLUMNS, errors="ignore")
+def drop_localized_backup_columns(
+    df: pd.DataFrame, extra_columns: tuple[str, ...] = ()
+) -> pd.DataFrame:
+    """Remove localization helper columns that should not appear in display tables.
+
+    ``extra_columns`` are dropped in the same pass, so callers hiding other
+    internal columns don't need a second copy of the frame.
+    """
+    return df.drop(columns=[*_LOCALIZED_BACKUP_COLUMNS, *extra_columns], errors="ignore")
 
 def format_module_list(modules_list: list[str]) -> str:
     """
@@ -160,6 +160,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "low_stock.max_days_remaining_help": (
             "Show only items with days remaining less than or equal to this value."
         ),
+        "low_stock.apply_filters": "Apply",
         "low_stock.show_zero_volume_items": "Show 0 Volume Items",
         "low_stock.show_zero_volume_items_help": (
             "Include items whose 30-day average volume is zero."
@@ -194,6 +195,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         ),
         "low_stock.chart_section": "Days Remaining by Item",
         "low_stock.chart_title": "Days of Stock Remaining",
+        "low_stock.chart_title_top_n": "Days of Stock Remaining ({count} most critical)",
         "low_stock.chart_days_label": "Days Remaining",
         "low_stock.chart_critical_level": "Critical Level (3 days)",
         "import_helper.title": "{market_name} Import Helper",
@@ -901,6 +903,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "low_stock.days_filter": "剩余天数筛选",
         "low_stock.max_days_remaining": "最大剩余天数",
         "low_stock.max_days_remaining_help": "仅显示剩余天数小于或等于该值的物品。",
+        "low_stock.apply_filters": "应用",
         "low_stock.show_zero_volume_items": "显示 0 销量物品",
         "low_stock.show_zero_volume_items_help": "包含过去 30 天平均销量为 0 的物品。",
         "low_stock.metric_critical": "严重短缺（≤3 天）",
@@ -932,6 +935,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         ),
         "low_stock.chart_section": "按物品显示剩余天数",
         "low_stock.chart_title": "库存剩余天数",
+        "low_stock.chart_title_top_n": "库存剩余天数（最紧缺的 {count} 项）",
         "low_stock.chart_days_label": "剩余天数",
         "low_stock.chart_critical_level": "严重阈值（3 天）",
         "builder_helper.title": "制造助手",
@@ -1573,6 +1577,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "low_stock.days_filter": "Filter für verbleibende Tage",
         "low_stock.max_days_remaining": "Maximale verbleibende Tage",
         "low_stock.max_days_remaining_help": "Nur Artikel mit gleicher oder geringerer Tageszahl anzeigen.",
+        "low_stock.apply_filters": "Anwenden",
         "low_stock.metric_critical": "Kritische Artikel (≤3 Tage)",
         "low_stock.metric_low": "Artikel mit niedrigem Bestand (3-7 Tage)",
         "low_stock.metric_total": "Gefilterte Artikel gesamt",
@@ -1603,6 +1608,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         ),
         "low_stock.chart_section": "Verbleibende Tage nach Artikel",
         "low_stock.chart_title": "Verbleibende Bestandstage",
+        "low_stock.chart_title_top_n": "Verbleibende Bestandstage ({count} kritischste)",
         "low_stock.chart_days_label": "Verbleibende Tage",
         "low_stock.chart_critical_level": "Kritisches Niveau (3 Tage)",
         "builder_helper.title": "Builder Helper",
@@ -2153,6 +2159,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "low_stock.days_filter": "Filtre jours restants",
         "low_stock.max_days_remaining": "Jours restants maximum",
         "low_stock.max_days_remaining_help": "Afficher seulement les objets au-dessous de cette limite.",
+        "low_stock.apply_filters": "Appliquer",
         "low_stock.metric_critical": "Objets critiques (≤3 jours)",
         "low_stock.metric_low": "Objets faibles (3-7 jours)",
         "low_stock.metric_total": "Total filtrés",
@@ -2183,6 +2190,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         ),
         "low_stock.chart_section": "Jours restants par objet",
         "low_stock.chart_title": "Jours de stock restants",
+        "low_stock.chart_title_top_n": "Jours de stock restants ({count} plus critiques)",
         "low_stock.chart_days_label": "Jours restants",
         "low_stock.chart_critical_level": "Niveau critique (3 jours)",
         "builder_helper.title": "Aide Builder",
@@ -2731,6 +2739,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "low_stock.days_filter": "Фильтр оставшихся дней",
         "low_stock.max_days_remaining": "Максимум дней",
         "low_stock.max_days_remaining_help": "Показывать только предметы с днями не выше этого значения.",
+        "low_stock.apply_filters": "Применить",
         "low_stock.metric_critical": "Критические предметы (≤3 дня)",
         "low_stock.metric_low": "Низкий запас (3-7 дней)",
         "low_stock.metric_total": "Всего после фильтра",
@@ -2761,6 +2770,7 @@ TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         ),
         "low_stock.chart_section": "Оставшиеся дни по предметам",
         "low_stock.chart_title": "Дни оставшегося запаса",
+        "low_stock.chart_title_top_n": "Дни оставшегося запаса ({count} самых критичных)",
         "low_stock.chart_days_label": "Дни",
         "low_stock.chart_critical_level": "Критический уровень (3 дня)",
         "builder_helper.title": "Помощник Builder",